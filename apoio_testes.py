@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Utilitários compartilhados pelos scripts de teste: bancos de dados em
+diretórios temporários, removidos ao final.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Optional
+
+from database.db_manager import gerenciador_bd
+
+# Diretórios criados por caminho_temporario(), removidos ao encerrar os testes
+_diretorios_temporarios = []
+
+
+def caminho_temporario() -> str:
+    """Retorna o caminho de um arquivo de banco ainda inexistente, removido ao encerrar os testes."""
+    diretorio = tempfile.mkdtemp(prefix="glamour_teste_")
+    _diretorios_temporarios.append(diretorio)
+    return os.path.join(diretorio, "teste.db")
+
+
+@atexit.register
+def _remover_diretorios_temporarios():
+    while _diretorios_temporarios:
+        shutil.rmtree(_diretorios_temporarios.pop(), ignore_errors=True)
+
+
+@contextmanager
+def banco_temporario(caminho: Optional[str] = None):
+    """
+    Aponta o gerenciador global para um banco durante o bloco.
+
+    Sem caminho, o banco é novo e vazio, em um diretório removido ao final
+    do bloco; com caminho, usa o banco informado (por exemplo, um banco
+    antigo preparado pelo teste) e remove o diretório dele ao final.
+
+    Yields:
+        str: Caminho do banco em uso
+    """
+    caminho_original = gerenciador_bd.caminho_banco
+    if caminho is None:
+        caminho = os.path.join(tempfile.mkdtemp(prefix="glamour_teste_"), "teste.db")
+    gerenciador_bd.desconectar()
+    gerenciador_bd.caminho_banco = caminho
+    try:
+        gerenciador_bd.conectar()
+        yield caminho
+    finally:
+        gerenciador_bd.desconectar()
+        gerenciador_bd.caminho_banco = caminho_original
+        shutil.rmtree(os.path.dirname(caminho), ignore_errors=True)
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from models.cliente import Cliente
+from database.db_manager import gerenciador_bd
 
 class ClienteController:
     """Controlador para gerenciar operações relacionadas a clientes."""
@@ -100,20 +101,62 @@ class ClienteController:
         """
         Lista todos os clientes.
         
+        A leitura é compartilhada pelo processo inteiro e refeita apenas depois
+        que algum cliente é gravado; os objetos são os mesmos entre chamadas.
+        
         Returns:
             List[Cliente]: Lista de todos os clientes
         """
-        return Cliente.obter_todos()
+        return list(gerenciador_bd.ler_com_cache("listar_clientes", ("clientes",), Cliente.obter_todos))
+    
+    @staticmethod
+    def versao_clientes() -> tuple:
+        """
+        Retorna a versão atual dos dados de clientes.
+        
+        Returns:
+            tuple: Valor que muda sempre que algum cliente é gravado
+        """
+        return gerenciador_bd.versao_dados("clientes")
+    
+    @staticmethod
+    def contar_clientes(termo: str = "") -> int:
+        """
+        Conta os clientes cadastrados.
+        
+        Args:
+            termo (str, opcional): Conta apenas os clientes encontrados pela busca
+            
+        Returns:
+            int: Quantidade de clientes
+        """
+        return Cliente.contar(termo)
+    
+    @staticmethod
+    def listar_clientes_pagina(limite: int, apos_id: Optional[int] = None, termo: str = "") -> List[Cliente]:
+        """
+        Lista uma página de clientes em ordem alfabética.
+        
+        Args:
+            limite (int): Quantidade máxima de registros
+            apos_id (int, opcional): ID do último registro da página anterior
+            termo (str, opcional): Busca por nome, telefone ou email (sem acentos, por prefixo)
+            
+        Returns:
+            List[Cliente]: Registros da página
+        """
+        return Cliente.obter_pagina(limite, apos_id, termo)
     
     @staticmethod
-    def buscar_clientes(nome: str) -> List[Cliente]:
+    def buscar_clientes(termo: str, limite: int = None) -> List[Cliente]:
         """
-        Busca clientes pelo nome.
+        Busca clientes por nome, telefone e email, ignorando acentos e casando prefixos.
         
         Args:
-            nome (str): Nome ou parte do nome do cliente
+            termo (str): Palavras ou início das palavras procuradas
+            limite (int, opcional): Quantidade máxima de resultados
             
         Returns:
-            List[Cliente]: Lista de clientes encontrados
+            List[Cliente]: Clientes encontrados, ordenados por relevância
         """
-        return Cliente.buscar_por_nome(nome)
\ No newline at end of file
+        return Cliente.buscar(termo, limite)
\ No newline at end of file
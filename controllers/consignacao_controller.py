@@ -20,16 +20,11 @@ class ConsignacaoController:
             
         Returns:
             Consignacao: A consignação criada ou None em caso de erro
+            
+        Raises:
+            EstoqueInsuficiente: Se algum produto não tiver a quantidade enviada em estoque
         """
         try:
-            # Validar estoque
-            for item_data in itens:
-                produto = Produto.obter_por_id(item_data['produto_id'])
-                if not produto:
-                    raise ValueError(f"Produto {item_data['produto_id']} não encontrado")
-                if produto.quantidade < item_data['qtd']:
-                    raise ValueError(f"Estoque insuficiente para produto '{produto.nome}'. Disponível: {produto.quantidade}")
-            
             # Criar consignação
             consignacao = Consignacao(
                 cliente_id=cliente_id,
@@ -47,26 +42,19 @@ class ConsignacaoController:
                 )
                 consignacao.itens.append(item)
                 
-            # Salvar (isso salva a consignação e os itens)
-            if consignacao.salvar():
-                # Atualizar estoque e registrar movimentação
-                for item in consignacao.itens:
-                    produto = Produto.obter_por_id(item.produto_id)
-                    if produto:
-                        produto.quantidade -= item.qtd_enviada
-                        produto.salvar()
-                        
-                        # Registrar movimentação
-                        consulta_mov = '''
-                            INSERT INTO movimentacoes_estoque 
-                            (produto_id, tipo_movimentacao, quantidade, observacoes)
-                            VALUES (?, 'saida', ?, ?)
-                        '''
-                        gerenciador_bd.executar_consulta(consulta_mov, (
-                            produto.id, item.qtd_enviada, f"Consignação #{consignacao.id}"
-                        ))
-                return consignacao
-            return None
+            # Salvar consignação, itens, estoque e movimentações em uma única transação
+            with gerenciador_bd.transacao():
+                # Baixa condicional: faltando qualquer produto, a consignação inteira é recusada
+                Produto.baixar_estoque_disponivel((item.produto_id, item.qtd_enviada) for item in consignacao.itens)
+                
+                if not consignacao.salvar():
+                    raise RuntimeError("Não foi possível salvar a consignação")
+                
+                Produto.registrar_movimentacoes(
+                    (item.produto_id, 'saida', item.qtd_enviada, f"Consignação #{consignacao.id}")
+                    for item in consignacao.itens
+                )
+            return consignacao
         except Exception as e:
             print(f"Erro ao criar consignação: {e}")
             raise e # Re-raise para a UI tratar
@@ -81,116 +69,78 @@ class ConsignacaoController:
             itens_atualizados (list): Lista com {'item_id': int, 'qtd_vendida': int, 'qtd_devolvida': int}
             finalizar (bool): Se True, fecha a consignação
         """
-        consignacao = Consignacao.obter_por_id(consignacao_id)
-        if not consignacao:
-            return False
-            
         try:
-            total_vendido = 0.0
-            total_comissao = 0.0
-            
-            itens_por_id = {item.id: item for item in consignacao.itens}
-            
-            # Atualizar itens
-            for dados in itens_atualizados:
-                item = itens_por_id.get(dados['item_id'])
-                if not item:
-                    continue
-
-                qtd_vendida = dados.get('qtd_vendida', 0)
-                qtd_devolvida = dados.get('qtd_devolvida', 0)
-
-                if qtd_vendida + qtd_devolvida > item.qtd_enviada:
-                    raise ValueError("Quantidade vendida + devolvida não pode exceder a quantidade enviada.")
-
-                devolvida_anterior = item.qtd_devolvida
-                item.qtd_vendida = qtd_vendida
-                item.qtd_devolvida = qtd_devolvida
-                item.salvar()
-                
-                valor_item = item.qtd_vendida * item.preco_unitario
-                comissao_item = valor_item * (item.comissao_percentual / 100)
+            # Itens lidos, estoque, movimentações e totais em uma única transação, com
+            # gravações em lote: as quantidades já acertadas são relidas com a escrita
+            # reservada, para que acertos simultâneos não devolvam a mesma peça duas vezes
+            with gerenciador_bd.transacao():
+                consignacao = Consignacao.obter_por_id(consignacao_id)
+                if not consignacao:
+                    return False
+                    
+                itens_por_id = {item.id: item for item in consignacao.itens}
+                alterados = {}
+                saidas = []
+                movimentacoes = []
                 
-                total_vendido += valor_item
-                total_comissao += comissao_item
-                
-                # Ajustar estoque pelo delta de devolução
-                delta_devolucao = item.qtd_devolvida - devolvida_anterior
-                if delta_devolucao != 0:
-                    produto = Produto.obter_por_id(item.produto_id)
-                    if not produto:
-                        raise ValueError("Produto não encontrado para ajuste de estoque.")
-
-                    if delta_devolucao > 0:
-                        produto.quantidade += delta_devolucao
-                        produto.salvar()
+                # Calcular novas quantidades e deltas de estoque em memória, antes de gravar
+                for dados in itens_atualizados:
+                    item = itens_por_id.get(dados['item_id'])
+                    if not item:
+                        continue
+                        
+                    qtd_vendida = dados.get('qtd_vendida', 0)
+                    qtd_devolvida = dados.get('qtd_devolvida', 0)
+                    
+                    if qtd_vendida + qtd_devolvida > item.qtd_enviada:
+                        raise ValueError("Quantidade vendida + devolvida não pode exceder a quantidade enviada.")
                         
-                        consulta_mov = '''
-                            INSERT INTO movimentacoes_estoque 
-                            (produto_id, tipo_movimentacao, quantidade, observacoes)
-                            VALUES (?, 'entrada', ?, ?)
-                        '''
-                        gerenciador_bd.executar_consulta(consulta_mov, (
-                            produto.id, delta_devolucao, f"Devolução Consignação #{consignacao.id}"
+                    # Ajustar estoque pelo delta de devolução
+                    delta_devolucao = qtd_devolvida - item.qtd_devolvida
+                    if delta_devolucao > 0:
+                        movimentacoes.append((
+                            item.produto_id, 'entrada', delta_devolucao, f"Devolução Consignação #{consignacao.id}"
                         ))
-                    else:
+                    elif delta_devolucao < 0:
                         # Reverte devolução (ajuste para manter consistência)
-                        if produto.quantidade + delta_devolucao < 0:
-                            raise ValueError(f"Estoque insuficiente para ajuste do produto '{produto.nome}'.")
-                        produto.quantidade += delta_devolucao
-                        produto.salvar()
-                        
-                        consulta_mov = '''
-                            INSERT INTO movimentacoes_estoque 
-                            (produto_id, tipo_movimentacao, quantidade, observacoes)
-                            VALUES (?, 'saida', ?, ?)
-                        '''
-                        gerenciador_bd.executar_consulta(consulta_mov, (
-                            produto.id, abs(delta_devolucao), f"Ajuste devolução Consignação #{consignacao.id}"
+                        saidas.append((item.produto_id, -delta_devolucao))
+                        movimentacoes.append((
+                            item.produto_id, 'saida', -delta_devolucao, f"Ajuste devolução Consignação #{consignacao.id}"
                         ))
-            
-            # Recalcular totais gerais (iterando sobre todos os itens para garantir consistência)
-            total_vendido_geral = 0.0
-            total_comissao_geral = 0.0
-            
-            for item in consignacao.itens:
-                 v = item.qtd_vendida * item.preco_unitario
-                 c = v * (item.comissao_percentual / 100)
-                 total_vendido_geral += v
-                 total_comissao_geral += c
-            
-            consignacao.total_vendido = total_vendido_geral
-            consignacao.total_comissao = total_comissao_geral
-            consignacao.total_liquido = total_vendido_geral - total_comissao_geral
-            
-            if finalizar:
-                consignacao.status = "Fechada"
-                consignacao.data_fechamento = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Devolver produtos ao estoque
-                for item in consignacao.itens:
-                    qtd_restante = item.qtd_enviada - item.qtd_vendida - item.qtd_devolvida
-                    if qtd_restante > 0:
-                        produto = Produto.obter_por_id(item.produto_id)
-                        if produto:
-                            produto.quantidade += qtd_restante
-                            produto.salvar()
-                            
-                            consulta_mov = '''
-                                INSERT INTO movimentacoes_estoque 
-                                (produto_id, tipo_movimentacao, quantidade, observacoes)
-                                VALUES (?, 'entrada', ?, ?)
-                            '''
-                            gerenciador_bd.executar_consulta(consulta_mov, (
-                                produto.id, qtd_restante, f"Retorno Consignação #{consignacao.id}"
+                        
+                    item.qtd_vendida = qtd_vendida
+                    item.qtd_devolvida = qtd_devolvida
+                    alterados[item.id] = item
+                    
+                if finalizar:
+                    consignacao.status = "Fechada"
+                    consignacao.data_fechamento = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    
+                    # Devolver produtos ao estoque
+                    for item in consignacao.itens:
+                        qtd_restante = item.qtd_enviada - item.qtd_vendida - item.qtd_devolvida
+                        if qtd_restante > 0:
+                            movimentacoes.append((
+                                item.produto_id, 'entrada', qtd_restante, f"Retorno Consignação #{consignacao.id}"
                             ))
-                            
                             item.qtd_devolvida += qtd_restante
-                            item.salvar()
-            else:
-                consignacao.status = "Parcial"
+                            alterados[item.id] = item
+                else:
+                    consignacao.status = "Parcial"
+                    
+                # Gravar itens, estoque, movimentações e totais em lote
+                ItemConsignacao.atualizar_em_lote(list(alterados.values()))
+                Produto.baixar_estoque_disponivel(saidas)
+                Produto.baixar_estoque(
+                    (produto_id, -quantidade)
+                    for produto_id, tipo, quantidade, _ in movimentacoes if tipo == 'entrada'
+                )
+                Produto.registrar_movimentacoes(movimentacoes)
                 
-            consignacao.salvar()
+                consignacao.recalcular_totais()
+                if not consignacao.salvar():
+                    raise RuntimeError("Não foi possível salvar a consignação")
+                    
             return True
             
         except Exception as e:
@@ -201,6 +151,10 @@ class ConsignacaoController:
     def listar_consignacoes() -> List[Consignacao]:
         return Consignacao.obter_todas()
         
+    @staticmethod
+    def listar_consignacoes_pagina(limite: int, apos_id: Optional[int] = None) -> List[Consignacao]:
+        return Consignacao.obter_pagina(limite, apos_id)
+        
     @staticmethod
     def obter_consignacao(id: int) -> Optional[Consignacao]:
         return Consignacao.obter_por_id(id)
@@ -1,9 +1,22 @@
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
+from database.db_manager import gerenciador_bd
 from models.pagamento import Pagamento
 from models.venda import Venda, ItemVenda
 from models.cliente import Cliente
 
+# Tipos de pagamento que geram dívida a receber
+PARCELAMENTOS = ("Parcelado Boleto", "Parcelado Promissória")
+
+# Condição (sobre a tabela vendas) que identifica uma dívida em aberto
+CONDICAO_DIVIDAS = "status = 'pendente' AND tipo_pagamento IN (?, ?)"
+
+# Modificador de data SQLite: vence no mês seguinte se o dia da venda já passou do dia de vencimento
+DESLOCAMENTO_MES = (
+    "CASE WHEN CAST(strftime('%d', v.data_venda) AS INTEGER) > v.dia_vencimento "
+    "THEN '+1 month' ELSE '+0 month' END"
+)
+
 class PagamentoController:
     """Controlador para gerenciar operações relacionadas a pagamentos."""
     
@@ -12,6 +25,9 @@ class PagamentoController:
         """
         Registra um pagamento para uma venda fiado.
         
+        Chamado dentro de uma transacao() do chamador, o erro é propagado
+        para que a transação inteira seja desfeita.
+        
         Args:
             venda_id (int): ID da venda
             valor (float): Valor do pagamento
@@ -19,14 +35,19 @@ class PagamentoController:
             
         Returns:
             Pagamento ou None: Pagamento registrado ou None se erro
+            
+        Raises:
+            ValueError, RuntimeError: Se chamado dentro de uma transação e o
+                pagamento não puder ser registrado
         """
+        em_transacao = gerenciador_bd.em_transacao
         try:
             # Verificar se a venda existe e é fiado
             venda = Venda.obter_por_id(venda_id)
             if not venda:
                 raise ValueError("Venda não encontrada")
                 
-            if venda.tipo_pagamento not in ["Parcelado Boleto", "Parcelado Promissória"]:
+            if venda.tipo_pagamento not in PARCELAMENTOS:
                 raise ValueError("A venda não é do tipo parcelado")
                 
             # Criar o pagamento
@@ -36,23 +57,62 @@ class PagamentoController:
                 observacoes=observacoes
             )
             
-            # Salvar o pagamento
-            if pagamento.salvar():
-                # Verificar se o pagamento quitou a dívida
-                pagamentos_existentes = Pagamento.obter_por_venda(venda_id)
-                total_pago = sum(p.valor for p in pagamentos_existentes) + valor
+            # Salvar o pagamento e a eventual quitação em uma única transação
+            with gerenciador_bd.transacao():
+                if not pagamento.salvar():
+                    raise RuntimeError("Não foi possível salvar o pagamento")
                 
-                # Se o total pago cobrir o valor da venda, atualizar o status
-                if total_pago >= venda.valor_total:
+                # O valor pago da venda já inclui este pagamento (trigger do banco):
+                # se cobrir o valor da venda, a dívida está quitada
+                quitada = gerenciador_bd.executar_consulta(
+                    "UPDATE vendas SET status='pago' WHERE id=? AND status != 'pago' AND valor_pago >= valor_total",
+                    (venda_id,)
+                ).rowcount
+                if quitada:
                     venda.status = "pago"
-                    venda.salvar()
                     
-                return pagamento
-            return None
+            return pagamento
         except Exception as e:
             print(f"Erro ao registrar pagamento: {e}")
+            if em_transacao:
+                raise
             return None
     
+    @staticmethod
+    def quitar_vendas(valores_pendentes: dict, observacoes: str = None) -> int:
+        """
+        Registra o pagamento do saldo de várias vendas em uma única transação.
+        
+        Se qualquer pagamento falhar, nenhum é registrado.
+        
+        Args:
+            valores_pendentes (dict): Valor a pagar por ID de venda
+            observacoes (str, opcional): Observações dos pagamentos
+            
+        Returns:
+            int: Número de pagamentos registrados
+            
+        Raises:
+            ValueError, RuntimeError: Se algum pagamento não puder ser registrado
+        """
+        registrados = 0
+        with gerenciador_bd.transacao():
+            for venda_id, valor in valores_pendentes.items():
+                if valor > 0:
+                    PagamentoController.registrar_pagamento(venda_id, valor, observacoes)
+                    registrados += 1
+        return registrados
+    
+    @staticmethod
+    def recalcular_saldos() -> int:
+        """
+        Recalcula o valor pago e o saldo de todas as vendas a partir dos pagamentos.
+        
+        Returns:
+            int: Número de vendas corrigidas
+        """
+        return Venda.recalcular_valores_pagos()
+    
     @staticmethod
     def obter_pagamento(pagamento_id: int) -> Optional[Pagamento]:
         """
@@ -90,94 +150,70 @@ class PagamentoController:
         return Pagamento.obter_por_venda(venda_id)
     
     @staticmethod
-    def obter_dividas_pendentes() -> List[dict]:
+    def obter_dividas_pendentes(incluir_pagamentos: bool = True) -> List[dict]:
         """
         Obtém todas as dívidas pendentes com informações detalhadas.
         
+        Valor pago e saldo são lidos da própria linha da venda, e a data de
+        vencimento é calculada pelo banco na mesma consulta. A data de
+        vencimento é o dia configurado na venda (no mês da venda, ou no
+        seguinte se o dia já passou, limitado ao último dia do mês) ou,
+        sem dia configurado, 30 dias após a venda.
+        
+        Args:
+            incluir_pagamentos (bool): Se True, carrega também o histórico de
+                pagamentos de cada dívida (uma consulta adicional)
+        
         Returns:
             List[dict]: Lista de dívidas pendentes com informações do cliente, venda e valores
         """
-        # Obter todas as vendas pendentes (apenas parceladas)
-        vendas_pendentes = Venda.obter_vendas_pendentes()
-        # Filtrar apenas vendas parceladas (boleto ou promissória)
-        vendas_pendentes = [v for v in vendas_pendentes 
-                           if v.tipo_pagamento in ["Parcelado Boleto", "Parcelado Promissória"]]
+        query = f"""
+            SELECT v.*,
+                   c.nome AS cliente_nome,
+                   c.telefone AS cliente_telefone,
+                   CASE
+                       WHEN v.dia_vencimento BETWEEN 1 AND 31 THEN MIN(
+                           date(v.data_venda, 'start of month', {DESLOCAMENTO_MES},
+                                '+' || (v.dia_vencimento - 1) || ' days'),
+                           date(v.data_venda, 'start of month', {DESLOCAMENTO_MES}, '+1 month', '-1 day')
+                       )
+                       ELSE date(v.data_venda, '+30 days')
+                   END AS data_vencimento
+            FROM vendas v
+            LEFT JOIN clientes c ON c.id = v.cliente_id
+            WHERE {CONDICAO_DIVIDAS}
+            ORDER BY v.data_venda DESC
+        """
+        rows = gerenciador_bd.buscar_todos(query, PARCELAMENTOS)
+        hoje = datetime.now().date()
         
         dividas = []
-        for venda in vendas_pendentes:
-            # Obter pagamentos já realizados para esta venda
-            pagamentos = Pagamento.obter_por_venda(venda.id)
-            total_pago = sum(p.valor for p in pagamentos)
+        for row in rows:
+            venda = Venda.from_row(row)
+            if row['cliente_nome'] is not None:
+                # Cliente parcial com os dados exibidos na aba de cobranças
+                venda.cliente = Cliente(id=venda.cliente_id, nome=row['cliente_nome'],
+                                        telefone=row['cliente_telefone'])
+            data_vencimento = datetime.fromisoformat(row['data_vencimento']) if row['data_vencimento'] else None
+            dias_atraso = max(0, (hoje - data_vencimento.date()).days) if data_vencimento else 0
             
-            # Calcular valores pendentes
-            valor_total = venda.valor_total
-            valor_pago = total_pago
-            valor_pendente = valor_total - valor_pago
-            
-            # Obter informações do cliente
-            cliente = venda.cliente
-            if not cliente:
-                cliente = Cliente.obter_por_id(venda.cliente_id) if venda.cliente_id else None
-            
-            # Calcular data de vencimento
-            data_vencimento = None
-            dias_atraso = 0
-            
-            if venda.data_venda:
-                # Para vendas parceladas, usar o dia do vencimento configurado na venda
-                # Se não houver dia configurado, usar 30 dias após a venda
-                if hasattr(venda, 'dia_vencimento') and venda.dia_vencimento:
-                    try:
-                        # Criar data de vencimento com base no dia configurado
-                        mes_vencimento = venda.data_venda.month
-                        ano_vencimento = venda.data_venda.year
-                        
-                        # Se o dia da venda for depois do dia de vencimento, usar próximo mês
-                        if venda.data_venda.day > venda.dia_vencimento:
-                            if mes_vencimento == 12:
-                                mes_vencimento = 1
-                                ano_vencimento += 1
-                            else:
-                                mes_vencimento += 1
-                        
-                        # Tratar meses com menos dias (fevereiro, etc)
-                        max_day = 28
-                        if mes_vencimento in [1, 3, 5, 7, 8, 10, 12]:
-                            max_day = 31
-                        elif mes_vencimento in [4, 6, 9, 11]:
-                            max_day = 30
-                        else:  # fevereiro
-                            # Verificar se é ano bissexto
-                            if (ano_vencimento % 4 == 0 and ano_vencimento % 100 != 0) or (ano_vencimento % 400 == 0):
-                                max_day = 29
-                            else:
-                                max_day = 28
-                        
-                        dia_vencimento = min(venda.dia_vencimento, max_day)
-                        data_vencimento = datetime(ano_vencimento, mes_vencimento, dia_vencimento)
-                    except ValueError:
-                        # Em caso de erro, usar 30 dias após a venda
-                        data_vencimento = venda.data_venda + timedelta(days=30)
-                else:
-                    # Padrão: 30 dias após a venda
-                    data_vencimento = venda.data_venda + timedelta(days=30)
-                
-                # Calcular dias de atraso
-                if datetime.now().date() > data_vencimento.date():
-                    dias_atraso = (datetime.now().date() - data_vencimento.date()).days
-            
-            divida_info = {
+            dividas.append({
                 'venda': venda,
-                'cliente': cliente,
-                'valor_total': valor_total,
-                'valor_pago': valor_pago,
-                'valor_pendente': valor_pendente,
+                'cliente': venda.cliente,
+                'valor_total': venda.valor_total,
+                'valor_pago': row['valor_pago'],
+                'valor_pendente': row['saldo'],
                 'data_vencimento': data_vencimento,
                 'dias_atraso': dias_atraso,
-                'pagamentos': pagamentos
-            }
+                'pagamentos': None
+            })
             
-            dividas.append(divida_info)
+        if incluir_pagamentos and dividas:
+            pagamentos_por_venda = Pagamento.obter_agrupados_por_venda(
+                CONDICAO_DIVIDAS, PARCELAMENTOS, [d['venda'] for d in dividas]
+            )
+            for divida in dividas:
+                divida['pagamentos'] = pagamentos_por_venda.get(divida['venda'].id, [])
             
         return dividas
     
@@ -189,15 +225,20 @@ class PagamentoController:
         Returns:
             dict: Totais das dívidas
         """
-        dividas = PagamentoController.obter_dividas_pendentes()
-        
-        total_dividas = sum(d['valor_total'] for d in dividas)
-        total_pago = sum(d['valor_pago'] for d in dividas)
-        total_pendente = sum(d['valor_pendente'] for d in dividas)
+        query = f"""
+            SELECT COALESCE(SUM(v.valor_total), 0) AS total_dividas,
+                   COALESCE(SUM(v.valor_pago), 0) AS total_pago,
+                   COALESCE(SUM(v.saldo), 0) AS total_pendente,
+                   COUNT(DISTINCT c.id) AS numero_clientes
+            FROM vendas v
+            LEFT JOIN clientes c ON c.id = v.cliente_id
+            WHERE {CONDICAO_DIVIDAS}
+        """
+        row = gerenciador_bd.buscar_um(query, PARCELAMENTOS)
         
         return {
-            'total_dividas': total_dividas,
-            'total_pago': total_pago,
-            'total_pendente': total_pendente,
-            'numero_clientes_devendo': len(set(d['cliente'].id for d in dividas if d['cliente']))
-        }
\ No newline at end of file
+            'total_dividas': row['total_dividas'],
+            'total_pago': row['total_pago'],
+            'total_pendente': row['total_pendente'],
+            'numero_clientes_devendo': row['numero_clientes']
+        }
@@ -1,5 +1,6 @@
 from typing import List, Optional
-from models.produto import Produto
+from models.produto import Produto, DivergenciaEstoque
+from database.db_manager import gerenciador_bd
 
 class ProdutoController:
     """Controlador para gerenciar operações relacionadas a produtos."""
@@ -35,10 +36,14 @@ class ProdutoController:
     @staticmethod
     def atualizar_produto(produto_id: int, nome: str = None, categoria: str = None,
                          preco_custo: float = None, preco_venda: float = None,
-                         quantidade: int = None, caminho_imagem: str = None) -> Optional[Produto]:
+                         quantidade: int = None, caminho_imagem: str = None,
+                         quantidade_anterior: int = None) -> Optional[Produto]:
         """
         Atualiza um produto existente.
         
+        A mudança de quantidade é registrada como movimentação "Ajuste manual"
+        e aplicada como diferença sobre o estoque atual.
+        
         Args:
             produto_id (int): ID do produto a ser atualizado
             nome (str, opcional): Novo nome do produto
@@ -47,9 +52,15 @@ class ProdutoController:
             preco_venda (float, opcional): Novo preço de venda
             quantidade (int, opcional): Nova quantidade em estoque
             caminho_imagem (str, opcional): Novo caminho para a imagem do produto
+            quantidade_anterior (int, opcional): Quantidade exibida quando a edição
+                começou; se omitida, a quantidade lida agora do banco
             
         Returns:
             Produto ou None: Produto atualizado ou None se não encontrado
+            
+        Raises:
+            EstoqueInsuficiente: Se a redução de quantidade for maior que o estoque
+                atual; nenhuma alteração do produto é gravada
         """
         produto = Produto.obter_por_id(produto_id)
         if not produto:
@@ -63,12 +74,19 @@ class ProdutoController:
             produto.preco_custo = preco_custo
         if preco_venda is not None:
             produto.preco_venda = preco_venda
-        if quantidade is not None:
-            produto.quantidade = quantidade
         if caminho_imagem is not None:
             produto.caminho_imagem = caminho_imagem
             
-        produto.salvar()
+        with gerenciador_bd.transacao():
+            if not produto.salvar():
+                return None
+            if quantidade is not None:
+                if quantidade_anterior is None:
+                    quantidade_anterior = produto.quantidade
+                Produto.ajustar_estoque(produto_id, quantidade, quantidade_anterior)
+                produto.quantidade = gerenciador_bd.buscar_um(
+                    "SELECT quantidade FROM produtos WHERE id=?", (produto_id,)
+                )['quantidade']
         return produto
     
     @staticmethod
@@ -105,23 +123,77 @@ class ProdutoController:
         """
         Lista todos os produtos.
         
+        A leitura é compartilhada pelo processo inteiro e refeita apenas depois
+        que algum produto é gravado; os objetos são os mesmos entre chamadas.
+        
         Returns:
             List[Produto]: Lista de todos os produtos
         """
-        return Produto.obter_todos()
+        return list(gerenciador_bd.ler_com_cache("listar_produtos", ("produtos",), Produto.obter_todos))
+    
+    @staticmethod
+    def versao_produtos() -> tuple:
+        """
+        Retorna a versão atual dos dados de produtos.
+        
+        Returns:
+            tuple: Valor que muda sempre que algum produto é gravado
+        """
+        return gerenciador_bd.versao_dados("produtos")
+    
+    @staticmethod
+    def listar_produtos_pagina(limite: int, apos_id: Optional[int] = None) -> List[Produto]:
+        """
+        Lista uma página de produtos em ordem alfabética.
+        
+        Args:
+            limite (int): Quantidade máxima de registros
+            apos_id (int, opcional): ID do último registro da página anterior
+            
+        Returns:
+            List[Produto]: Registros da página
+        """
+        return Produto.obter_pagina(limite, apos_id)
+    
+    @staticmethod
+    def buscar_produtos(termo: str, limite: int = None) -> List[Produto]:
+        """
+        Busca produtos por nome e categoria, ignorando acentos e casando prefixos.
+        
+        Args:
+            termo (str): Palavras ou início das palavras procuradas
+            limite (int, opcional): Quantidade máxima de resultados
+            
+        Returns:
+            List[Produto]: Produtos encontrados, ordenados por relevância
+        """
+        return Produto.buscar(termo, limite)
     
     @staticmethod
-    def buscar_produtos(nome: str) -> List[Produto]:
+    def buscar_ids_produtos(termo: str) -> Optional[set]:
         """
-        Busca produtos pelo nome.
+        Retorna os IDs dos produtos que correspondem ao termo, sem ordenar.
         
         Args:
-            nome (str): Nome ou parte do nome do produto
+            termo (str): Palavras ou início das palavras procuradas
             
         Returns:
-            List[Produto]: Lista de produtos encontrados
+            Optional[set]: IDs encontrados, ou None se o termo está em branco
         """
-        return Produto.buscar_por_nome(nome)
+        return Produto.buscar_ids(termo)
+    
+    @staticmethod
+    def buscar_ids_produtos_por_relevancia(termo: str) -> Optional[list]:
+        """
+        Retorna os IDs dos produtos que correspondem ao termo, ordenados por relevância.
+        
+        Args:
+            termo (str): Palavras ou início das palavras procuradas
+            
+        Returns:
+            Optional[list]: IDs do mais ao menos relevante, ou None se o termo está em branco
+        """
+        return Produto.buscar_ids_por_relevancia(termo)
     
     @staticmethod
     def verificar_estoque_baixo(limite: int = 5) -> List[Produto]:
@@ -134,5 +206,18 @@ class ProdutoController:
         Returns:
             List[Produto]: Lista de produtos com estoque baixo
         """
-        todos_produtos = Produto.obter_todos()
-        return [produto for produto in todos_produtos if produto.quantidade <= limite]
\ No newline at end of file
+        todos_produtos = ProdutoController.listar_produtos()
+        return [produto for produto in todos_produtos if produto.quantidade <= limite]
+    
+    @staticmethod
+    def reconciliar_estoque(produto_ids: Optional[List[int]] = None) -> List[DivergenciaEstoque]:
+        """
+        Confere o estoque dos produtos com o saldo materializado e as movimentações.
+        
+        Args:
+            produto_ids (List[int], opcional): Produtos a conferir (todos, se omitido)
+            
+        Returns:
+            List[DivergenciaEstoque]: Produtos com divergência (vazia se tudo confere)
+        """
+        return Produto.reconciliar_estoque(produto_ids)
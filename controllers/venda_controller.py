@@ -1,7 +1,8 @@
 from typing import List, Optional
 from datetime import datetime
-from models.venda import Venda, ItemVenda
-from models.produto import Produto
+from database.db_manager import gerenciador_bd
+from models.venda import Venda, ItemVenda, LinhaVenda, FiltroVendas
+from models.produto import Produto, EstoqueInsuficiente
 from models.cliente import Cliente
 
 class VendaController:
@@ -21,6 +22,9 @@ class VendaController:
             
         Returns:
             Venda ou None: Venda criada ou None se erro
+            
+        Raises:
+            EstoqueInsuficiente: Se algum produto não tiver a quantidade vendida em estoque
         """
         if itens is None:
             itens = []
@@ -51,16 +55,26 @@ class VendaController:
             )
             venda.itens.append(item)
         
-        # Salvar a venda
-        if venda.salvar():
-            # Atualizar o estoque dos produtos
-            for item in venda.itens:
-                produto = Produto.obter_por_id(item.produto_id)
-                if produto:
-                    produto.quantidade -= item.quantidade
-                    produto.salvar()
-            return venda
-        return None
+        # Baixar o estoque e salvar a venda em uma única transação
+        try:
+            with gerenciador_bd.transacao():
+                # Baixa condicional: faltando qualquer produto, a venda inteira é recusada
+                Produto.baixar_estoque_disponivel((item.produto_id, item.quantidade) for item in venda.itens)
+                
+                if not venda.salvar():
+                    raise RuntimeError("Não foi possível salvar a venda")
+                
+                Produto.registrar_movimentacoes(
+                    (item.produto_id, 'saida', item.quantidade, f"Venda #{venda.id}") for item in venda.itens
+                )
+        except EstoqueInsuficiente:
+            venda.id = None
+            raise
+        except Exception as e:
+            print(f"Erro ao criar venda: {e}")
+            venda.id = None
+            return None
+        return venda
     
     @staticmethod
     def registrar_pagamento(venda_id: int, valor: float, observacoes: str = None) -> bool:
@@ -114,6 +128,49 @@ class VendaController:
         """
         return Venda.obter_todas()
     
+    @staticmethod
+    def listar_vendas_pagina(limite: int, apos_id: Optional[int] = None) -> List[Venda]:
+        """
+        Lista uma página de vendas, da mais recente para a mais antiga.
+        
+        Args:
+            limite (int): Quantidade máxima de registros
+            apos_id (int, opcional): ID do último registro da página anterior
+            
+        Returns:
+            List[Venda]: Registros da página
+        """
+        return Venda.obter_pagina(limite, apos_id)
+    
+    @staticmethod
+    def consultar_vendas(filtro: FiltroVendas) -> List[LinhaVenda]:
+        """
+        Consulta as linhas da tabela de vendas que atendem ao filtro.
+        
+        Período, status e busca por cliente são resolvidos pelo banco, com
+        limite e paginação por chave; apenas as colunas exibidas são lidas.
+        
+        Args:
+            filtro (FiltroVendas): Critérios, limite e posição da página
+            
+        Returns:
+            List[LinhaVenda]: Linhas da mais recente para a mais antiga
+        """
+        return Venda.consultar(filtro)
+    
+    @staticmethod
+    def totais_vendas(filtro: FiltroVendas) -> dict:
+        """
+        Soma o valor e conta, por status, todas as vendas que atendem ao filtro.
+        
+        Args:
+            filtro (FiltroVendas): Critérios da consulta
+            
+        Returns:
+            dict: Para cada status, um dicionário com 'valor_total' e 'quantidade'
+        """
+        return Venda.obter_totais_filtro(filtro)
+    
     @staticmethod
     def listar_vendas_pendentes() -> List[Venda]:
         """
@@ -124,6 +181,20 @@ class VendaController:
         """
         return Venda.obter_vendas_pendentes()
     
+    @staticmethod
+    def totais_por_status(periodo_inicio: datetime = None, periodo_fim: datetime = None) -> dict:
+        """
+        Soma o valor e conta as vendas de um período por status, sem carregá-las.
+        
+        Args:
+            periodo_inicio (datetime, opcional): Data de início do período
+            periodo_fim (datetime, opcional): Data de fim do período
+            
+        Returns:
+            dict: Para cada status, um dicionário com 'valor_total' e 'quantidade'
+        """
+        return Venda.obter_totais_por_status(periodo_inicio, periodo_fim)
+    
     @staticmethod
     def calcular_financeiro(periodo_inicio: datetime = None, periodo_fim: datetime = None) -> dict:
         """
@@ -136,35 +207,20 @@ class VendaController:
         Returns:
             dict: Informações financeiras
         """
-        todas_vendas = Venda.obter_todas()
-        
-        # Filtrar por período se especificado
-        if periodo_inicio or periodo_fim:
-            vendas_filtradas = []
-            for venda in todas_vendas:
-                if periodo_inicio and venda.data_venda < periodo_inicio:
-                    continue
-                if periodo_fim and venda.data_venda > periodo_fim:
-                    continue
-                vendas_filtradas.append(venda)
-        else:
-            vendas_filtradas = todas_vendas
-            
-        # Calcular totais
-        total_recebido = sum(venda.valor_total for venda in vendas_filtradas if venda.status == "pago")
-        total_a_receber = sum(venda.valor_total for venda in vendas_filtradas if venda.status == "pendente")
+        # Totais agregados pelo banco, sem carregar as vendas
+        totais = Venda.obter_totais_por_status(periodo_inicio, periodo_fim)
+        vazio = {'valor_total': 0.0, 'quantidade': 0}
+        
+        total_recebido = totais.get("pago", vazio)['valor_total']
+        total_a_receber = totais.get("pendente", vazio)['valor_total']
+        numero_vendas = sum(t['quantidade'] for t in totais.values())
         
         # Clientes inadimplentes (com vendas parceladas pendentes)
-        clientes_inadimplentes = []
-        for venda in Venda.obter_vendas_pendentes():
-            if venda.cliente_id:
-                cliente = Cliente.obter_por_id(venda.cliente_id)
-                if cliente and cliente not in clientes_inadimplentes:
-                    clientes_inadimplentes.append(cliente)
+        clientes_inadimplentes = Cliente.obter_inadimplentes()
         
         return {
             "total_recebido": total_recebido,
             "total_a_receber": total_a_receber,
             "clientes_inadimplentes": clientes_inadimplentes,
-            "numero_vendas": len(vendas_filtradas)
+            "numero_vendas": numero_vendas
         }
\ No newline at end of file
@@ -1,17 +1,84 @@
 import sqlite3
 import os
-from typing import Optional
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Sequence
 import logging
 
+from database.migracoes import MIGRACOES
+
+def expressao_busca_texto(termo: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma expressão MATCH do FTS5.
+    
+    Cada palavra vira um prefixo entre aspas ("zirc"*) e todas precisam
+    aparecer no registro. Aspas e operadores digitados são tratados como texto.
+    
+    Returns:
+        str ou None: Expressão MATCH, ou None se o texto não tiver palavras
+    """
+    palavras = re.findall(r"\w+", termo or "")
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"*' for palavra in palavras)
+
+
+# Tabela alterada por uma instrução de escrita (INSERT/REPLACE/UPDATE/DELETE)
+PADRAO_TABELA_ALTERADA = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE
+)
+
+
+# Perfis de configuração da conexão (PRAGMAs aplicados ao conectar, em ordem).
+# "Desempenho" usa WAL: leituras (relatórios) não bloqueiam a gravação do caixa
+# e cada confirmação grava apenas no log, sem sincronizar o banco inteiro.
+PERFIS_BANCO = {
+    "Desempenho": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+        "cache_size": -20000,
+        "busy_timeout": 5000,
+    },
+    "Padrão": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "busy_timeout": 5000,
+    },
+}
+
+PERFIL_BANCO_PADRAO = "Desempenho"
+
+# Número máximo de conexões de leitura abertas ao mesmo tempo
+TAMANHO_POOL_LEITURA = 4
+
 class GerenciadorBancoDados:
-    """Gerencia conexões e operações com o banco de dados para o sistema da loja de semijoias."""
+    """
+    Gerencia conexões e operações com o banco de dados para o sistema da loja de semijoias.
+    
+    Pode ser usado a partir de várias threads (QThreads, executores). As
+    gravações passam por uma única conexão de escrita, serializada por uma
+    trava; as leituras de buscar_todos/buscar_um usam um pool limitado de
+    conexões somente leitura, de modo que consultas em segundo plano rodam em
+    paralelo entre si e com as gravações.
+    """
     
-    def __init__(self, caminho_banco: str = None):
+    def __init__(self, caminho_banco: str = None, perfil: str = PERFIL_BANCO_PADRAO,
+                 tamanho_pool: int = TAMANHO_POOL_LEITURA):
         """
         Inicializa o gerenciador de banco de dados.
         
         Args:
             caminho_banco (str): Caminho para o arquivo do banco de dados SQLite
+            perfil (str): Nome do perfil de PRAGMAs em PERFIS_BANCO
+            tamanho_pool (int): Máximo de conexões de leitura simultâneas
         """
         if caminho_banco is None:
             # Define o caminho padrão relativo ao diretório do aplicativo (glamour_app)
@@ -20,221 +87,336 @@ class GerenciadorBancoDados:
             caminho_banco = os.path.join(base_dir, "loja_semijoias.db")
             
         self.caminho_banco = caminho_banco
-        self.conexao: Optional[sqlite3.Connection] = None
+        self.tamanho_pool = tamanho_pool
+        self.conexao: Optional[sqlite3.Connection] = None  # Conexão de escrita
+        self._trava_escrita = threading.RLock()
+        self._nivel_transacao = 0
+        self._dono_transacao = None
+        self._rastreamento = None
+        
+        # Pool de leitura: conexões livres, total criado e geração (invalida o pool)
+        self._leitor_disponivel = threading.Condition()
+        self._leitores_livres = []
+        self._leitores_criados = 0
+        self._geracao_pool = 0
+        
+        # Versão dos dados de cada tabela: aumenta a cada gravação confirmada
+        # pelo gerenciador e invalida as leituras guardadas em ler_com_cache
+        self._trava_cache = threading.Lock()
+        self._versoes = {}
+        self._geracao_dados = 0
+        self._tabelas_alteradas = set()  # Alteradas na transação em andamento
+        self._cache_leituras = {}
+        
+        self.perfil = None
+        self.definir_perfil(perfil)
+        
+    def _abrir_conexao(self, leitura: bool = False) -> sqlite3.Connection:
+        """
+        Abre uma nova conexão com o perfil atual aplicado.
+        
+        Args:
+            leitura (bool): Se True, a conexão é somente leitura
+            
+        Returns:
+            sqlite3.Connection: Conexão aberta
+        """
+        conexao = sqlite3.connect(self.caminho_banco, check_same_thread=False)
+        conexao.row_factory = sqlite3.Row  # Permite acesso às colunas pelo nome
+        try:
+            self._aplicar_perfil(conexao, leitura)
+            if leitura:
+                conexao.execute("PRAGMA query_only = ON")
+        except Exception:
+            conexao.close()
+            raise
+        conexao.set_trace_callback(self._rastreamento)
+        return conexao
         
     def conectar(self) -> sqlite3.Connection:
         """
-        Estabelece uma conexão com o banco de dados.
+        Estabelece a conexão de escrita com o banco de dados.
         
         Returns:
             sqlite3.Connection: Objeto de conexão com o banco de dados
         """
-        if self.conexao is None:
-            # Cria diretório se não existir
-            diretorio_banco = os.path.dirname(self.caminho_banco)
-            if diretorio_banco and not os.path.exists(diretorio_banco):
-                os.makedirs(diretorio_banco)
+        with self._trava_escrita:
+            if self.conexao is None:
+                # Cria diretório se não existir
+                diretorio_banco = os.path.dirname(self.caminho_banco)
+                if diretorio_banco and not os.path.exists(diretorio_banco):
+                    os.makedirs(diretorio_banco)
+                    
+                conexao = self._abrir_conexao()
+                try:
+                    self._aplicar_migracoes(conexao)
+                except Exception:
+                    conexao.close()
+                    raise
+                self.conexao = conexao
                 
-            self.conexao = sqlite3.connect(self.caminho_banco)
-            self.conexao.row_factory = sqlite3.Row  # Permite acesso às colunas pelo nome
-            self._inicializar_tabelas()
-            self._atualizar_esquema()  # Atualizar esquema se necessário
-            
-        return self.conexao
+            return self.conexao
     
     def desconectar(self):
-        """Fecha a conexão com o banco de dados."""
-        if self.conexao:
-            self.conexao.close()
-            self.conexao = None
+        """Fecha a conexão de escrita e as conexões de leitura livres."""
+        with self._trava_escrita:
+            self._descartar_leitores()
+            if self.conexao:
+                self.conexao.close()
+                self.conexao = None
+            # A próxima conexão pode ser outro arquivo
+            self.invalidar_cache()
     
-    def _inicializar_tabelas(self):
-        """Cria as tabelas se elas não existirem."""
-        conexao = self.conectar()
-        cursor = conexao.cursor()
-        
-        # Tabela de produtos
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS produtos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                categoria TEXT NOT NULL,
-                preco_custo REAL NOT NULL,
-                preco_venda REAL NOT NULL,
-                quantidade INTEGER NOT NULL DEFAULT 0,
-                caminho_imagem TEXT,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de clientes
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS clientes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                telefone TEXT,
-                email TEXT,
-                tipo TEXT DEFAULT 'Avulso', -- 'Avulso' ou 'Revendedora'
-                comissao_padrao REAL DEFAULT 0.0,
-                observacoes TEXT,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de vendas (versão inicial sem dia_vencimento)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vendas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cliente_id INTEGER,
-                valor_total REAL NOT NULL,
-                tipo_pagamento TEXT NOT NULL, -- 'Dinheiro', 'Cartão Crédito', 'Cartão Débito', 'PIX', 'Parcelado Boleto', 'Parcelado Promissória'
-                status TEXT NOT NULL, -- 'pago' ou 'pendente'
-                data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                observacoes TEXT,
-                FOREIGN KEY (cliente_id) REFERENCES clientes (id)
-            )
-        ''')
-        
-        # Tabela de itens de venda (produtos em uma venda)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS itens_venda (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                venda_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                quantidade INTEGER NOT NULL,
-                preco_unitario REAL NOT NULL,
-                FOREIGN KEY (venda_id) REFERENCES vendas (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-        ''')
-        
-        # Tabela de pagamentos (para vendas parceladas)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pagamentos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                venda_id INTEGER NOT NULL,
-                valor REAL NOT NULL,
-                data_pagamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                observacoes TEXT,
-                FOREIGN KEY (venda_id) REFERENCES vendas (id)
-            )
-        ''')
-        
-        # Tabela de movimentações de estoque
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS movimentacoes_estoque (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                produto_id INTEGER NOT NULL,
-                tipo_movimentacao TEXT NOT NULL, -- 'entrada' ou 'saida'
-                quantidade INTEGER NOT NULL,
-                observacoes TEXT,
-                data_movimentacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-        ''')
-
-        # Tabela de consignações
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS consignacoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cliente_id INTEGER NOT NULL,
-                data_envio TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'Aberta', -- 'Aberta', 'Parcial', 'Fechada'
-                data_fechamento TIMESTAMP,
-                total_vendido REAL DEFAULT 0.0,
-                total_comissao REAL DEFAULT 0.0,
-                total_liquido REAL DEFAULT 0.0,
-                observacoes TEXT,
-                criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (cliente_id) REFERENCES clientes (id)
-            )
-        ''')
-
-        # Tabela de itens de consignação
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS itens_consignacao (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                consignacao_id INTEGER NOT NULL,
-                produto_id INTEGER NOT NULL,
-                qtd_enviada INTEGER NOT NULL,
-                qtd_vendida INTEGER DEFAULT 0,
-                qtd_devolvida INTEGER DEFAULT 0,
-                preco_unitario REAL NOT NULL,
-                comissao_percentual REAL NOT NULL,
-                FOREIGN KEY (consignacao_id) REFERENCES consignacoes (id),
-                FOREIGN KEY (produto_id) REFERENCES produtos (id)
-            )
-        ''')
-        
-        conexao.commit()
+    def _descartar_leitores(self):
+        """Fecha as conexões de leitura livres; as em uso são fechadas ao serem devolvidas."""
+        with self._leitor_disponivel:
+            for conexao in self._leitores_livres:
+                conexao.close()
+            self._leitores_livres = []
+            self._leitores_criados = 0
+            self._geracao_pool += 1
+            self._leitor_disponivel.notify_all()
     
-    def _atualizar_esquema(self):
-        """Atualiza o esquema do banco de dados para versões mais recentes."""
-        conexao = self.conectar()
-        cursor = conexao.cursor()
-        
-        # Verificar se a coluna dia_vencimento existe na tabela vendas
-        cursor.execute("PRAGMA table_info(vendas)")
-        colunas_vendas = cursor.fetchall()
-        nomes_colunas_vendas = [coluna[1] for coluna in colunas_vendas]
-        
-        # Se a coluna dia_vencimento não existir, adicioná-la
-        if 'dia_vencimento' not in nomes_colunas_vendas:
-            try:
-                cursor.execute("ALTER TABLE vendas ADD COLUMN dia_vencimento INTEGER")
-                conexao.commit()
-                print("Coluna dia_vencimento adicionada à tabela vendas")
-            except Exception as e:
-                print(f"Erro ao adicionar coluna dia_vencimento: {e}")
-
-        # Se a coluna observacoes não existir em vendas, adicioná-la
-        if 'observacoes' not in nomes_colunas_vendas:
-            try:
-                cursor.execute("ALTER TABLE vendas ADD COLUMN observacoes TEXT")
-                conexao.commit()
-                print("Coluna observacoes adicionada à tabela vendas")
-            except Exception as e:
-                print(f"Erro ao adicionar coluna observacoes em vendas: {e}")
-
-        # Atualizar tabela clientes com novos campos
-        cursor.execute("PRAGMA table_info(clientes)")
-        colunas_clientes = cursor.fetchall()
-        nomes_colunas_clientes = [coluna[1] for coluna in colunas_clientes]
-
-        if 'email' not in nomes_colunas_clientes:
+    @contextmanager
+    def _conexao_leitura(self):
+        """
+        Empresta uma conexão de leitura do pool durante o bloco.
+        
+        Dentro de uma transacao() da própria thread a leitura usa a conexão de
+        escrita, para enxergar as alterações ainda não confirmadas.
+        
+        Yields:
+            sqlite3.Connection: Conexão para leitura
+        """
+        if self._dono_transacao == threading.get_ident() or self.caminho_banco == ":memory:":
+            with self._trava_escrita:
+                yield self.conectar()
+            return
+        
+        if self.conexao is None:
+            self.conectar()  # Garante o esquema migrado antes de abrir leitores
+        with self._leitor_disponivel:
+            while not self._leitores_livres and self._leitores_criados >= self.tamanho_pool:
+                self._leitor_disponivel.wait()
+            geracao = self._geracao_pool
+            if self._leitores_livres:
+                conexao = self._leitores_livres.pop()
+            else:
+                conexao = None
+                self._leitores_criados += 1
+        
+        if conexao is None:
             try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN email TEXT")
-                conexao.commit()
-                print("Coluna email adicionada à tabela clientes")
-            except Exception as e:
-                print(f"Erro ao adicionar coluna email: {e}")
-
-        if 'tipo' not in nomes_colunas_clientes:
+                conexao = self._abrir_conexao(leitura=True)
+            except Exception:
+                with self._leitor_disponivel:
+                    if geracao == self._geracao_pool:
+                        self._leitores_criados -= 1
+                        self._leitor_disponivel.notify()
+                raise
+        else:
+            conexao.set_trace_callback(self._rastreamento)
+        
+        try:
+            yield conexao
+        finally:
+            with self._leitor_disponivel:
+                if geracao == self._geracao_pool:
+                    self._leitores_livres.append(conexao)
+                    self._leitor_disponivel.notify()
+                else:
+                    conexao.close()
+    
+    def definir_perfil(self, perfil: str):
+        """
+        Define o perfil de desempenho das conexões.
+        
+        Se já houver uma conexão aberta, o perfil é aplicado imediatamente;
+        caso contrário, na próxima conexão.
+        
+        Args:
+            perfil (str): Nome do perfil em PERFIS_BANCO
+        """
+        if perfil not in PERFIS_BANCO:
+            raise ValueError(f"Perfil de banco desconhecido: {perfil}")
+        with self._trava_escrita:
+            self.perfil = perfil
+            # Leitores são reabertos com o novo perfil (e não impedem a troca do journal_mode)
+            self._descartar_leitores()
+            if self.conexao is not None and not self._nivel_transacao:
+                self._aplicar_perfil(self.conexao)
+    
+    def definir_rastreamento(self, callback):
+        """
+        Registra uma função chamada com cada instrução SQL executada em qualquer
+        conexão do gerenciador (ou None para remover).
+        
+        Args:
+            callback: Função que recebe o texto da instrução
+        """
+        with self._trava_escrita:
+            self._rastreamento = callback
+            if self.conexao is not None:
+                self.conexao.set_trace_callback(callback)
+        with self._leitor_disponivel:
+            for conexao in self._leitores_livres:
+                conexao.set_trace_callback(callback)
+    
+    def _aplicar_perfil(self, conexao: sqlite3.Connection, leitura: bool = False):
+        """
+        Aplica à conexão os PRAGMAs do perfil atual.
+        
+        Args:
+            conexao (sqlite3.Connection): Conexão com o banco
+            leitura (bool): Se True, mantém o journal_mode definido pela conexão de escrita
+        """
+        for pragma, valor in PERFIS_BANCO[self.perfil].items():
+            if leitura and pragma == "journal_mode":
+                continue
+            conexao.execute(f"PRAGMA {pragma} = {valor}")
+    
+    def _aplicar_migracoes(self, conexao: sqlite3.Connection):
+        """
+        Aplica ao banco as migrações de esquema ainda pendentes.
+        
+        A versão do esquema fica registrada em PRAGMA user_version; quando o
+        banco já está atualizado, a conexão custa apenas a leitura desse
+        pragma. Cada migração roda uma única vez, dentro de uma transação,
+        junto com a atualização da versão.
+        
+        Args:
+            conexao (sqlite3.Connection): Conexão recém-aberta com o banco
+        """
+        versao_atual = conexao.execute("PRAGMA user_version").fetchone()[0]
+        
+        for versao, migracao in enumerate(MIGRACOES[versao_atual:], start=versao_atual + 1):
+            cursor = conexao.cursor()
             try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN tipo TEXT DEFAULT 'Avulso'")
-                cursor.execute("UPDATE clientes SET tipo = 'Avulso' WHERE tipo IS NULL")
+                cursor.execute("BEGIN")
+                migracao(cursor)
+                cursor.execute(f"PRAGMA user_version = {versao}")
                 conexao.commit()
-                print("Coluna tipo adicionada à tabela clientes")
-            except Exception as e:
-                print(f"Erro ao adicionar coluna tipo: {e}")
-
-        if 'comissao_padrao' not in nomes_colunas_clientes:
+            except Exception:
+                conexao.rollback()
+                raise
+    
+    @property
+    def em_transacao(self) -> bool:
+        """Indica se a thread atual está dentro de uma transação explícita (transacao())."""
+        return self._dono_transacao == threading.get_ident()
+    
+    @contextmanager
+    def transacao(self):
+        """
+        Agrupa as operações do bloco em uma única transação.
+        
+        Dentro do bloco, executar_consulta não confirma cada instrução: tudo é
+        confirmado de uma vez ao final, ou desfeito se o bloco lançar uma
+        exceção. Blocos aninhados participam da transação mais externa. A
+        conexão de escrita fica reservada à thread da transação até o fim do
+        bloco.
+        
+        Yields:
+            sqlite3.Connection: Conexão em uso pela transação
+        """
+        with self._trava_escrita:
+            conexao = self.conectar()
+            if self._nivel_transacao:
+                self._nivel_transacao += 1
+                try:
+                    yield conexao
+                finally:
+                    self._nivel_transacao -= 1
+                return
+            
+            conexao.execute("BEGIN")
+            self._nivel_transacao = 1
+            self._dono_transacao = threading.get_ident()
             try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN comissao_padrao REAL DEFAULT 0.0")
+                yield conexao
                 conexao.commit()
-                print("Coluna comissao_padrao adicionada à tabela clientes")
-            except Exception as e:
-                print(f"Erro ao adicionar coluna comissao_padrao: {e}")
-                
-        # Garantir que as tabelas de consignação existam (caso o DB já existisse mas sem elas)
-        self._inicializar_tabelas()
+                self._incrementar_versoes(self._tabelas_alteradas)
+            except BaseException:
+                conexao.rollback()
+                raise
+            finally:
+                self._nivel_transacao = 0
+                self._dono_transacao = None
+                self._tabelas_alteradas = set()
+    
+    def _registrar_escrita(self, consulta: str):
+        """Marca a tabela alterada pela instrução (na confirmação, se houver transação)."""
+        correspondencia = PADRAO_TABELA_ALTERADA.match(consulta)
+        if correspondencia is None:
+            return
+        tabela = correspondencia.group(1).lower()
+        if self._nivel_transacao:
+            self._tabelas_alteradas.add(tabela)
+        else:
+            self._incrementar_versoes((tabela,))
+    
+    def _incrementar_versoes(self, tabelas):
+        with self._trava_cache:
+            for tabela in tabelas:
+                self._versoes[tabela] = self._versoes.get(tabela, 0) + 1
+    
+    def versao_dados(self, *tabelas: str) -> tuple:
+        """
+        Retorna a versão atual dos dados das tabelas.
+        
+        A versão muda sempre que uma gravação feita pelo gerenciador em alguma
+        das tabelas é confirmada, ou quando o cache é invalidado.
+        
+        Args:
+            *tabelas (str): Nomes das tabelas
+            
+        Returns:
+            tuple: Versão comparável com a de uma leitura anterior
+        """
+        with self._trava_cache:
+            return (self._geracao_dados,) + tuple(self._versoes.get(tabela, 0) for tabela in tabelas)
+    
+    def ler_com_cache(self, chave: str, tabelas: Sequence[str], carregar):
+        """
+        Retorna o resultado de carregar(), reaproveitando a última leitura
+        enquanto nenhuma das tabelas tiver sido alterada.
+        
+        Dentro de uma transação da própria thread o cache é ignorado, para que
+        a leitura enxergue as alterações ainda não confirmadas.
+        
+        Args:
+            chave (str): Identificador da leitura
+            tabelas (Sequence[str]): Tabelas das quais o resultado depende
+            carregar (callable): Função que lê os dados do banco
+            
+        Returns:
+            O resultado de carregar() (o mesmo objeto enquanto estiver válido)
+        """
+        if self.em_transacao:
+            return carregar()
+        # A versão é lida antes da consulta: uma gravação confirmada durante a
+        # leitura deixa o resultado com a versão antiga, e ele é relido depois
+        versao = self.versao_dados(*tabelas)
+        with self._trava_cache:
+            guardado = self._cache_leituras.get(chave)
+        if guardado is not None and guardado[0] == versao:
+            return guardado[1]
+        resultado = carregar()
+        with self._trava_cache:
+            self._cache_leituras[chave] = (versao, resultado)
+        return resultado
+    
+    def invalidar_cache(self):
+        """Descarta todas as leituras em cache (por exemplo, após gravações feitas fora do gerenciador)."""
+        with self._trava_cache:
+            self._cache_leituras.clear()
+            self._geracao_dados += 1
     
     def executar_consulta(self, consulta: str, parametros: tuple = ()) -> sqlite3.Cursor:
         """
-        Executa uma consulta e retorna o cursor.
+        Executa uma consulta na conexão de escrita e retorna o cursor.
+        
+        Fora de uma transacao() a alteração é confirmada imediatamente.
         
         Args:
             consulta (str): Consulta SQL a ser executada
@@ -243,11 +425,59 @@ class GerenciadorBancoDados:
         Returns:
             sqlite3.Cursor: Cursor com os resultados da consulta
         """
-        conexao = self.conectar()
-        cursor = conexao.cursor()
-        cursor.execute(consulta, parametros)
-        conexao.commit()
-        return cursor
+        with self._trava_escrita:
+            conexao = self.conectar()
+            cursor = conexao.cursor()
+            cursor.execute(consulta, parametros)
+            if not self._nivel_transacao:
+                conexao.commit()
+            self._registrar_escrita(consulta)
+            return cursor
+    
+    def executar_em_lote(self, consulta: str, lista_parametros: Iterable[tuple]) -> int:
+        """
+        Executa a mesma instrução para vários conjuntos de parâmetros (executemany).
+        
+        Fora de uma transacao() o lote inteiro é confirmado de uma só vez.
+        
+        Args:
+            consulta (str): Instrução SQL a ser executada
+            lista_parametros (Iterable[tuple]): Parâmetros de cada execução
+            
+        Returns:
+            int: Número de linhas afetadas
+        """
+        with self._trava_escrita:
+            conexao = self.conectar()
+            cursor = conexao.executemany(consulta, lista_parametros)
+            if not self._nivel_transacao:
+                conexao.commit()
+            self._registrar_escrita(consulta)
+            return cursor.rowcount
+    
+    def inserir_em_lote(self, tabela: str, colunas: Sequence[str], linhas: Sequence[tuple]) -> List[int]:
+        """
+        Insere várias linhas em uma tabela com um único executemany.
+        
+        Args:
+            tabela (str): Nome da tabela
+            colunas (Sequence[str]): Colunas preenchidas
+            linhas (Sequence[tuple]): Valores de cada linha, na ordem das colunas
+            
+        Returns:
+            List[int]: IDs gerados, na mesma ordem das linhas
+        """
+        if not linhas:
+            return []
+        consulta = (f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+                    f"VALUES ({', '.join('?' for _ in colunas)})")
+        with self.transacao() as conexao:
+            conexao.executemany(consulta, linhas)
+            self._registrar_escrita(consulta)
+            # As tabelas usam AUTOINCREMENT e a conexão de escrita está reservada,
+            # então os IDs do lote são consecutivos até o último inserido
+            ultimo_id = conexao.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(ultimo_id - len(linhas) + 1, ultimo_id + 1))
     
     def buscar_todos(self, consulta: str, parametros: tuple = ()) -> list:
         """
@@ -260,8 +490,8 @@ class GerenciadorBancoDados:
         Returns:
             list: Lista de linhas
         """
-        cursor = self.executar_consulta(consulta, parametros)
-        return cursor.fetchall()
+        with self._conexao_leitura() as conexao:
+            return conexao.execute(consulta, parametros).fetchall()
     
     def buscar_um(self, consulta: str, parametros: tuple = ()):
         """
@@ -274,8 +504,8 @@ class GerenciadorBancoDados:
         Returns:
             Linha ou None: Única linha ou None se não houver resultados
         """
-        cursor = self.executar_consulta(consulta, parametros)
-        return cursor.fetchone()
+        with self._conexao_leitura() as conexao:
+            return conexao.execute(consulta, parametros).fetchone()
 
 # Instância global do gerenciador de banco de dados
 gerenciador_bd = GerenciadorBancoDados()
\ No newline at end of file
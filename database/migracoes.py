@@ -0,0 +1,371 @@
+"""
+Migrações do esquema do banco de dados da loja de semijoias.
+
+Cada migração é uma função que recebe um cursor e aplica uma alteração de
+esquema. A versão de uma migração é sua posição na lista MIGRACOES (a
+primeira é a versão 1); o GerenciadorBancoDados registra em
+PRAGMA user_version a última versão aplicada.
+"""
+
+import sqlite3
+
+
+def _adicionar_coluna_se_ausente(cursor: sqlite3.Cursor, tabela: str, coluna: str, definicao: str) -> bool:
+    """
+    Adiciona uma coluna a uma tabela caso ela ainda não exista.
+    
+    Bancos criados antes do controle de versão podem já ter a coluna.
+    
+    Returns:
+        bool: True se a coluna foi adicionada
+    """
+    cursor.execute(f"PRAGMA table_info({tabela})")
+    if coluna in [linha[1] for linha in cursor.fetchall()]:
+        return False
+    cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+    print(f"Coluna {coluna} adicionada à tabela {tabela}")
+    return True
+
+
+def _migracao_tabelas_iniciais(cursor: sqlite3.Cursor):
+    """Cria as tabelas se elas não existirem."""
+    # Tabela de produtos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            preco_custo REAL NOT NULL,
+            preco_venda REAL NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            caminho_imagem TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tabela de clientes
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            telefone TEXT,
+            email TEXT,
+            tipo TEXT DEFAULT 'Avulso', -- 'Avulso' ou 'Revendedora'
+            comissao_padrao REAL DEFAULT 0.0,
+            observacoes TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tabela de vendas (versão inicial sem dia_vencimento)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vendas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cliente_id INTEGER,
+            valor_total REAL NOT NULL,
+            tipo_pagamento TEXT NOT NULL, -- 'Dinheiro', 'Cartão Crédito', 'Cartão Débito', 'PIX', 'Parcelado Boleto', 'Parcelado Promissória'
+            status TEXT NOT NULL, -- 'pago' ou 'pendente'
+            data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            observacoes TEXT,
+            FOREIGN KEY (cliente_id) REFERENCES clientes (id)
+        )
+    ''')
+    
+    # Tabela de itens de venda (produtos em uma venda)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS itens_venda (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venda_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            preco_unitario REAL NOT NULL,
+            FOREIGN KEY (venda_id) REFERENCES vendas (id),
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        )
+    ''')
+    
+    # Tabela de pagamentos (para vendas parceladas)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pagamentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venda_id INTEGER NOT NULL,
+            valor REAL NOT NULL,
+            data_pagamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            observacoes TEXT,
+            FOREIGN KEY (venda_id) REFERENCES vendas (id)
+        )
+    ''')
+    
+    # Tabela de movimentações de estoque
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS movimentacoes_estoque (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            produto_id INTEGER NOT NULL,
+            tipo_movimentacao TEXT NOT NULL, -- 'entrada' ou 'saida'
+            quantidade INTEGER NOT NULL,
+            observacoes TEXT,
+            data_movimentacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        )
+    ''')
+
+    # Tabela de consignações
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS consignacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cliente_id INTEGER NOT NULL,
+            data_envio TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'Aberta', -- 'Aberta', 'Parcial', 'Fechada'
+            data_fechamento TIMESTAMP,
+            total_vendido REAL DEFAULT 0.0,
+            total_comissao REAL DEFAULT 0.0,
+            total_liquido REAL DEFAULT 0.0,
+            observacoes TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cliente_id) REFERENCES clientes (id)
+        )
+    ''')
+
+    # Tabela de itens de consignação
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS itens_consignacao (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            consignacao_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            qtd_enviada INTEGER NOT NULL,
+            qtd_vendida INTEGER DEFAULT 0,
+            qtd_devolvida INTEGER DEFAULT 0,
+            preco_unitario REAL NOT NULL,
+            comissao_percentual REAL NOT NULL,
+            FOREIGN KEY (consignacao_id) REFERENCES consignacoes (id),
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        )
+    ''')
+
+
+def _migracao_colunas_vendas_clientes(cursor: sqlite3.Cursor):
+    """Adiciona colunas introduzidas depois da primeira versão de vendas e clientes."""
+    _adicionar_coluna_se_ausente(cursor, "vendas", "dia_vencimento", "INTEGER")
+    _adicionar_coluna_se_ausente(cursor, "vendas", "observacoes", "TEXT")
+    _adicionar_coluna_se_ausente(cursor, "clientes", "email", "TEXT")
+    if _adicionar_coluna_se_ausente(cursor, "clientes", "tipo", "TEXT DEFAULT 'Avulso'"):
+        cursor.execute("UPDATE clientes SET tipo = 'Avulso' WHERE tipo IS NULL")
+    _adicionar_coluna_se_ausente(cursor, "clientes", "comissao_padrao", "REAL DEFAULT 0.0")
+
+
+def _migracao_indice_data_venda(cursor: sqlite3.Cursor):
+    """Índice para filtros e relatórios por período."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vendas_data_venda ON vendas (data_venda)')
+
+
+# Índices das chaves estrangeiras e das colunas usadas em filtros e ordenações
+INDICES_CONSULTAS = [
+    ("idx_itens_venda_venda_id", "itens_venda (venda_id)"),
+    ("idx_pagamentos_venda_id", "pagamentos (venda_id)"),
+    ("idx_vendas_status_data_venda", "vendas (status, data_venda)"),
+    ("idx_vendas_cliente_id", "vendas (cliente_id)"),
+    ("idx_itens_consignacao_consignacao_id", "itens_consignacao (consignacao_id)"),
+    ("idx_consignacoes_cliente_id", "consignacoes (cliente_id)"),
+    ("idx_movimentacoes_estoque_produto_id", "movimentacoes_estoque (produto_id)"),
+    ("idx_produtos_nome", "produtos (nome)"),
+    ("idx_clientes_nome", "clientes (nome)"),
+]
+
+
+def _migracao_indices_consultas(cursor: sqlite3.Cursor):
+    """Cria os índices usados pelas consultas dos modelos."""
+    for nome, definicao in INDICES_CONSULTAS:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+
+
+def _migracao_indice_data_envio(cursor: sqlite3.Cursor):
+    """Índice para a listagem paginada de consignações por data de envio."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_consignacoes_data_envio ON consignacoes (data_envio)')
+
+
+# Quantidade de uma movimentação de estoque com sinal: entradas somam, saídas subtraem
+SINAL_MOVIMENTACAO = "CASE WHEN tipo_movimentacao = 'entrada' THEN quantidade ELSE -quantidade END"
+
+# Recalcula o valor pago das vendas a partir dos pagamentos (índice por venda_id)
+RECALCULO_VALOR_PAGO = (
+    "UPDATE vendas SET valor_pago = COALESCE((SELECT SUM(valor) FROM pagamentos WHERE venda_id = vendas.id), 0)"
+)
+
+
+# Índices de busca textual (FTS5): nome do índice, tabela de conteúdo e colunas indexadas
+INDICES_BUSCA_TEXTO = [
+    ("produtos_busca", "produtos", ("nome", "categoria")),
+    ("clientes_busca", "clientes", ("nome", "telefone", "email")),
+]
+
+
+def _migracao_busca_texto(cursor: sqlite3.Cursor):
+    """
+    Cria os índices FTS5 de produtos e clientes, mantidos por triggers.
+    
+    O tokenizador ignora acentos ("zirconia" encontra "Zircônia") e os índices
+    de prefixo aceleram a busca enquanto o usuário digita. Em builds do SQLite
+    sem FTS5 a migração não cria nada e as buscas recorrem a LIKE.
+    """
+    for indice, tabela, colunas in INDICES_BUSCA_TEXTO:
+        lista = ", ".join(colunas)
+        novos = ", ".join(f"new.{coluna}" for coluna in colunas)
+        antigos = ", ".join(f"old.{coluna}" for coluna in colunas)
+        try:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {indice} USING fts5(
+                    {lista}, content='{tabela}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"Busca textual indisponível ({e}); as buscas usarão LIKE")
+            return
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {indice}_insercao AFTER INSERT ON {tabela} BEGIN
+                INSERT INTO {indice} (rowid, {lista}) VALUES (new.id, {novos});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {indice}_exclusao AFTER DELETE ON {tabela} BEGIN
+                INSERT INTO {indice} ({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+            END
+        """)
+        # Só reindexa quando uma coluna indexada muda (baixas de estoque não tocam o índice)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {indice}_atualizacao AFTER UPDATE OF {lista} ON {tabela} BEGIN
+                INSERT INTO {indice} ({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+                INSERT INTO {indice} (rowid, {lista}) VALUES (new.id, {novos});
+            END
+        """)
+        # Indexa os registros já existentes
+        cursor.execute(f"INSERT INTO {indice} ({indice}) VALUES ('rebuild')")
+
+
+def _migracao_saldos_estoque(cursor: sqlite3.Cursor):
+    """
+    Cria a tabela de saldos materializados, mantida a partir das movimentações.
+
+    movimentacoes_estoque passa a registrar todas as alterações de estoque, e
+    cada movimentação inserida soma (ou subtrai) seu valor ao saldo do produto
+    por um trigger, sem percorrer o histórico. Como vendas e ajustes manuais
+    não eram registrados, cada produto recebe uma movimentação de abertura com
+    a diferença entre seu estoque atual e as movimentações já existentes.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS saldos_estoque (
+            produto_id INTEGER PRIMARY KEY,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            ultima_movimentacao_id INTEGER,
+            FOREIGN KEY (produto_id) REFERENCES produtos (id)
+        )
+    ''')
+    # A soma das movimentações por produto é lida apenas do índice
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_movimentacoes_estoque_produto_tipo
+        ON movimentacoes_estoque (produto_id, tipo_movimentacao, quantidade)
+    ''')
+    cursor.execute("DROP INDEX IF EXISTS idx_movimentacoes_estoque_produto_id")
+
+    cursor.execute(f'''
+        INSERT INTO movimentacoes_estoque (produto_id, tipo_movimentacao, quantidade, observacoes)
+        SELECT id, CASE WHEN diferenca > 0 THEN 'entrada' ELSE 'saida' END, ABS(diferenca), 'Saldo de abertura'
+        FROM (
+            SELECT p.id, p.quantidade - COALESCE((
+                SELECT SUM({SINAL_MOVIMENTACAO}) FROM movimentacoes_estoque WHERE produto_id = p.id
+            ), 0) AS diferenca
+            FROM produtos p
+        )
+        WHERE diferenca != 0
+    ''')
+    cursor.execute('''
+        INSERT INTO saldos_estoque (produto_id, quantidade, ultima_movimentacao_id)
+        SELECT p.id, p.quantidade, (SELECT MAX(id) FROM movimentacoes_estoque WHERE produto_id = p.id)
+        FROM produtos p
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS saldos_estoque_movimentacao AFTER INSERT ON movimentacoes_estoque BEGIN
+            INSERT INTO saldos_estoque (produto_id, quantidade, ultima_movimentacao_id)
+            VALUES (
+                new.produto_id,
+                CASE WHEN new.tipo_movimentacao = 'entrada' THEN new.quantidade ELSE -new.quantidade END,
+                new.id
+            )
+            ON CONFLICT (produto_id) DO UPDATE SET
+                quantidade = quantidade + excluded.quantidade,
+                ultima_movimentacao_id = excluded.ultima_movimentacao_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS saldos_estoque_exclusao_produto AFTER DELETE ON produtos BEGIN
+            DELETE FROM saldos_estoque WHERE produto_id = old.id;
+        END
+    ''')
+
+
+def _migracao_valor_pago_vendas(cursor: sqlite3.Cursor):
+    """
+    Acrescenta a vendas o valor pago e o saldo, mantidos a partir dos pagamentos.
+
+    valor_pago é atualizado por triggers na mesma transação que insere, altera
+    ou exclui um pagamento; saldo é uma coluna gerada (valor_total - valor_pago,
+    ou zero para vendas pagas, como as à vista), de modo que também acompanha
+    alterações do valor e do status da venda. Alterar ou excluir um pagamento
+    de uma venda parcelada também recalcula seu status.
+    """
+    cursor.execute("ALTER TABLE vendas ADD COLUMN valor_pago REAL NOT NULL DEFAULT 0")
+    cursor.execute('''
+        ALTER TABLE vendas ADD COLUMN saldo REAL
+        GENERATED ALWAYS AS (CASE WHEN status = 'pago' THEN 0 ELSE valor_total - valor_pago END) VIRTUAL
+    ''')
+    cursor.execute(f"{RECALCULO_VALOR_PAGO} WHERE id IN (SELECT venda_id FROM pagamentos)")
+
+    def aplicar_pagamento(linha: str, sinal: str) -> str:
+        """UPDATE que aplica o valor do pagamento à venda e recalcula o status das parceladas."""
+        return f"""
+            UPDATE vendas SET
+                valor_pago = valor_pago {sinal} {linha}.valor,
+                status = CASE
+                    WHEN tipo_pagamento NOT IN ('Parcelado Boleto', 'Parcelado Promissória') THEN status
+                    WHEN valor_pago {sinal} {linha}.valor >= valor_total THEN 'pago'
+                    ELSE 'pendente'
+                END
+            WHERE id = {linha}.venda_id;
+        """
+
+    # Na inclusão, a quitação é decidida por PagamentoController.registrar_pagamento
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS vendas_valor_pago_insercao AFTER INSERT ON pagamentos BEGIN
+            UPDATE vendas SET valor_pago = valor_pago + new.valor WHERE id = new.venda_id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS vendas_valor_pago_exclusao AFTER DELETE ON pagamentos BEGIN
+            {aplicar_pagamento("old", "-")}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS vendas_valor_pago_atualizacao AFTER UPDATE OF venda_id, valor ON pagamentos BEGIN
+            {aplicar_pagamento("old", "-")}
+            {aplicar_pagamento("new", "+")}
+        END
+    ''')
+
+
+# Migrações do esquema em ordem de aplicação; a versão de cada uma é sua
+# posição na lista (a primeira é a versão 1). Nunca altere ou remova uma
+# migração já distribuída: acrescente uma nova ao final.
+MIGRACOES = [
+    _migracao_tabelas_iniciais,
+    _migracao_colunas_vendas_clientes,
+    _migracao_indice_data_venda,
+    _migracao_indices_consultas,
+    _migracao_indice_data_envio,
+    _migracao_busca_texto,
+    _migracao_saldos_estoque,
+    _migracao_valor_pago_vendas,
+]
@@ -8,6 +8,8 @@ Ponto de entrada principal para o Sistema de Gerenciamento de Loja de Semijoias
 import sys
 import os
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QSettings
+from database.db_manager import gerenciador_bd, PERFIS_BANCO
 from ui.janela_principal import JanelaPrincipal
 from ui.styles import GLOBAL_STYLESHEET
 
@@ -21,6 +23,11 @@ def main():
     # Aplica o estilo global (QSS)
     app.setStyleSheet(GLOBAL_STYLESHEET)
     
+    # Aplica o perfil de banco de dados escolhido nas configurações
+    perfil_banco = QSettings("JoiaSystem", "SistemaLojaSemijoias").value("perfil_banco")
+    if perfil_banco in PERFIS_BANCO:
+        gerenciador_bd.definir_perfil(perfil_banco)
+    
     # Cria e mostra a janela principal
     janela = JanelaPrincipal()
     janela.show()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 import sqlite3
-from database.db_manager import gerenciador_bd
+from database.db_manager import gerenciador_bd, expressao_busca_texto
 
 @dataclass
 class Cliente:
@@ -113,6 +113,109 @@ class Cliente:
         rows = gerenciador_bd.buscar_todos(consulta)
         return [Cliente.from_row(row) for row in rows]
     
+    @staticmethod
+    def _buscar_com_termo(consulta: str, termo: str, parametros: tuple = ()) -> list:
+        """
+        Executa a consulta trocando {condicao} pelos clientes que correspondem ao termo.
+        
+        A condição usa o índice de texto completo (sem acentos, por prefixo); em
+        um SQLite sem FTS5, o trecho do nome. Sem palavras no termo, não filtra.
+        
+        Args:
+            consulta (str): Consulta com {condicao} como primeira condição do WHERE
+            termo (str): Texto digitado pelo usuário
+            parametros (tuple): Parâmetros das demais condições
+            
+        Returns:
+            list: Linhas encontradas
+        """
+        expressao = expressao_busca_texto(termo)
+        if expressao is None:
+            return gerenciador_bd.buscar_todos(consulta.format(condicao="1"), parametros)
+        try:
+            return gerenciador_bd.buscar_todos(
+                consulta.format(condicao="id IN (SELECT rowid FROM clientes_busca WHERE clientes_busca MATCH ?)"),
+                (expressao,) + parametros
+            )
+        except sqlite3.OperationalError:
+            return gerenciador_bd.buscar_todos(consulta.format(condicao="nome LIKE ?"), (f"%{termo}%",) + parametros)
+    
+    @staticmethod
+    def contar(termo: str = "") -> int:
+        """
+        Conta os clientes cadastrados.
+        
+        Args:
+            termo (str, opcional): Conta apenas os clientes encontrados pela busca
+            
+        Returns:
+            int: Quantidade de clientes
+        """
+        rows = Cliente._buscar_com_termo("SELECT COUNT(*) AS total FROM clientes WHERE {condicao}", termo)
+        return rows[0]['total'] if rows else 0
+    
+    @staticmethod
+    def obter_pagina(limite: int, apos_id: Optional[int] = None, termo: str = "") -> list['Cliente']:
+        """
+        Recupera uma página de clientes em ordem alfabética.
+        
+        A paginação é por chave (nome, id): a página seguinte começa logo após
+        o registro informado, sem OFFSET. Com termo, pagina apenas os clientes
+        encontrados pelo índice de texto, na mesma ordem.
+        
+        Args:
+            limite (int): Quantidade máxima de clientes na página
+            apos_id (int, opcional): ID do último registro da página anterior
+            termo (str, opcional): Texto da busca por nome, telefone ou email
+            
+        Returns:
+            list[Cliente]: Clientes da página
+        """
+        if apos_id is None:
+            consulta = "SELECT * FROM clientes WHERE {condicao} ORDER BY nome, id LIMIT ?"
+            rows = Cliente._buscar_com_termo(consulta, termo, (limite,))
+        else:
+            consulta = """
+                SELECT * FROM clientes
+                WHERE {condicao} AND (nome, id) > (SELECT nome, id FROM clientes WHERE id=?)
+                ORDER BY nome, id LIMIT ?
+            """
+            rows = Cliente._buscar_com_termo(consulta, termo, (apos_id, limite))
+        return [Cliente.from_row(row) for row in rows]
+    
+    @staticmethod
+    def buscar(termo: str, limite: Optional[int] = None) -> list['Cliente']:
+        """
+        Busca clientes por nome, telefone e email no índice de texto completo.
+        
+        A busca ignora acentos e maiúsculas, casa o início das palavras
+        ("zirc" encontra "Zircônia") e ordena os resultados por relevância,
+        com mais peso para o nome.
+        
+        Args:
+            termo (str): Texto digitado pelo usuário
+            limite (int, opcional): Quantidade máxima de resultados
+            
+        Returns:
+            list[Cliente]: Clientes encontrados, do mais ao menos relevante
+        """
+        expressao = expressao_busca_texto(termo)
+        if expressao is None:
+            return Cliente.obter_todos()
+        consulta = f"""
+            SELECT c.* FROM clientes_busca b JOIN clientes c ON c.id = b.rowid
+            WHERE clientes_busca MATCH ?
+            ORDER BY bm25(clientes_busca, 10.0, 4.0, 4.0), c.nome
+            {'LIMIT ?' if limite else ''}
+        """
+        parametros = (expressao, limite) if limite else (expressao,)
+        try:
+            rows = gerenciador_bd.buscar_todos(consulta, parametros)
+        except sqlite3.OperationalError:
+            # SQLite sem FTS5 (índice não criado pela migração)
+            return Cliente.buscar_por_nome(termo)
+        return [Cliente.from_row(row) for row in rows]
+    
     @staticmethod
     def buscar_por_nome(nome: str) -> list['Cliente']:
         """
@@ -126,4 +229,20 @@ class Cliente:
         """
         consulta = "SELECT * FROM clientes WHERE nome LIKE ? ORDER BY nome"
         rows = gerenciador_bd.buscar_todos(consulta, (f"%{nome}%",))
+        return [Cliente.from_row(row) for row in rows]
+    
+    @staticmethod
+    def obter_inadimplentes() -> list['Cliente']:
+        """
+        Recupera os clientes com ao menos uma venda pendente.
+        
+        Returns:
+            list[Cliente]: Lista de clientes inadimplentes, sem repetição
+        """
+        consulta = '''
+            SELECT * FROM clientes
+            WHERE id IN (SELECT cliente_id FROM vendas WHERE status='pendente')
+            ORDER BY nome
+        '''
+        rows = gerenciador_bd.buscar_todos(consulta)
         return [Cliente.from_row(row) for row in rows]
\ No newline at end of file
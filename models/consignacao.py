@@ -65,6 +65,19 @@ class ItemConsignacao:
             print(f"Erro ao salvar item de consignação: {e}")
             return False
 
+    @staticmethod
+    def atualizar_em_lote(itens: List['ItemConsignacao']):
+        """
+        Grava as quantidades de vários itens já existentes com um único executemany.
+        
+        Args:
+            itens (List[ItemConsignacao]): Itens com id definido
+        """
+        gerenciador_bd.executar_em_lote(
+            "UPDATE itens_consignacao SET qtd_vendida=?, qtd_devolvida=? WHERE id=?",
+            [(item.qtd_vendida, item.qtd_devolvida, item.id) for item in itens]
+        )
+
 @dataclass
 class Consignacao:
     """Representa uma consignação para revendedora."""
@@ -109,16 +122,26 @@ class Consignacao:
                     (cliente_id, data_envio, status, total_vendido, total_comissao, total_liquido, observacoes)
                     VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?)
                 '''
-                cursor = gerenciador_bd.executar_consulta(consulta, (
-                    self.cliente_id, self.status, self.total_vendido, 
-                    self.total_comissao, self.total_liquido, self.observacoes
-                ))
-                self.id = cursor.lastrowid
-                
-                # Salvar itens
-                for item in self.itens:
-                    item.consignacao_id = self.id
-                    item.salvar()
+                with gerenciador_bd.transacao():
+                    cursor = gerenciador_bd.executar_consulta(consulta, (
+                        self.cliente_id, self.status, self.total_vendido, 
+                        self.total_comissao, self.total_liquido, self.observacoes
+                    ))
+                    consignacao_id = cursor.lastrowid
+                    
+                    # Salvar itens em lote
+                    ids_itens = gerenciador_bd.inserir_em_lote(
+                        "itens_consignacao",
+                        ("consignacao_id", "produto_id", "qtd_enviada", "qtd_vendida",
+                         "qtd_devolvida", "preco_unitario", "comissao_percentual"),
+                        [(consignacao_id, item.produto_id, item.qtd_enviada, item.qtd_vendida,
+                          item.qtd_devolvida, item.preco_unitario, item.comissao_percentual)
+                         for item in self.itens]
+                    )
+                    for item, item_id in zip(self.itens, ids_itens):
+                        item.consignacao_id = consignacao_id
+                        item.id = item_id
+                self.id = consignacao_id
             else:
                 consulta = '''
                     UPDATE consignacoes 
@@ -135,6 +158,21 @@ class Consignacao:
             print(f"Erro ao salvar consignação: {e}")
             return False
             
+    def recalcular_totais(self):
+        """
+        Recalcula os totais a partir dos itens gravados, com uma única consulta agregada.
+        
+        Dentro de uma transacao() a consulta enxerga os itens ainda não confirmados.
+        """
+        row = gerenciador_bd.buscar_um('''
+            SELECT COALESCE(SUM(qtd_vendida * preco_unitario), 0) AS vendido,
+                   COALESCE(SUM(qtd_vendida * preco_unitario * comissao_percentual / 100), 0) AS comissao
+            FROM itens_consignacao WHERE consignacao_id = ?
+        ''', (self.id,))
+        self.total_vendido = row['vendido']
+        self.total_comissao = row['comissao']
+        self.total_liquido = self.total_vendido - self.total_comissao
+            
     def carregar_itens(self):
         """Carrega os itens desta consignação."""
         if self.id:
@@ -158,6 +196,33 @@ class Consignacao:
         rows = gerenciador_bd.buscar_todos(consulta)
         return [Consignacao.from_row(row) for row in rows]
         
+    @staticmethod
+    def obter_pagina(limite: int, apos_id: Optional[int] = None) -> List['Consignacao']:
+        """
+        Recupera uma página de consignações, da mais recente para a mais antiga.
+        
+        A paginação é por chave (data_envio, id), sem OFFSET.
+        
+        Args:
+            limite (int): Quantidade máxima de consignações na página
+            apos_id (int, opcional): ID da última consignação da página anterior
+        """
+        condicao = ""
+        parametros = (limite,)
+        if apos_id is not None:
+            condicao = "WHERE (c.data_envio, c.id) < (SELECT data_envio, id FROM consignacoes WHERE id = ?)"
+            parametros = (apos_id, limite)
+        consulta = f'''
+            SELECT c.*, cl.nome as cliente_nome 
+            FROM consignacoes c
+            JOIN clientes cl ON c.cliente_id = cl.id
+            {condicao}
+            ORDER BY c.data_envio DESC, c.id DESC
+            LIMIT ?
+        '''
+        rows = gerenciador_bd.buscar_todos(consulta, parametros)
+        return [Consignacao.from_row(row) for row in rows]
+        
     @staticmethod
     def obter_por_id(id: int) -> Optional['Consignacao']:
         consulta = '''
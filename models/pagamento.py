@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict
 import sqlite3
 from datetime import datetime
 from database.db_manager import gerenciador_bd
@@ -13,11 +13,53 @@ class Pagamento:
     valor: float = 0.0
     data_pagamento: Optional[datetime] = None
     observacoes: Optional[str] = None
-    venda: Optional[Venda] = None  # Para conveniência, não armazenado no BD
+    # Venda associada, carregada sob demanda pela propriedade `venda` (não armazenada no BD)
+    _venda: Optional[Venda] = field(default=None, repr=False, compare=False)
+    # Mapa venda_id -> Venda compartilhado pelos pagamentos de uma mesma consulta
+    _mapa_vendas: Optional[dict] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         if self.data_pagamento is None:
             self.data_pagamento = datetime.now()
+        if self._mapa_vendas is None:
+            self._mapa_vendas = {}
+    
+    @property
+    def venda(self) -> Optional[Venda]:
+        """
+        Venda associada ao pagamento.
+        
+        É carregada apenas no primeiro acesso, e pagamentos obtidos na mesma
+        consulta compartilham a mesma instância, de modo que cada venda é
+        lida do banco no máximo uma vez.
+        """
+        if self._venda is None and self.venda_id:
+            if self.venda_id not in self._mapa_vendas:
+                self._mapa_vendas[self.venda_id] = Venda.obter_por_id(self.venda_id)
+            self._venda = self._mapa_vendas[self.venda_id]
+        return self._venda
+    
+    @venda.setter
+    def venda(self, venda: Optional[Venda]):
+        self._venda = venda
+    
+    @staticmethod
+    def _from_rows(rows: list, vendas: Optional[List[Venda]] = None) -> List['Pagamento']:
+        """
+        Cria pagamentos a partir de linhas do banco compartilhando um mapa de vendas.
+        
+        Args:
+            rows (list): Linhas da tabela pagamentos
+            vendas (List[Venda], opcional): Vendas já carregadas a reutilizar
+            
+        Returns:
+            List[Pagamento]: Lista de pagamentos
+        """
+        mapa_vendas = {venda.id: venda for venda in (vendas or [])}
+        pagamentos = [Pagamento.from_row(row) for row in rows]
+        for pagamento in pagamentos:
+            pagamento._mapa_vendas = mapa_vendas
+        return pagamentos
     
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> 'Pagamento':
@@ -98,50 +140,65 @@ class Pagamento:
         query = "SELECT * FROM pagamentos WHERE id=?"
         row = gerenciador_bd.buscar_um(query, (pagamento_id,))
         if row:
-            pagamento = Pagamento.from_row(row)
-            # Carrega venda associada se existir
-            if pagamento.venda_id:
-                pagamento.venda = Venda.obter_por_id(pagamento.venda_id)
-            return pagamento
+            return Pagamento.from_row(row)
         return None
     
     @staticmethod
-    def obter_por_venda(venda_id: int) -> List['Pagamento']:
+    def obter_por_venda(venda_id: int, venda: Optional[Venda] = None) -> List['Pagamento']:
         """
         Recupera todos os pagamentos de uma venda.
         
         Args:
             venda_id (int): O ID da venda
+            venda (Venda, opcional): Venda já carregada, associada aos pagamentos
+                sem nova consulta. Se omitida, é carregada uma única vez no
+                primeiro acesso a `pagamento.venda`.
             
         Returns:
             List[Pagamento]: Lista de pagamentos da venda
         """
         query = "SELECT * FROM pagamentos WHERE venda_id=? ORDER BY data_pagamento DESC"
         rows = gerenciador_bd.buscar_todos(query, (venda_id,))
-        pagamentos = [Pagamento.from_row(row) for row in rows]
+        return Pagamento._from_rows(rows, [venda] if venda else None)
+    
+    @staticmethod
+    def obter_agrupados_por_venda(condicao_vendas: str, parametros: tuple = (),
+                                  vendas: Optional[List[Venda]] = None) -> Dict[int, List['Pagamento']]:
+        """
+        Recupera, em uma única consulta, os pagamentos de um conjunto de vendas.
         
-        # Carrega venda associada para cada pagamento
-        for pagamento in pagamentos:
-            if pagamento.venda_id:
-                pagamento.venda = Venda.obter_por_id(pagamento.venda_id)
-                
-        return pagamentos
+        Args:
+            condicao_vendas (str): Condição SQL (sem WHERE) que seleciona as vendas
+            parametros (tuple): Parâmetros da condição
+            vendas (List[Venda], opcional): Vendas já carregadas a associar aos pagamentos
+            
+        Returns:
+            Dict[int, List[Pagamento]]: Pagamentos agrupados pelo ID da venda
+        """
+        query = f"""
+            SELECT * FROM pagamentos
+            WHERE venda_id IN (SELECT id FROM vendas WHERE {condicao_vendas})
+            ORDER BY data_pagamento DESC
+        """
+        rows = gerenciador_bd.buscar_todos(query, parametros)
+        pagamentos_por_venda = {}
+        for pagamento in Pagamento._from_rows(rows, vendas):
+            pagamentos_por_venda.setdefault(pagamento.venda_id, []).append(pagamento)
+        return pagamentos_por_venda
     
     @staticmethod
     def obter_todos() -> List['Pagamento']:
         """
         Recupera todos os pagamentos.
         
+        As vendas associadas são carregadas em lote, uma vez por venda.
+        
         Returns:
             List[Pagamento]: Lista de todos os pagamentos
         """
         query = "SELECT * FROM pagamentos ORDER BY data_pagamento DESC"
         rows = gerenciador_bd.buscar_todos(query)
-        pagamentos = [Pagamento.from_row(row) for row in rows]
-        
-        # Carrega vendas associadas
-        for pagamento in pagamentos:
-            if pagamento.venda_id:
-                pagamento.venda = Venda.obter_por_id(pagamento.venda_id)
-                
-        return pagamentos
\ No newline at end of file
+        if not rows:
+            return []
+        vendas = Venda._obter_com_relacionamentos("id IN (SELECT venda_id FROM pagamentos)")
+        return Pagamento._from_rows(rows, vendas)
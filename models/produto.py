@@ -1,7 +1,31 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Iterable, Tuple, List, NamedTuple
 import sqlite3
-from database.db_manager import gerenciador_bd
+from database.db_manager import gerenciador_bd, expressao_busca_texto
+from database.migracoes import SINAL_MOVIMENTACAO
+
+class DivergenciaEstoque(NamedTuple):
+    """Produto cujo estoque não confere com o saldo materializado e as movimentações."""
+    produto_id: int
+    nome: str
+    quantidade: int  # produtos.quantidade
+    saldo: int  # saldos_estoque.quantidade
+    movimentado: int  # Soma das movimentações registradas
+
+class EstoqueInsuficiente(Exception):
+    """Baixa de estoque recusada porque algum produto não tem a quantidade pedida."""
+    
+    def __init__(self, faltas: dict):
+        """
+        Args:
+            faltas (dict): produto_id -> (nome, quantidade pedida, quantidade disponível)
+        """
+        self.faltas = faltas
+        detalhes = "; ".join(
+            f"'{nome}' (pedido {pedido}, disponível {disponivel})"
+            for nome, pedido, disponivel in faltas.values()
+        )
+        super().__init__(f"Estoque insuficiente para {detalhes}")
 
 @dataclass
 class Produto:
@@ -31,31 +55,41 @@ class Produto:
         """
         Salva o produto no banco de dados.
         
+        Ao atualizar, o estoque não é gravado: alterações de quantidade passam
+        por ajustar_estoque, que as registra como movimentação.
+        
         Returns:
             bool: True se bem sucedido, False caso contrário
         """
         try:
             if self.id is None:
-                # Insere novo produto
+                # Insere novo produto, com o estoque inicial registrado como entrada
                 consulta = '''
                     INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade, caminho_imagem)
                     VALUES (?, ?, ?, ?, ?, ?)
                 '''
-                cursor = gerenciador_bd.executar_consulta(consulta, (
-                    self.nome, self.categoria, self.preco_custo, 
-                    self.preco_venda, self.quantidade, self.caminho_imagem
-                ))
-                self.id = cursor.lastrowid
+                with gerenciador_bd.transacao():
+                    cursor = gerenciador_bd.executar_consulta(consulta, (
+                        self.nome, self.categoria, self.preco_custo, 
+                        self.preco_venda, self.quantidade, self.caminho_imagem
+                    ))
+                    produto_id = cursor.lastrowid
+                    if self.quantidade:
+                        Produto.registrar_movimentacoes([(
+                            produto_id, 'entrada' if self.quantidade > 0 else 'saida',
+                            abs(self.quantidade), "Estoque inicial"
+                        )])
+                self.id = produto_id
             else:
-                # Atualiza produto existente
+                # Atualiza produto existente (o estoque é alterado por ajustar_estoque)
                 consulta = '''
                     UPDATE produtos 
-                    SET nome=?, categoria=?, preco_custo=?, preco_venda=?, quantidade=?, caminho_imagem=?, atualizado_em=CURRENT_TIMESTAMP
+                    SET nome=?, categoria=?, preco_custo=?, preco_venda=?, caminho_imagem=?, atualizado_em=CURRENT_TIMESTAMP
                     WHERE id=?
                 '''
                 gerenciador_bd.executar_consulta(consulta, (
                     self.nome, self.categoria, self.preco_custo, 
-                    self.preco_venda, self.quantidade, self.caminho_imagem, self.id
+                    self.preco_venda, self.caminho_imagem, self.id
                 ))
             return True
         except Exception as e:
@@ -80,6 +114,184 @@ class Produto:
             print(f"Erro ao excluir produto: {e}")
             return False
     
+    @staticmethod
+    def baixar_estoque(quantidades: Iterable[Tuple[int, int]]):
+        """
+        Baixa o estoque de vários produtos com um único executemany.
+        
+        A subtração é feita pelo próprio banco (quantidade = quantidade - ?),
+        sem ler e regravar cada produto.
+        
+        Args:
+            quantidades (Iterable[Tuple[int, int]]): Pares (produto_id, quantidade);
+                quantidades negativas devolvem itens ao estoque
+        """
+        consulta = "UPDATE produtos SET quantidade = quantidade - ?, atualizado_em=CURRENT_TIMESTAMP WHERE id=?"
+        gerenciador_bd.executar_em_lote(consulta, [(quantidade, produto_id) for produto_id, quantidade in quantidades])
+    
+    @staticmethod
+    def baixar_estoque_disponivel(quantidades: Iterable[Tuple[int, int]]):
+        """
+        Baixa o estoque de vários produtos somente se houver saldo para todos.
+        
+        Cada baixa é um UPDATE condicional (WHERE id=? AND quantidade >= ?)
+        avaliado pelo próprio banco sob a trava de escrita, de modo que dois
+        caixas vendendo a última peça não conseguem ambos baixá-la. Se faltar
+        qualquer produto, a transação é desfeita e nada é baixado.
+        
+        Args:
+            quantidades (Iterable[Tuple[int, int]]): Pares (produto_id, quantidade)
+        
+        Raises:
+            EstoqueInsuficiente: Se algum produto não tiver a quantidade pedida
+        """
+        # Um produto repetido na lista é baixado (e verificado) uma única vez
+        pedidos = {}
+        for produto_id, quantidade in quantidades:
+            pedidos[produto_id] = pedidos.get(produto_id, 0) + quantidade
+        
+        consulta = '''
+            UPDATE produtos SET quantidade = quantidade - ?, atualizado_em=CURRENT_TIMESTAMP
+            WHERE id=? AND quantidade >= ?
+        '''
+        with gerenciador_bd.transacao():
+            faltando = [
+                produto_id for produto_id, quantidade in pedidos.items()
+                if gerenciador_bd.executar_consulta(consulta, (quantidade, produto_id, quantidade)).rowcount == 0
+            ]
+            if faltando:
+                # Os produtos recusados não foram alterados: o saldo lido é o atual
+                marcadores = ", ".join("?" for _ in faltando)
+                rows = gerenciador_bd.buscar_todos(
+                    f"SELECT id, nome, quantidade FROM produtos WHERE id IN ({marcadores})", tuple(faltando)
+                )
+                saldos = {row['id']: (row['nome'], row['quantidade']) for row in rows}
+                faltas = {}
+                for produto_id in faltando:
+                    nome, disponivel = saldos.get(produto_id, (f"#{produto_id}", 0))
+                    faltas[produto_id] = (nome, pedidos[produto_id], disponivel)
+                raise EstoqueInsuficiente(faltas)
+    
+    @staticmethod
+    def movimentar_estoque(movimentacoes: Iterable[Tuple[int, str, int, Optional[str]]]):
+        """
+        Atualiza o estoque e registra as movimentações correspondentes em lote.
+        
+        Args:
+            movimentacoes (Iterable[Tuple]): Tuplas (produto_id, tipo_movimentacao,
+                quantidade, observacoes), com tipo 'entrada' ou 'saida'
+        """
+        movimentacoes = list(movimentacoes)
+        with gerenciador_bd.transacao():
+            Produto.baixar_estoque(
+                (produto_id, quantidade if tipo == 'saida' else -quantidade)
+                for produto_id, tipo, quantidade, _ in movimentacoes
+            )
+            Produto.registrar_movimentacoes(movimentacoes)
+    
+    @staticmethod
+    def registrar_movimentacoes(movimentacoes: Iterable[Tuple[int, str, int, Optional[str]]]):
+        """
+        Registra movimentações de estoque já aplicadas a produtos.quantidade.
+        
+        O saldo materializado (saldos_estoque) é atualizado por trigger a cada
+        movimentação inserida.
+        
+        Args:
+            movimentacoes (Iterable[Tuple]): Tuplas (produto_id, tipo_movimentacao,
+                quantidade, observacoes), com tipo 'entrada' ou 'saida'
+        """
+        gerenciador_bd.inserir_em_lote(
+            "movimentacoes_estoque",
+            ("produto_id", "tipo_movimentacao", "quantidade", "observacoes"),
+            list(movimentacoes)
+        )
+    
+    @staticmethod
+    def ajustar_estoque(produto_id: int, quantidade: int, quantidade_anterior: Optional[int] = None,
+                        observacoes: str = "Ajuste manual"):
+        """
+        Ajusta o estoque de um produto, registrando a diferença como movimentação.
+        
+        Com quantidade_anterior (o estoque exibido quando a edição começou),
+        aplica apenas a diferença informada pelo usuário sobre o estoque atual,
+        de modo que vendas e consignações feitas nesse meio-tempo não são
+        sobrescritas. Sem ela, define o estoque em quantidade, com a diferença
+        calculada pelo banco na mesma instrução que a registra.
+        
+        Args:
+            produto_id (int): ID do produto
+            quantidade (int): Nova quantidade em estoque
+            quantidade_anterior (int, opcional): Quantidade a partir da qual o ajuste foi feito
+            observacoes (str): Motivo do ajuste
+            
+        Raises:
+            EstoqueInsuficiente: Se uma redução informada for maior que o estoque atual
+        """
+        if quantidade_anterior is not None:
+            diferenca = quantidade - quantidade_anterior
+            if diferenca > 0:
+                Produto.movimentar_estoque([(produto_id, 'entrada', diferenca, observacoes)])
+            elif diferenca < 0:
+                # Vendas feitas durante a edição podem já ter levado as peças retiradas
+                with gerenciador_bd.transacao():
+                    Produto.baixar_estoque_disponivel([(produto_id, -diferenca)])
+                    Produto.registrar_movimentacoes([(produto_id, 'saida', -diferenca, observacoes)])
+            return
+        with gerenciador_bd.transacao():
+            gerenciador_bd.executar_consulta('''
+                INSERT INTO movimentacoes_estoque (produto_id, tipo_movimentacao, quantidade, observacoes)
+                SELECT id, CASE WHEN ? > quantidade THEN 'entrada' ELSE 'saida' END, ABS(? - quantidade), ?
+                FROM produtos WHERE id=? AND quantidade != ?
+            ''', (quantidade, quantidade, observacoes, produto_id, quantidade))
+            gerenciador_bd.executar_consulta(
+                "UPDATE produtos SET quantidade=?, atualizado_em=CURRENT_TIMESTAMP WHERE id=? AND quantidade != ?",
+                (quantidade, produto_id, quantidade)
+            )
+    
+    @staticmethod
+    def reconciliar_estoque(produto_ids: Optional[Iterable[int]] = None) -> List[DivergenciaEstoque]:
+        """
+        Confere, por produto, o estoque, o saldo materializado e a soma das movimentações.
+        
+        A soma das movimentações é lida do índice (produto_id, tipo_movimentacao,
+        quantidade), sem acessar as linhas da tabela; com produto_ids, apenas
+        esses produtos são conferidos.
+        
+        Args:
+            produto_ids (Iterable[int], opcional): Produtos a conferir (todos, se omitido)
+            
+        Returns:
+            List[DivergenciaEstoque]: Produtos cujos três valores não coincidem
+        """
+        filtro_produtos = ""
+        filtro_movimentacoes = ""
+        parametros = ()
+        if produto_ids is not None:
+            parametros = tuple(produto_ids)
+            if not parametros:
+                return []
+            marcadores = ", ".join("?" for _ in parametros)
+            filtro_produtos = f"WHERE p.id IN ({marcadores})"
+            filtro_movimentacoes = f"WHERE produto_id IN ({marcadores})"
+        consulta = f'''
+            SELECT p.id, p.nome, p.quantidade, COALESCE(s.quantidade, 0) AS saldo, COALESCE(m.total, 0) AS movimentado
+            FROM produtos p
+            LEFT JOIN saldos_estoque s ON s.produto_id = p.id
+            LEFT JOIN (
+                SELECT produto_id, SUM({SINAL_MOVIMENTACAO}) AS total
+                FROM movimentacoes_estoque {filtro_movimentacoes}
+                GROUP BY produto_id
+            ) m ON m.produto_id = p.id
+            {filtro_produtos}
+        '''
+        rows = gerenciador_bd.buscar_todos(consulta, parametros + parametros)
+        return [
+            DivergenciaEstoque(row['id'], row['nome'], row['quantidade'], row['saldo'], row['movimentado'])
+            for row in rows
+            if not row['quantidade'] == row['saldo'] == row['movimentado']
+        ]
+    
     @staticmethod
     def obter_por_id(produto_id: int) -> Optional['Produto']:
         """
@@ -109,6 +321,119 @@ class Produto:
         rows = gerenciador_bd.buscar_todos(consulta)
         return [Produto.from_row(row) for row in rows]
     
+    @staticmethod
+    def obter_pagina(limite: int, apos_id: Optional[int] = None) -> list['Produto']:
+        """
+        Recupera uma página de produtos em ordem alfabética.
+        
+        A paginação é por chave (nome, id): a página seguinte começa logo após
+        o registro informado, sem OFFSET.
+        
+        Args:
+            limite (int): Quantidade máxima de produtos na página
+            apos_id (int, opcional): ID do último registro da página anterior
+            
+        Returns:
+            list[Produto]: Produtos da página
+        """
+        if apos_id is None:
+            consulta = "SELECT * FROM produtos ORDER BY nome, id LIMIT ?"
+            rows = gerenciador_bd.buscar_todos(consulta, (limite,))
+        else:
+            consulta = """
+                SELECT * FROM produtos
+                WHERE (nome, id) > (SELECT nome, id FROM produtos WHERE id=?)
+                ORDER BY nome, id LIMIT ?
+            """
+            rows = gerenciador_bd.buscar_todos(consulta, (apos_id, limite))
+        return [Produto.from_row(row) for row in rows]
+    
+    @staticmethod
+    def buscar(termo: str, limite: Optional[int] = None) -> list['Produto']:
+        """
+        Busca produtos por nome e categoria no índice de texto completo.
+        
+        A busca ignora acentos e maiúsculas, casa o início das palavras
+        ("zirc" encontra "Zircônia") e ordena os resultados por relevância,
+        com mais peso para o nome.
+        
+        Args:
+            termo (str): Texto digitado pelo usuário
+            limite (int, opcional): Quantidade máxima de resultados
+            
+        Returns:
+            list[Produto]: Produtos encontrados, do mais ao menos relevante
+        """
+        expressao = expressao_busca_texto(termo)
+        if expressao is None:
+            return Produto.obter_todos()
+        consulta = f"""
+            SELECT p.* FROM produtos_busca b JOIN produtos p ON p.id = b.rowid
+            WHERE produtos_busca MATCH ?
+            ORDER BY bm25(produtos_busca, 10.0, 2.0), p.nome
+            {'LIMIT ?' if limite else ''}
+        """
+        parametros = (expressao, limite) if limite else (expressao,)
+        try:
+            rows = gerenciador_bd.buscar_todos(consulta, parametros)
+        except sqlite3.OperationalError:
+            # SQLite sem FTS5 (índice não criado pela migração)
+            return Produto.buscar_por_nome(termo)
+        return [Produto.from_row(row) for row in rows]
+    
+    @staticmethod
+    def buscar_ids(termo: str) -> Optional[set]:
+        """
+        Retorna os IDs dos produtos que correspondem ao termo, sem ordenar.
+        
+        Mais barato que buscar() para termos curtos, que casam quase toda a
+        tabela: serve para filtrar listas que já têm a própria ordenação.
+        
+        Args:
+            termo (str): Texto digitado pelo usuário
+            
+        Returns:
+            Optional[set]: IDs encontrados, ou None se o termo não tem palavras
+        """
+        expressao = expressao_busca_texto(termo)
+        if expressao is None:
+            return None
+        try:
+            rows = gerenciador_bd.buscar_todos(
+                "SELECT rowid FROM produtos_busca WHERE produtos_busca MATCH ?", (expressao,)
+            )
+        except sqlite3.OperationalError:
+            return {produto.id for produto in Produto.buscar_por_nome(termo)}
+        return {row[0] for row in rows}
+    
+    @staticmethod
+    def buscar_ids_por_relevancia(termo: str) -> Optional[list]:
+        """
+        Retorna os IDs dos produtos que correspondem ao termo, na ordem de buscar().
+        
+        Ordena pelo índice de texto sem montar os produtos: serve para listas
+        que já têm os produtos carregados e só precisam da classificação.
+        
+        Args:
+            termo (str): Texto digitado pelo usuário
+            
+        Returns:
+            Optional[list]: IDs do mais ao menos relevante, ou None se o termo não tem palavras
+        """
+        expressao = expressao_busca_texto(termo)
+        if expressao is None:
+            return None
+        consulta = """
+            SELECT b.rowid FROM produtos_busca b JOIN produtos p ON p.id = b.rowid
+            WHERE produtos_busca MATCH ?
+            ORDER BY bm25(produtos_busca, 10.0, 2.0), p.nome
+        """
+        try:
+            rows = gerenciador_bd.buscar_todos(consulta, (expressao,))
+        except sqlite3.OperationalError:
+            return [produto.id for produto in Produto.buscar_por_nome(termo)]
+        return [row[0] for row in rows]
+    
     @staticmethod
     def buscar_por_nome(nome: str) -> list['Produto']:
         """
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, NamedTuple
 import sqlite3
-from datetime import datetime
-from database.db_manager import gerenciador_bd
+from datetime import datetime, date, time
+from database.db_manager import gerenciador_bd, expressao_busca_texto
+from database.migracoes import RECALCULO_VALOR_PAGO
 from models.produto import Produto
 from models.cliente import Cliente
 
@@ -27,6 +28,25 @@ class ItemVenda:
             preco_unitario=row['preco_unitario']
         )
 
+class LinhaVenda(NamedTuple):
+    """Linha da tabela de vendas: apenas as colunas exibidas, sem itens nem cliente carregados."""
+    id: int
+    data_venda: datetime
+    cliente_nome: Optional[str]
+    valor_total: float
+    tipo_pagamento: str
+    status: str
+
+@dataclass
+class FiltroVendas:
+    """Critérios da consulta de vendas; critérios vazios não filtram."""
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+    status: str = ""  # 'pago', 'pendente' ou vazio para todos
+    termo_cliente: str = ""  # Texto digitado na busca por cliente
+    limite: Optional[int] = None
+    apos_id: Optional[int] = None  # ID da última venda da página anterior
+
 @dataclass
 class Venda:
     """Representa uma transação de venda na loja de semijoias."""
@@ -38,6 +58,7 @@ class Venda:
     data_venda: Optional[datetime] = None
     dia_vencimento: Optional[int] = None  # Dia do mês para vencimento (para vendas parceladas)
     observacoes: Optional[str] = None
+    valor_pago: float = 0.0  # Mantido pelo banco a partir dos pagamentos
     itens: List[ItemVenda] = None
     cliente: Optional[Cliente] = None  # Para conveniência, não armazenado no BD
     
@@ -47,6 +68,13 @@ class Venda:
         if self.data_venda is None:
             self.data_venda = datetime.now()
     
+    @property
+    def saldo(self) -> float:
+        """Valor ainda não pago da venda (zero para vendas pagas, como as à vista)."""
+        if self.status == "pago":
+            return 0.0
+        return self.valor_total - self.valor_pago
+    
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> 'Venda':
         """Cria uma instância de Venda a partir de uma linha do banco de dados."""
@@ -55,6 +83,7 @@ class Venda:
         keys = row.keys()
         dia_vencimento = row['dia_vencimento'] if 'dia_vencimento' in keys and row['dia_vencimento'] else None
         observacoes = row['observacoes'] if 'observacoes' in keys else None
+        valor_pago = row['valor_pago'] if 'valor_pago' in keys else 0.0
         
         return cls(
             id=row['id'],
@@ -64,7 +93,8 @@ class Venda:
             status=row['status'],
             data_venda=data_venda,
             dia_vencimento=dia_vencimento,
-            observacoes=observacoes
+            observacoes=observacoes,
+            valor_pago=valor_pago
         )
     
     def salvar(self) -> bool:
@@ -76,21 +106,27 @@ class Venda:
         """
         try:
             if self.id is None:
-                # Insere nova venda
+                # Insere nova venda e seus itens em uma única transação
                 query = '''
                     INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda, dia_vencimento, observacoes)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 '''
-                cursor = gerenciador_bd.executar_consulta(query, (
-                    self.cliente_id, self.valor_total, self.tipo_pagamento, 
-                    self.status, self.data_venda.isoformat(), self.dia_vencimento, self.observacoes
-                ))
-                self.id = cursor.lastrowid
-                
-                # Salva itens da venda
-                for item in self.itens:
-                    item.venda_id = self.id
-                    self._salvar_item_venda(item)
+                with gerenciador_bd.transacao():
+                    cursor = gerenciador_bd.executar_consulta(query, (
+                        self.cliente_id, self.valor_total, self.tipo_pagamento, 
+                        self.status, self.data_venda.isoformat(), self.dia_vencimento, self.observacoes
+                    ))
+                    venda_id = cursor.lastrowid
+                    
+                    # Salva itens da venda em lote
+                    ids_itens = gerenciador_bd.inserir_em_lote(
+                        "itens_venda", ("venda_id", "produto_id", "quantidade", "preco_unitario"),
+                        [(venda_id, item.produto_id, item.quantidade, item.preco_unitario) for item in self.itens]
+                    )
+                    for item, item_id in zip(self.itens, ids_itens):
+                        item.venda_id = venda_id
+                        item.id = item_id
+                self.id = venda_id
             else:
                 # Atualiza venda existente
                 query = '''
@@ -110,30 +146,6 @@ class Venda:
             print(f"Erro ao salvar venda: {e}")
             return False
     
-    def _salvar_item_venda(self, item: ItemVenda) -> bool:
-        """
-        Salva um item de venda no banco de dados.
-        
-        Args:
-            item (ItemVenda): O item de venda a ser salvo
-            
-        Returns:
-            bool: True se bem sucedido, False caso contrário
-        """
-        try:
-            query = '''
-                INSERT INTO itens_venda (venda_id, produto_id, quantidade, preco_unitario)
-                VALUES (?, ?, ?, ?)
-            '''
-            cursor = gerenciador_bd.executar_consulta(query, (
-                item.venda_id, item.produto_id, item.quantidade, item.preco_unitario
-            ))
-            item.id = cursor.lastrowid
-            return True
-        except Exception as e:
-            print(f"Erro ao salvar item de venda: {e}")
-            return False
-    
     def excluir(self) -> bool:
         """
         Exclui a venda do banco de dados.
@@ -143,13 +155,14 @@ class Venda:
         """
         try:
             if self.id is not None:
-                # Exclui itens da venda primeiro
-                query = "DELETE FROM itens_venda WHERE venda_id=?"
-                gerenciador_bd.executar_consulta(query, (self.id,))
-                
-                # Exclui a venda
-                query = "DELETE FROM vendas WHERE id=?"
-                gerenciador_bd.executar_consulta(query, (self.id,))
+                with gerenciador_bd.transacao():
+                    # Exclui itens da venda primeiro
+                    query = "DELETE FROM itens_venda WHERE venda_id=?"
+                    gerenciador_bd.executar_consulta(query, (self.id,))
+                    
+                    # Exclui a venda
+                    query = "DELETE FROM vendas WHERE id=?"
+                    gerenciador_bd.executar_consulta(query, (self.id,))
                 self.id = None
                 return True
             return False
@@ -168,17 +181,8 @@ class Venda:
         Returns:
             Venda ou None: Instância de Venda ou None se não encontrado
         """
-        query = "SELECT * FROM vendas WHERE id=?"
-        row = gerenciador_bd.buscar_um(query, (venda_id,))
-        if row:
-            venda = Venda.from_row(row)
-            # Carrega itens associados
-            venda.itens = Venda.obter_itens_venda(venda_id)
-            # Carrega cliente associado se existir
-            if venda.cliente_id:
-                venda.cliente = Cliente.obter_por_id(venda.cliente_id)
-            return venda
-        return None
+        vendas = Venda._obter_com_relacionamentos("id=?", (venda_id,))
+        return vendas[0] if vendas else None
     
     @staticmethod
     def obter_itens_venda(venda_id: int) -> List[ItemVenda]:
@@ -191,15 +195,8 @@ class Venda:
         Returns:
             List[ItemVenda]: Lista de itens da venda
         """
-        query = "SELECT * FROM itens_venda WHERE venda_id=?"
-        rows = gerenciador_bd.buscar_todos(query, (venda_id,))
-        itens = [ItemVenda.from_row(row) for row in rows]
-        
-        # Carrega informações do produto para cada item
-        for item in itens:
-            item.produto = Produto.obter_por_id(item.produto_id)
-            
-        return itens
+        itens_por_venda = Venda._carregar_itens("SELECT ?", (venda_id,))
+        return itens_por_venda.get(venda_id, [])
     
     @staticmethod
     def obter_todas() -> list['Venda']:
@@ -209,17 +206,29 @@ class Venda:
         Returns:
             list[Venda]: Lista de todas as vendas
         """
-        query = "SELECT * FROM vendas ORDER BY data_venda DESC"
-        rows = gerenciador_bd.buscar_todos(query)
-        vendas = [Venda.from_row(row) for row in rows]
+        return Venda._obter_com_relacionamentos()
+    
+    @staticmethod
+    def obter_pagina(limite: int, apos_id: Optional[int] = None) -> list['Venda']:
+        """
+        Recupera uma página de vendas, da mais recente para a mais antiga.
         
-        # Carrega itens e clientes associados
-        for venda in vendas:
-            venda.itens = Venda.obter_itens_venda(venda.id)
-            if venda.cliente_id:
-                venda.cliente = Cliente.obter_por_id(venda.cliente_id)
-                
-        return vendas
+        A paginação é por chave (data_venda, id): a página seguinte começa logo
+        após a venda informada, sem OFFSET, de modo que o custo de cada página
+        não cresce com o tamanho do histórico.
+        
+        Args:
+            limite (int): Quantidade máxima de vendas na página
+            apos_id (int, opcional): ID da última venda da página anterior
+            
+        Returns:
+            list[Venda]: Vendas da página, com itens, produtos e clientes
+        """
+        if apos_id is None:
+            return Venda._obter_com_relacionamentos(limite=limite)
+        return Venda._obter_com_relacionamentos(
+            "(data_venda, id) < (SELECT data_venda, id FROM vendas WHERE id=?)", (apos_id,), limite
+        )
     
     @staticmethod
     def obter_vendas_pendentes() -> list['Venda']:
@@ -229,14 +238,231 @@ class Venda:
         Returns:
             list[Venda]: Lista de vendas pendentes
         """
-        query = "SELECT * FROM vendas WHERE status='pendente' ORDER BY data_venda DESC"
-        rows = gerenciador_bd.buscar_todos(query)
+        return Venda._obter_com_relacionamentos("status='pendente'")
+    
+    @staticmethod
+    def recalcular_valores_pagos() -> int:
+        """
+        Recalcula o valor pago de todas as vendas a partir dos pagamentos.
+        
+        Os triggers do banco mantêm valor_pago a cada pagamento; o recálculo
+        corrige vendas alteradas por fora desses triggers.
+        
+        Returns:
+            int: Número de vendas cujo valor pago foi corrigido
+        """
+        return gerenciador_bd.executar_consulta(
+            f"{RECALCULO_VALOR_PAGO} WHERE valor_pago IS NOT "
+            "COALESCE((SELECT SUM(valor) FROM pagamentos WHERE venda_id = vendas.id), 0)"
+        ).rowcount
+    
+    @staticmethod
+    def obter_totais_por_status(periodo_inicio: Optional[datetime] = None,
+                                periodo_fim: Optional[datetime] = None) -> dict:
+        """
+        Soma o valor e conta as vendas de um período, agrupando por status.
+        
+        Args:
+            periodo_inicio (datetime, opcional): Data de início do período
+            periodo_fim (datetime, opcional): Data de fim do período
+            
+        Returns:
+            dict: Para cada status, um dicionário com 'valor_total' e 'quantidade'
+        """
+        condicoes = []
+        parametros = []
+        if periodo_inicio:
+            condicoes.append("data_venda >= ?")
+            parametros.append(periodo_inicio.isoformat())
+        if periodo_fim:
+            condicoes.append("data_venda <= ?")
+            parametros.append(periodo_fim.isoformat())
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        
+        query = f"""
+            SELECT status, COALESCE(SUM(valor_total), 0) AS valor_total, COUNT(*) AS quantidade
+            FROM vendas {filtro}
+            GROUP BY status
+        """
+        return Venda._agrupar_totais(gerenciador_bd.buscar_todos(query, tuple(parametros)))
+    
+    @staticmethod
+    def consultar(filtro: FiltroVendas) -> list[LinhaVenda]:
+        """
+        Consulta as vendas que atendem ao filtro, da mais recente para a mais antiga.
+        
+        Os critérios viram condições SQL sobre colunas indexadas (data_venda,
+        status e cliente_id) e a busca por cliente usa o índice de texto
+        completo dos clientes, de modo que apenas as linhas exibidas saem do
+        banco. A paginação é por chave (data_venda, id), como em obter_pagina.
+        
+        Args:
+            filtro (FiltroVendas): Critérios, limite e posição da página
+            
+        Returns:
+            list[LinhaVenda]: Linhas da tabela de vendas
+        """
+        pagina = ""
+        parametros_pagina = ()
+        if filtro.apos_id is not None:
+            pagina = " AND (v.data_venda, v.id) < (SELECT data_venda, id FROM vendas WHERE id=?)"
+            parametros_pagina = (filtro.apos_id,)
+        query = f"""
+            SELECT v.id, v.data_venda, c.nome AS cliente_nome, v.valor_total, v.tipo_pagamento, v.status
+            FROM vendas v LEFT JOIN clientes c ON c.id = v.cliente_id
+            WHERE {{condicoes}}{pagina}
+            ORDER BY v.data_venda DESC, v.id DESC
+        """
+        if filtro.limite is not None:
+            query += f" LIMIT {int(filtro.limite)}"
+        rows = Venda._buscar_filtrado(filtro, query, parametros_pagina)
+        return [
+            LinhaVenda(row['id'], datetime.fromisoformat(row['data_venda']), row['cliente_nome'],
+                       row['valor_total'], row['tipo_pagamento'], row['status'])
+            for row in rows
+        ]
+    
+    @staticmethod
+    def obter_totais_filtro(filtro: FiltroVendas) -> dict:
+        """
+        Soma o valor e conta as vendas que atendem ao filtro, agrupando por status.
+        
+        Considera todas as vendas do filtro, não apenas a página exibida
+        (limite e apos_id são ignorados).
+        
+        Args:
+            filtro (FiltroVendas): Critérios da consulta
+            
+        Returns:
+            dict: Para cada status, um dicionário com 'valor_total' e 'quantidade'
+        """
+        query = """
+            SELECT v.status, COALESCE(SUM(v.valor_total), 0) AS valor_total, COUNT(*) AS quantidade
+            FROM vendas v WHERE {condicoes}
+            GROUP BY v.status
+        """
+        return Venda._agrupar_totais(Venda._buscar_filtrado(filtro, query))
+    
+    @staticmethod
+    def _agrupar_totais(rows) -> dict:
+        return {
+            row['status']: {'valor_total': row['valor_total'], 'quantidade': row['quantidade']}
+            for row in rows
+        }
+    
+    @staticmethod
+    def _condicoes_filtro(filtro: FiltroVendas, indice_texto: bool = True) -> tuple:
+        """
+        Traduz os critérios do filtro em condições SQL sobre a tabela vendas (alias v).
+        
+        Args:
+            filtro (FiltroVendas): Critérios da consulta
+            indice_texto (bool): Se a busca por cliente usa o índice de texto
+                completo; caso contrário, busca o trecho no nome do cliente
+            
+        Returns:
+            tuple: (condições unidas por AND, parâmetros)
+        """
+        condicoes = []
+        parametros = []
+        if filtro.data_inicio:
+            condicoes.append("v.data_venda >= ?")
+            parametros.append(datetime.combine(filtro.data_inicio, time.min).isoformat())
+        if filtro.data_fim:
+            condicoes.append("v.data_venda <= ?")
+            parametros.append(datetime.combine(filtro.data_fim, time.max).isoformat())
+        if filtro.status:
+            condicoes.append("v.status = ?")
+            parametros.append(filtro.status)
+        expressao = expressao_busca_texto(filtro.termo_cliente)
+        if expressao is not None:
+            if indice_texto:
+                condicoes.append("v.cliente_id IN (SELECT rowid FROM clientes_busca WHERE clientes_busca MATCH ?)")
+                parametros.append(expressao)
+            else:
+                condicoes.append("v.cliente_id IN (SELECT id FROM clientes WHERE nome LIKE ?)")
+                parametros.append(f"%{filtro.termo_cliente.strip()}%")
+        return " AND ".join(condicoes) or "1", tuple(parametros)
+    
+    @staticmethod
+    def _buscar_filtrado(filtro: FiltroVendas, query: str, parametros_extras: tuple = ()) -> list:
+        """Executa a consulta preenchendo {condicoes} com os critérios do filtro."""
+        condicoes, parametros = Venda._condicoes_filtro(filtro)
+        try:
+            return gerenciador_bd.buscar_todos(query.format(condicoes=condicoes), parametros + parametros_extras)
+        except sqlite3.OperationalError:
+            if expressao_busca_texto(filtro.termo_cliente) is None:
+                raise
+            # SQLite sem FTS5 (índice não criado pela migração)
+            condicoes, parametros = Venda._condicoes_filtro(filtro, indice_texto=False)
+            return gerenciador_bd.buscar_todos(query.format(condicoes=condicoes), parametros + parametros_extras)
+    
+    @staticmethod
+    def _obter_com_relacionamentos(condicao: str = "", parametros: tuple = (),
+                                   limite: Optional[int] = None) -> list['Venda']:
+        """
+        Recupera vendas já com itens, produtos e clientes carregados.
+        
+        Em vez de consultar itens, produtos e clientes venda a venda (N+1),
+        executa uma consulta por tabela filtrando pelos IDs das vendas
+        selecionadas, de modo que o número de consultas não cresce com o
+        volume de vendas.
+        
+        Args:
+            condicao (str): Condição SQL (sem WHERE) aplicada à tabela vendas
+            parametros (tuple): Parâmetros da condição
+            limite (int, opcional): Quantidade máxima de vendas
+            
+        Returns:
+            list[Venda]: Lista de vendas ordenadas da mais recente para a mais antiga
+        """
+        filtro = f"WHERE {condicao}" if condicao else ""
+        ordem = " ORDER BY data_venda DESC, id DESC"
+        # Com limite, as subconsultas precisam selecionar exatamente as mesmas vendas
+        pagina = f"{ordem} LIMIT {int(limite)}" if limite is not None else ""
+        query = f"SELECT * FROM vendas {filtro}{pagina or ordem}"
+        rows = gerenciador_bd.buscar_todos(query, parametros)
+        if not rows:
+            return []
         vendas = [Venda.from_row(row) for row in rows]
         
-        # Carrega itens e clientes associados
+        subconsulta_ids = f"SELECT id FROM vendas {filtro}{pagina}"
+        itens_por_venda = Venda._carregar_itens(subconsulta_ids, parametros)
+        
+        query = f"SELECT * FROM clientes WHERE id IN (SELECT cliente_id FROM vendas {filtro}{pagina})"
+        clientes = {row['id']: Cliente.from_row(row) for row in gerenciador_bd.buscar_todos(query, parametros)}
+        
         for venda in vendas:
-            venda.itens = Venda.obter_itens_venda(venda.id)
+            venda.itens = itens_por_venda.get(venda.id, [])
             if venda.cliente_id:
-                venda.cliente = Cliente.obter_por_id(venda.cliente_id)
+                venda.cliente = clientes.get(venda.cliente_id)
                 
-        return vendas
\ No newline at end of file
+        return vendas
+    
+    @staticmethod
+    def _carregar_itens(subconsulta_ids: str, parametros: tuple = ()) -> dict:
+        """
+        Carrega os itens (com seus produtos) de um conjunto de vendas.
+        
+        Args:
+            subconsulta_ids (str): Subconsulta SQL que retorna os IDs das vendas
+            parametros (tuple): Parâmetros da subconsulta
+            
+        Returns:
+            dict: Itens agrupados por ID da venda
+        """
+        query = f"""
+            SELECT * FROM produtos WHERE id IN (
+                SELECT produto_id FROM itens_venda WHERE venda_id IN ({subconsulta_ids})
+            )
+        """
+        produtos = {row['id']: Produto.from_row(row) for row in gerenciador_bd.buscar_todos(query, parametros)}
+        
+        query = f"SELECT * FROM itens_venda WHERE venda_id IN ({subconsulta_ids}) ORDER BY id"
+        itens_por_venda = {}
+        for row in gerenciador_bd.buscar_todos(query, parametros):
+            item = ItemVenda.from_row(row)
+            item.produto = produtos.get(item.produto_id)
+            itens_por_venda.setdefault(item.venda_id, []).append(item)
+            
+        return itens_por_venda
@@ -0,0 +1,721 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste para verificar a camada de banco de dados (migrações de esquema).
+"""
+
+import sys
+import re
+import sqlite3
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from database.db_manager import GerenciadorBancoDados, gerenciador_bd, PERFIS_BANCO
+from database import migracoes
+from apoio_testes import banco_temporario, caminho_temporario
+
+
+def test_migracoes_banco_novo():
+    """Testa a criação de um banco novo e a reconexão a um banco atualizado."""
+    print("=== Testando Migrações em Banco Novo ===")
+
+    gerenciador = GerenciadorBancoDados(caminho_temporario())
+    conexao = gerenciador.conectar()
+    versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+    assert versao == len(migracoes.MIGRACOES)
+    tabelas = {row[0] for row in conexao.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {"produtos", "clientes", "vendas", "itens_venda", "pagamentos",
+            "movimentacoes_estoque", "consignacoes", "itens_consignacao"} <= tabelas
+    print(f"✓ Banco criado na versão {versao}")
+
+    # Banco já atualizado: apenas a leitura da versão
+    instrucoes = []
+    conexao.set_trace_callback(instrucoes.append)
+    gerenciador._aplicar_migracoes(conexao)
+    conexao.set_trace_callback(None)
+    assert instrucoes == ["PRAGMA user_version"], instrucoes
+    gerenciador.desconectar()
+    print("✓ Reconexão executa apenas PRAGMA user_version")
+    return True
+
+
+def test_migracoes_banco_legado():
+    """Testa a atualização de um banco criado antes do controle de versão."""
+    print("=== Testando Migrações em Banco Legado ===")
+
+    caminho = caminho_temporario()
+    legado = sqlite3.connect(caminho)
+    legado.executescript('''
+        CREATE TABLE clientes (id INTEGER PRIMARY KEY AUTOINCREMENT, nome TEXT NOT NULL,
+                               telefone TEXT, observacoes TEXT);
+        CREATE TABLE vendas (id INTEGER PRIMARY KEY AUTOINCREMENT, cliente_id INTEGER,
+                             valor_total REAL NOT NULL, tipo_pagamento TEXT NOT NULL,
+                             status TEXT NOT NULL, data_venda TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                             observacoes TEXT);
+        INSERT INTO clientes (nome) VALUES ('Cliente Antiga');
+    ''')
+    legado.close()
+
+    gerenciador = GerenciadorBancoDados(caminho)
+    conexao = gerenciador.conectar()
+    colunas_clientes = [row[1] for row in conexao.execute("PRAGMA table_info(clientes)")]
+    colunas_vendas = [row[1] for row in conexao.execute("PRAGMA table_info(vendas)")]
+    assert {"email", "tipo", "comissao_padrao"} <= set(colunas_clientes)
+    assert "dia_vencimento" in colunas_vendas
+    assert conexao.execute("SELECT tipo FROM clientes").fetchone()[0] == "Avulso"
+    assert conexao.execute("PRAGMA user_version").fetchone()[0] == len(migracoes.MIGRACOES)
+    # Registros anteriores à migração também entram no índice de busca
+    assert [row[0] for row in conexao.execute("SELECT rowid FROM clientes_busca WHERE clientes_busca MATCH 'antig*'")] == [1]
+    gerenciador.desconectar()
+    print("✓ Banco legado atualizado preservando os dados")
+    return True
+
+
+def test_migracao_com_erro_desfeita():
+    """Testa que uma migração com erro é desfeita e não avança a versão."""
+    print("=== Testando Falha de Migração ===")
+
+    def migracao_com_erro(cursor):
+        cursor.execute("CREATE TABLE tabela_temporaria (id INTEGER)")
+        raise RuntimeError("falha simulada")
+
+    caminho = caminho_temporario()
+    GerenciadorBancoDados(caminho).conectar().close()
+
+    migracoes.MIGRACOES.append(migracao_com_erro)
+    try:
+        gerenciador = GerenciadorBancoDados(caminho)
+        try:
+            gerenciador.conectar()
+            assert False, "A migração com erro deveria ter sido propagada"
+        except RuntimeError:
+            pass
+        assert gerenciador.conexao is None
+        conexao = sqlite3.connect(caminho)
+        assert conexao.execute("PRAGMA user_version").fetchone()[0] == len(migracoes.MIGRACOES) - 1
+        assert conexao.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name='tabela_temporaria'"
+        ).fetchone()[0] == 0
+        conexao.close()
+    finally:
+        migracoes.MIGRACOES.remove(migracao_com_erro)
+    print("✓ Migração com erro desfeita sem alterar a versão")
+    return True
+
+
+def test_transacao_confirma_e_desfaz():
+    """Testa que transacao() confirma uma vez ao final e desfaz tudo em caso de erro."""
+    print("=== Testando Transações ===")
+
+    gerenciador = GerenciadorBancoDados(caminho_temporario())
+    conexao = gerenciador.conectar()
+    instrucoes = []
+    conexao.set_trace_callback(instrucoes.append)
+    with gerenciador.transacao():
+        for i in range(30):
+            gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES (?)", (f"Cliente {i}",))
+        with gerenciador.transacao():
+            gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES ('Aninhado')")
+        assert gerenciador.buscar_um("SELECT COUNT(*) FROM clientes")[0] == 31
+    conexao.set_trace_callback(None)
+    assert instrucoes.count("COMMIT") == 1, instrucoes
+    assert not gerenciador.em_transacao
+    print("✓ 31 inserções confirmadas com um único COMMIT")
+
+    try:
+        with gerenciador.transacao():
+            gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES ('Desfeito')")
+            with gerenciador.transacao():
+                gerenciador.executar_consulta("DELETE FROM clientes")
+                raise RuntimeError("falha simulada")
+    except RuntimeError:
+        pass
+    assert gerenciador.buscar_um("SELECT COUNT(*) FROM clientes")[0] == 31
+    assert not conexao.in_transaction and not gerenciador.em_transacao
+
+    # Fora de transacao() cada instrução continua confirmada imediatamente
+    gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES ('Avulso')")
+    assert not conexao.in_transaction
+    gerenciador.desconectar()
+    print("✓ Erro dentro da transação desfaz todas as alterações")
+    return True
+
+
+def medir_gravacoes_por_segundo(perfil: str, quantidade: int = 300) -> float:
+    """Mede inserções confirmadas uma a uma (como no caixa) com o perfil informado."""
+    gerenciador = GerenciadorBancoDados(caminho_temporario(), perfil)
+    gerenciador.conectar()
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        gerenciador.executar_consulta(
+            "INSERT INTO pagamentos (venda_id, valor) VALUES (?, ?)", (i % 50 + 1, 10.0)
+        )
+    segundos = time.perf_counter() - inicio
+    gerenciador.desconectar()
+    return quantidade / segundos
+
+
+def test_perfis_banco():
+    """Testa a aplicação dos perfis de PRAGMAs e compara gravações por segundo."""
+    print("=== Testando Perfis de Banco de Dados ===")
+
+    caminho = caminho_temporario()
+    gerenciador = GerenciadorBancoDados(caminho)
+    conexao = gerenciador.conectar()
+    assert conexao.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conexao.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conexao.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conexao.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    # Em WAL, uma leitura em andamento não impede a gravação
+    leitor = sqlite3.connect(caminho)
+    leitor.execute("BEGIN")
+    leitor.execute("SELECT COUNT(*) FROM vendas").fetchone()
+    gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES ('Durante relatório')")
+    leitor.rollback()
+    leitor.close()
+    print("✓ Perfil Desempenho: WAL, leitura simultânea não bloqueia gravação")
+
+    # Troca de perfil com a conexão aberta
+    gerenciador.definir_perfil("Padrão")
+    assert conexao.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conexao.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    gerenciador.desconectar()
+    try:
+        gerenciador.definir_perfil("Inexistente")
+        assert False, "Perfil desconhecido deveria ser rejeitado"
+    except ValueError:
+        pass
+    print("✓ Perfil Padrão aplicado à conexão aberta")
+
+    for perfil in PERFIS_BANCO:
+        print(f"  {perfil}: {medir_gravacoes_por_segundo(perfil):.0f} gravações/s")
+    return True
+
+
+def test_acesso_concorrente():
+    """Testa leituras em várias threads com o pool limitado e um único escritor."""
+    print("=== Testando Acesso Concorrente ===")
+
+    gerenciador = GerenciadorBancoDados(caminho_temporario(), tamanho_pool=3)
+    with gerenciador.transacao():
+        for i in range(200):
+            gerenciador.executar_consulta("INSERT INTO clientes (nome) VALUES (?)", (f"Cliente {i}",))
+
+    def ler(_):
+        return gerenciador.buscar_um("SELECT COUNT(*) FROM clientes")[0]
+
+    def gravar(i):
+        with gerenciador.transacao():
+            gerenciador.executar_consulta("INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) "
+                                          "VALUES (?, 'Anéis', 1, 2, 3)", (f"Produto {i}",))
+            return gerenciador.buscar_um("SELECT COUNT(*) FROM produtos WHERE nome = ?", (f"Produto {i}",))[0]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leituras = list(executor.map(ler, range(64)))
+        gravacoes = list(executor.map(gravar, range(32)))
+    assert leituras == [200] * 64
+    assert gravacoes == [1] * 32  # Leitura dentro da transação enxerga a própria gravação
+    assert gerenciador.buscar_um("SELECT COUNT(*) FROM produtos")[0] == 32
+    assert gerenciador._leitores_criados <= 3
+    print(f"✓ 64 leituras e 32 transações em 8 threads com {gerenciador._leitores_criados} conexões de leitura")
+
+    # Uma transação aberta em outra thread não bloqueia leituras, que veem apenas o confirmado
+    dentro_da_transacao = threading.Event()
+    liberar = threading.Event()
+
+    def transacao_longa():
+        with gerenciador.transacao():
+            gerenciador.executar_consulta("DELETE FROM clientes")
+            dentro_da_transacao.set()
+            liberar.wait(5)
+
+    escritor = threading.Thread(target=transacao_longa)
+    escritor.start()
+    dentro_da_transacao.wait(5)
+    assert ler(None) == 200
+    liberar.set()
+    escritor.join()
+    assert ler(None) == 0
+
+    try:
+        with gerenciador._conexao_leitura() as conexao:
+            conexao.execute("DELETE FROM produtos")
+        assert False, "Conexões de leitura não devem gravar"
+    except sqlite3.OperationalError:
+        pass
+    gerenciador.desconectar()
+    print("✓ Leituras não esperam transações de outras threads")
+    return True
+
+
+def test_operacoes_atomicas_controllers():
+    """Testa que falhas no meio de uma venda ou consignação não deixam registros parciais."""
+    print("=== Testando Atomicidade dos Controllers ===")
+
+    from controllers.venda_controller import VendaController
+    from controllers.consignacao_controller import ConsignacaoController
+    from models.produto import Produto
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.execute("INSERT INTO clientes (nome) VALUES ('Revendedora')")
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, 'Anéis', 10, 25, 100)",
+            [(f"Produto {i}",) for i in range(30)]
+        )
+        conexao.commit()
+
+        def contagens():
+            return [gerenciador_bd.buscar_um(f"SELECT COUNT(*) FROM {tabela}")[0] for tabela in
+                    ("vendas", "itens_venda", "consignacoes", "itens_consignacao", "movimentacoes_estoque")]
+
+        # Venda com 30 itens: uma única confirmação
+        instrucoes = []
+        conexao.set_trace_callback(instrucoes.append)
+        itens = [{'produto_id': i, 'quantidade': 1, 'preco_unitario': 25.0} for i in range(1, 31)]
+        inicio = time.perf_counter()
+        venda = VendaController.criar_venda(1, itens, "PIX")
+        segundos = time.perf_counter() - inicio
+        conexao.set_trace_callback(None)
+        assert venda is not None and len(venda.itens) == 30
+        assert instrucoes.count("COMMIT") == 1, instrucoes.count("COMMIT")
+        assert Produto.obter_por_id(1).quantidade == 99
+        print(f"✓ Venda com 30 itens gravada com um único COMMIT em {segundos * 1000:.1f} ms")
+
+        # Gatilho que faz falhar a gravação do item do produto 3, depois dos anteriores
+        antes = contagens()
+        for tabela in ("itens_venda", "itens_consignacao"):
+            conexao.execute(f'''
+                CREATE TEMP TRIGGER falha_{tabela} BEFORE INSERT ON {tabela}
+                WHEN NEW.produto_id = 3 BEGIN SELECT RAISE(ABORT, 'falha simulada'); END
+            ''')
+        assert VendaController.criar_venda(1, itens, "PIX") is None
+        itens_consignacao = [{'produto_id': i, 'qtd': 1, 'preco': 25.0, 'comissao': 10.0} for i in (1, 2, 3)]
+        try:
+            ConsignacaoController.criar_consignacao(1, itens_consignacao)
+            assert False, "A falha do item deveria ser propagada"
+        except RuntimeError:
+            pass
+        assert contagens() == antes, (contagens(), antes)
+        assert Produto.obter_por_id(1).quantidade == 99
+        assert not conexao.in_transaction
+        print("✓ Falhas no meio da operação não deixam registros parciais")
+    return True
+
+
+def test_gravacao_em_lote():
+    """Testa inserir_em_lote e a baixa de estoque em lote de um pedido de atacado."""
+    print("=== Testando Gravações em Lote ===")
+
+    from controllers.venda_controller import VendaController
+    from controllers.consignacao_controller import ConsignacaoController
+
+    with banco_temporario():
+        ids = gerenciador_bd.inserir_em_lote(
+            "produtos", ("nome", "categoria", "preco_custo", "preco_venda", "quantidade"),
+            [(f"Produto {i}", "Anéis", 10.0, 25.0, 500) for i in range(100)]
+        )
+        assert ids == list(range(1, 101))
+        assert gerenciador_bd.buscar_um("SELECT nome FROM produtos WHERE id = 42")["nome"] == "Produto 41"
+        gerenciador_bd.executar_consulta("INSERT INTO clientes (nome) VALUES ('Atacado')")
+
+        # Pedido de 100 linhas, com o produto 1 repetido
+        itens = [{'produto_id': i, 'quantidade': 2, 'preco_unitario': 25.0} for i in range(1, 101)]
+        itens.append({'produto_id': 1, 'quantidade': 3, 'preco_unitario': 25.0})
+        instrucoes = []
+        gerenciador_bd.definir_rastreamento(instrucoes.append)
+        inicio = time.perf_counter()
+        venda = VendaController.criar_venda(1, itens, "PIX")
+        segundos = time.perf_counter() - inicio
+        gerenciador_bd.definir_rastreamento(None)
+        assert venda is not None
+        assert instrucoes.count("COMMIT") == 1
+        assert not [sql for sql in instrucoes if sql.lstrip().upper().startswith("SELECT * FROM PRODUTOS")]
+        ids_banco = [row["id"] for row in gerenciador_bd.buscar_todos(
+            "SELECT id FROM itens_venda WHERE venda_id = ? ORDER BY id", (venda.id,))]
+        assert [item.id for item in venda.itens] == ids_banco
+        estoque = {row["id"]: row["quantidade"] for row in gerenciador_bd.buscar_todos("SELECT id, quantidade FROM produtos")}
+        assert estoque[1] == 495 and estoque[2] == 498 and estoque[100] == 498
+        print(f"✓ Venda de {len(itens)} linhas gravada em {segundos * 1000:.1f} ms com um único COMMIT")
+
+        consignacao = ConsignacaoController.criar_consignacao(
+            1, [{'produto_id': i, 'qtd': 1, 'preco': 25.0, 'comissao': 10.0} for i in range(1, 101)]
+        )
+        assert all(item.id is not None for item in consignacao.itens)
+        assert gerenciador_bd.buscar_um(
+            "SELECT COUNT(*) FROM movimentacoes_estoque WHERE tipo_movimentacao = 'saida' AND observacoes = ?",
+            (f"Consignação #{consignacao.id}",)
+        )[0] == 100
+        assert gerenciador_bd.buscar_um("SELECT quantidade FROM produtos WHERE id = 2")[0] == 497
+        print("✓ Consignação de 100 itens com estoque e movimentações em lote")
+    return True
+
+
+def test_acerto_consignacao_em_lote():
+    """Testa o acerto de uma consignação de 200 peças: um COMMIT e nada gravado pela metade."""
+    print("=== Testando Acerto de Consignação em Lote ===")
+
+    from controllers.consignacao_controller import ConsignacaoController
+    from models.produto import Produto
+
+    with banco_temporario():
+        gerenciador_bd.inserir_em_lote(
+            "produtos", ("nome", "categoria", "preco_custo", "preco_venda", "quantidade"),
+            [(f"Produto {i}", "Anéis", 10.0, 25.0, 10) for i in range(200)]
+        )
+        gerenciador_bd.executar_consulta("INSERT INTO clientes (nome) VALUES ('Revendedora')")
+        consignacao = ConsignacaoController.criar_consignacao(
+            1, [{'produto_id': i, 'qtd': 4, 'preco': 25.0, 'comissao': 10.0} for i in range(1, 201)]
+        )
+        ids_itens = [item.id for item in consignacao.itens]
+
+        def estado():
+            return (
+                [tuple(row) for row in gerenciador_bd.buscar_todos(
+                    "SELECT qtd_vendida, qtd_devolvida FROM itens_consignacao ORDER BY id")],
+                [row[0] for row in gerenciador_bd.buscar_todos("SELECT quantidade FROM produtos ORDER BY id")],
+                gerenciador_bd.buscar_um("SELECT COUNT(*) FROM movimentacoes_estoque")[0],
+                tuple(gerenciador_bd.buscar_um(
+                    "SELECT status, total_vendido FROM consignacoes WHERE id = ?", (consignacao.id,))),
+            )
+
+        # Falha no último item: nenhum item, estoque, movimentação ou total é gravado
+        antes = estado()
+        gerenciador_bd.conectar().execute(f'''
+            CREATE TEMP TRIGGER falha_acerto BEFORE UPDATE ON itens_consignacao
+            WHEN NEW.id = {ids_itens[-1]} BEGIN SELECT RAISE(ABORT, 'falha simulada'); END
+        ''')
+        acerto = [{'item_id': item_id, 'qtd_vendida': 2, 'qtd_devolvida': 1} for item_id in ids_itens]
+        assert not ConsignacaoController.registrar_acerto(consignacao.id, acerto, finalizar=True)
+        assert estado() == antes
+        gerenciador_bd.conectar().execute("DROP TRIGGER falha_acerto")
+        print("✓ Falha no último item desfaz o acerto inteiro")
+
+        # Acerto final: 2 vendidas, 1 devolvida e 1 retornada por item
+        instrucoes = []
+        gerenciador_bd.definir_rastreamento(instrucoes.append)
+        inicio = time.perf_counter()
+        assert ConsignacaoController.registrar_acerto(consignacao.id, acerto, finalizar=True)
+        segundos = time.perf_counter() - inicio
+        gerenciador_bd.definir_rastreamento(None)
+        assert instrucoes.count("COMMIT") == 1, instrucoes.count("COMMIT")
+        assert not [sql for sql in instrucoes if "SELECT * FROM PRODUTOS" in sql.upper()]
+
+        itens, estoque, movimentacoes, (status, total_vendido) = estado()
+        assert itens == [(2, 2)] * 200
+        assert estoque == [8] * 200
+        assert movimentacoes == antes[2] + 400
+        assert status == "Fechada" and total_vendido == 200 * 2 * 25.0
+        fechada = ConsignacaoController.obter_consignacao(consignacao.id)
+        assert abs(fechada.total_comissao - 1000.0) < 1e-6 and abs(fechada.total_liquido - 9000.0) < 1e-6
+        # Os produtos foram inseridos sem o estoque inicial: o registro difere sempre em 10
+        divergencias = Produto.reconciliar_estoque()
+        assert len(divergencias) == 200
+        assert {(d.quantidade - d.saldo, d.saldo - d.movimentado) for d in divergencias} == {(10, 0)}
+        print(f"✓ Acerto de 200 itens em {segundos * 1000:.1f} ms com um único COMMIT "
+              f"({len(instrucoes)} instruções)")
+    return True
+
+
+def test_acertos_simultaneos():
+    """Dois acertos iguais ao mesmo tempo devolvem as peças ao estoque uma única vez."""
+    print("=== Testando Acertos Simultâneos da Mesma Consignação ===")
+
+    from controllers.consignacao_controller import ConsignacaoController
+    from models.produto import Produto
+
+    with banco_temporario():
+        gerenciador_bd.executar_consulta(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) "
+            "VALUES ('Anel', 'Anéis', 10, 25, 10)")
+        gerenciador_bd.executar_consulta("INSERT INTO clientes (nome) VALUES ('Revendedora')")
+        consignacao = ConsignacaoController.criar_consignacao(
+            1, [{'produto_id': 1, 'qtd': 6, 'preco': 25.0, 'comissao': 10.0}])
+        acerto = [{'item_id': consignacao.itens[0].id, 'qtd_vendida': 1, 'qtd_devolvida': 3}]
+
+        # O segundo acerto começa enquanto o primeiro ainda não foi confirmado
+        resultados = []
+        concorrente = threading.Thread(
+            target=lambda: resultados.append(ConsignacaoController.registrar_acerto(consignacao.id, acerto)))
+        with gerenciador_bd.transacao():
+            concorrente.start()
+            time.sleep(0.2)
+            assert ConsignacaoController.registrar_acerto(consignacao.id, acerto)
+        concorrente.join()
+
+        assert resultados == [True]
+        assert Produto.obter_por_id(1).quantidade == 7
+        devolucoes = gerenciador_bd.buscar_um(
+            "SELECT COUNT(*) FROM movimentacoes_estoque WHERE tipo_movimentacao = 'entrada' "
+            "AND observacoes LIKE 'Devolução%'")[0]
+        assert devolucoes == 1, devolucoes
+        print("✓ Devolução creditada uma vez; o acerto repetido não altera o estoque")
+    return True
+
+
+def executar_operacoes_principais():
+    """Percorre as operações dos controllers usadas pelas telas principais."""
+    from controllers.produto_controller import ProdutoController
+    from controllers.cliente_controller import ClienteController
+    from controllers.venda_controller import VendaController
+    from controllers.pagamento_controller import PagamentoController
+    from controllers.consignacao_controller import ConsignacaoController
+
+    produto = ProdutoController.criar_produto("Anel Solitário", "Anéis", 10.0, 25.0, 50)
+    ProdutoController.atualizar_produto(produto.id, quantidade=40)
+    ProdutoController.obter_produto(produto.id)
+    ProdutoController.listar_produtos()
+    ProdutoController.listar_produtos_pagina(20, produto.id)
+    ProdutoController.buscar_produtos("Anel")
+    cliente = ClienteController.criar_cliente("Maria", "(31) 99999-0000", tipo="Revendedora")
+    ClienteController.atualizar_cliente(cliente.id, telefone="(31) 98888-0000")
+    ClienteController.listar_clientes()
+    ClienteController.listar_clientes_pagina(20, cliente.id)
+    ClienteController.buscar_clientes("Mar")
+
+    venda = VendaController.criar_venda(
+        cliente.id, [{'produto_id': produto.id, 'quantidade': 1, 'preco_unitario': 25.0}],
+        "Parcelado Boleto", 10
+    )
+    VendaController.obter_venda(venda.id)
+    VendaController.listar_vendas()
+    VendaController.listar_vendas_pagina(20)
+    VendaController.listar_vendas_pagina(20, venda.id)
+    VendaController.listar_vendas_pendentes()
+    VendaController.calcular_financeiro(datetime(2020, 1, 1), datetime(2100, 1, 1))
+    PagamentoController.registrar_pagamento(venda.id, 5.0)
+    PagamentoController.listar_pagamentos_por_venda(venda.id)
+    PagamentoController.listar_pagamentos()
+    PagamentoController.obter_dividas_pendentes()
+    PagamentoController.calcular_totais_dividas()
+
+    consignacao = ConsignacaoController.criar_consignacao(
+        cliente.id, [{'produto_id': produto.id, 'qtd': 5, 'preco': 25.0, 'comissao': 10.0}]
+    )
+    consignacao = ConsignacaoController.obter_consignacao(consignacao.id)
+    ConsignacaoController.registrar_acerto(
+        consignacao.id, [{'item_id': consignacao.itens[0].id, 'qtd_vendida': 2, 'qtd_devolvida': 1}], True
+    )
+    ConsignacaoController.listar_consignacoes()
+    ConsignacaoController.listar_consignacoes_pagina(20, consignacao.id)
+
+    venda.excluir()
+    ClienteController.excluir_cliente(cliente.id)
+    ProdutoController.excluir_produto(produto.id)
+
+
+def test_planos_de_consulta_usam_indices():
+    """Verifica via EXPLAIN QUERY PLAN que consultas filtradas não varrem tabelas inteiras."""
+    print("=== Testando Planos de Consulta ===")
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        # Volume suficiente para o planejador preferir índices a varreduras
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, 'Anéis', 10, 25, 100)",
+            [(f"Produto {i}",) for i in range(300)]
+        )
+        conexao.executemany("INSERT INTO clientes (nome) VALUES (?)", [(f"Cliente {i}",) for i in range(300)])
+        conexao.commit()
+
+        instrucoes = []
+        gerenciador_bd.definir_rastreamento(instrucoes.append)
+        try:
+            executar_operacoes_principais()
+        finally:
+            gerenciador_bd.definir_rastreamento(None)
+
+        varreduras = []
+        for sql in dict.fromkeys(instrucoes):
+            comando = sql.lstrip().split(None, 1)[0].upper()
+            # Listagens completas (sem WHERE) leem a tabela inteira por definição
+            if comando not in ("SELECT", "UPDATE", "DELETE") or " WHERE " not in " ".join(sql.upper().split()):
+                continue
+            for linha in conexao.execute("EXPLAIN QUERY PLAN " + sql):
+                detalhe = linha[3]
+                # Tabelas FTS5 com MATCH aparecem como "VIRTUAL TABLE INDEX n:M..." (busca no índice)
+                if detalhe.startswith("SCAN ") and " USING " not in detalhe \
+                        and not re.search(r"VIRTUAL TABLE INDEX \d+:M", detalhe):
+                    varreduras.append(f"{detalhe}: {' '.join(sql.split())[:120]}")
+        assert not varreduras, "Varreduras completas encontradas:\n" + "\n".join(varreduras)
+        print(f"✓ {len(set(instrucoes))} instruções sem varreduras completas de tabela")
+    return True
+
+
+def test_busca_texto_completo():
+    """Testa a busca FTS5 de produtos e clientes: acentos, prefixos, relevância e triggers."""
+    print("=== Testando Busca de Texto Completo ===")
+
+    from controllers.produto_controller import ProdutoController
+    from controllers.cliente_controller import ClienteController
+    from models.produto import Produto
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, 10, 25, 5)",
+            [(f"Pulseira Banhada {i}", "Pulseiras") for i in range(20000)]
+        )
+        conexao.commit()
+        colar = ProdutoController.criar_produto("Colar Pérola", "Colares de Zircônia", 10.0, 25.0, 5)
+        anel = ProdutoController.criar_produto("Anel Zircônia Cravejado", "Anéis", 10.0, 25.0, 5)
+
+        # Sem acento, por prefixo e com o nome pesando mais que a categoria
+        assert [p.id for p in ProdutoController.buscar_produtos("zirc")] == [anel.id, colar.id]
+        assert [p.id for p in ProdutoController.buscar_produtos("ANEIS")] == [anel.id]
+        assert [p.id for p in ProdutoController.buscar_produtos('anel "crav')] == [anel.id]
+        assert len(ProdutoController.buscar_produtos("pulseira ban", limite=10)) == 10
+        assert len(ProdutoController.buscar_produtos("  ")) == 20002
+        assert ProdutoController.buscar_ids_produtos_por_relevancia("zirc") == [anel.id, colar.id]
+        assert ProdutoController.buscar_ids_produtos_por_relevancia("  ") is None
+
+        # Filtro da lista (sem ordenação) a cada tecla digitada
+        teclas = ("p", "pu", "pul", "puls", "pulse", "z", "zi", "zir")
+        inicio = time.perf_counter()
+        for termo in teclas:
+            ids = ProdutoController.buscar_ids_produtos(termo)
+        t_fts = (time.perf_counter() - inicio) / len(teclas)
+        assert ids == {anel.id, colar.id}
+        assert ProdutoController.buscar_ids_produtos(" ") is None
+        inicio = time.perf_counter()
+        for termo in teclas:
+            {p.id for p in Produto.buscar_por_nome(termo)}
+        t_like = (time.perf_counter() - inicio) / len(teclas)
+        inicio = time.perf_counter()
+        ProdutoController.buscar_produtos("zir", limite=50)
+        t_ranking = time.perf_counter() - inicio
+        print(f"✓ Busca sem acentos por prefixo: {t_fts * 1000:.2f} ms por tecla (LIKE: {t_like * 1000:.2f} ms); "
+              f"com relevância: {t_ranking * 1000:.2f} ms")
+
+        # Triggers mantêm o índice em inserções, alterações e exclusões
+        ProdutoController.atualizar_produto(anel.id, nome="Anel Solitário")
+        assert [p.id for p in ProdutoController.buscar_produtos("zirc")] == [colar.id]
+        assert [p.id for p in ProdutoController.buscar_produtos("solitario")] == [anel.id]
+        ProdutoController.excluir_produto(colar.id)
+        assert ProdutoController.buscar_produtos("perola") == []
+
+        cliente = ClienteController.criar_cliente("José Antônio", "(31) 99876-5432")
+        cliente.email = "jose@exemplo.com"
+        assert cliente.salvar()
+        assert [c.id for c in ClienteController.buscar_clientes("jose anto")] == [cliente.id]
+        assert [c.id for c in ClienteController.buscar_clientes("99876")] == [cliente.id]
+        assert [c.id for c in ClienteController.buscar_clientes("exemplo")] == [cliente.id]
+        # Páginas da lista de clientes restritas à busca
+        homonimo = ClienteController.criar_cliente("Jose Antonio Filho")
+        assert [c.id for c in ClienteController.listar_clientes_pagina(1, termo="jose anto")] == [homonimo.id]
+        assert [c.id for c in ClienteController.listar_clientes_pagina(5, homonimo.id, "jose anto")] == [cliente.id]
+        assert ClienteController.contar_clientes("jose anto") == 2
+        assert ClienteController.contar_clientes() == ClienteController.contar_clientes("  ")
+        ClienteController.excluir_cliente(homonimo.id)
+        ClienteController.excluir_cliente(cliente.id)
+        assert ClienteController.buscar_clientes("jose") == []
+        print("✓ Índice de produtos e clientes sincronizado pelos triggers")
+    return True
+
+
+def test_cache_de_leituras():
+    """Testa o cache de listar_produtos/listar_clientes e sua invalidação pelas gravações."""
+    print("=== Testando Cache de Leituras ===")
+
+    from controllers.produto_controller import ProdutoController
+    from controllers.cliente_controller import ClienteController
+
+    consultas = []
+    with banco_temporario():
+        try:
+            conexao = gerenciador_bd.conectar()
+            conexao.executemany(
+                "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, 10, 25, 5)",
+                [(f"Anel {i}", "Anéis") for i in range(5000)]
+            )
+            conexao.commit()
+            cliente = ClienteController.criar_cliente("Maria", "(31) 90000-0000")
+
+            gerenciador_bd.definir_rastreamento(lambda sql: consultas.append(sql) if sql.startswith("SELECT") else None)
+            inicio = time.perf_counter()
+            primeira = ProdutoController.listar_produtos()
+            t_banco = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            segunda = ProdutoController.listar_produtos()
+            t_cache = time.perf_counter() - inicio
+            assert len(consultas) == 1 and len(segunda) == 5000
+            # Mesmos objetos, em uma lista própria de cada chamador
+            assert segunda is not primeira and all(a is b for a, b in zip(primeira, segunda))
+            ClienteController.listar_clientes()
+            ClienteController.listar_clientes()
+            assert len(consultas) == 2
+            print(f"✓ 5000 produtos: {t_banco * 1000:.1f} ms do banco, {t_cache * 1000:.2f} ms do cache")
+
+            # Gravar um cliente não invalida os produtos, e vice-versa
+            versao_produtos = ProdutoController.versao_produtos()
+            ClienteController.atualizar_cliente(cliente.id, nome="Maria Souza")
+            assert ProdutoController.versao_produtos() == versao_produtos
+            assert ProdutoController.listar_produtos()[0] is primeira[0]
+            assert [c.nome for c in ClienteController.listar_clientes()] == ["Maria Souza"]
+            ProdutoController.criar_produto("Aliança", "Anéis", 10.0, 25.0, 5)
+            assert ProdutoController.versao_produtos() != versao_produtos
+            assert len(ProdutoController.listar_produtos()) == 5001
+
+            # Transação: só a confirmação muda a versão; dentro dela, a leitura vê o que foi gravado
+            versao_produtos = ProdutoController.versao_produtos()
+            try:
+                with gerenciador_bd.transacao():
+                    gerenciador_bd.executar_consulta("DELETE FROM produtos WHERE nome = 'Aliança'")
+                    assert len(ProdutoController.listar_produtos()) == 5000
+                    raise RuntimeError("desfazer")
+            except RuntimeError:
+                pass
+            assert ProdutoController.versao_produtos() == versao_produtos
+            assert len(ProdutoController.listar_produtos()) == 5001
+            with gerenciador_bd.transacao():
+                gerenciador_bd.executar_consulta("UPDATE produtos SET quantidade = 0 WHERE nome = 'Aliança'")
+                assert ProdutoController.versao_produtos() == versao_produtos
+            assert ProdutoController.versao_produtos() != versao_produtos
+            assert [p.quantidade for p in ProdutoController.listar_produtos() if p.nome == "Aliança"] == [0]
+            print("✓ Gravações confirmadas invalidam apenas as leituras das tabelas alteradas")
+        finally:
+            gerenciador_bd.definir_rastreamento(None)
+
+    # Outro banco: nada do cache anterior é reaproveitado
+    assert len(ProdutoController.listar_produtos()) != 5001
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_migracoes_banco_novo,
+        test_migracoes_banco_legado,
+        test_migracao_com_erro_desfeita,
+        test_transacao_confirma_e_desfaz,
+        test_perfis_banco,
+        test_acesso_concorrente,
+        test_operacoes_atomicas_controllers,
+        test_gravacao_em_lote,
+        test_acerto_consignacao_em_lote,
+        test_acertos_simultaneos,
+        test_planos_de_consulta_usam_indices,
+        test_busca_texto_completo,
+        test_cache_de_leituras,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Todos os testes de banco de dados passaram!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para a busca por digitação das listas: espera a
+pausa na digitação, estreita os resultados a partir da busca anterior,
+cancela avaliações em andamento e exibe a latência na barra de status.
+"""
+
+import os
+import sys
+import time
+
+from database.db_manager import gerenciador_bd
+
+
+def test_busca_incremental():
+    """Mede a busca com 200 mil itens e verifica espera, estreitamento e cancelamento."""
+    print("=== Testando Busca Incremental ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication, QLineEdit
+        from ui.busca import BuscaIncremental
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, benchmark ignorado: {e}")
+        return True
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    itens = [f"anel {i}" if i % 2 else f"colar {i}" for i in range(200_000)]
+    aplicados = []
+    medicoes = []
+    campo = QLineEdit()
+    busca = BuscaIncremental(campo, lambda: itens, lambda termo: (lambda item: termo in item),
+                             lambda resultados, termo: aplicados.append((termo, len(resultados))),
+                             atraso_ms=50)
+    busca.concluida.connect(lambda *args: medicoes.append(args))
+
+    # Teclas seguidas: apenas o termo final é buscado, depois da pausa
+    for termo in ("a", "an", "ane", "anel"):
+        campo.setText(termo)
+        app.processEvents()
+    assert aplicados == [] and busca.ocupado
+    assert busca.aguardar()
+    assert aplicados == [("anel", 100_000)], aplicados
+    assert busca.avaliados == 200_000
+    print(f"✓ 4 teclas, 1 busca: {medicoes[-1][2]:.1f} ms filtrando 200000 itens")
+
+    # Termo estendido: avalia só os resultados anteriores
+    campo.setText("anel 1")
+    assert busca.aguardar()
+    assert aplicados[-1] == ("anel 1", sum(1 for item in itens if "anel 1" in item))
+    assert busca.avaliados == 100_000, busca.avaliados
+    campo.setText("anel 12")
+    assert busca.aguardar()
+    assert busca.avaliados == aplicados[-2][1]
+    print(f"✓ Estreitamento: \"anel 12\" avaliou {busca.avaliados} itens em {medicoes[-1][2]:.1f} ms")
+
+    # Apagar volta a avaliar a lista inteira; espaços extras não mudam o termo
+    campo.setText("anel")
+    assert busca.aguardar() and busca.avaliados == 200_000
+    quantidade = len(aplicados)
+    campo.setText("  anel ")
+    assert busca.aguardar() and len(aplicados) == quantidade
+
+    # Uma tecla durante a avaliação em blocos a cancela
+    busca.bloco = 10_000
+    campo.setText("colar")
+    busca.executar_agora()
+    assert busca.em_andamento is not None and busca.avaliados == 10_000
+    campo.setText("colar 9")
+    assert busca.aguardar()
+    assert [termo for termo, _ in aplicados[quantidade:]] == ["colar 9"], aplicados[quantidade:]
+    print("✓ Avaliação em andamento cancelada pela tecla seguinte")
+
+    campo.deleteLater()
+    app.processEvents()
+    return True
+
+
+def test_busca_nas_listas():
+    """Verifica a busca nas abas e a latência exibida na barra de status."""
+    print("=== Testando Busca nas Abas ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtCore import QDate
+        from PyQt5.QtWidgets import QApplication
+        from ui.janela_principal import JanelaPrincipal
+        from ui.lista_produtos import ListaProdutos
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, teste ignorado: {e}")
+        return True
+
+    from apoio_testes import banco_temporario
+    from test_carregamento_vendas import popular_vendas
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with banco_temporario():
+        popular_vendas(500)
+        conexao = gerenciador_bd.conectar()
+        # Clientes que vêm antes na ordem alfabética: "Cliente 1x" fica fora da primeira página
+        conexao.executemany("INSERT INTO clientes (nome) VALUES (?)", [(f"Amanda {i}",) for i in range(300)])
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, 10, 25, 5)",
+            [(f"Pulseira Banhada {i}", "Semijoias") for i in range(5000)]
+        )
+        conexao.commit()
+
+        janela = JanelaPrincipal()
+
+        # Produtos (grade do marketplace): índice de texto do banco, sem acentos
+        esperado = sum(1 for i in range(5000) if str(i).startswith("12"))
+        janela.nav_list.setCurrentRow(1)
+        produtos = janela.lista_produtos
+        inicio = time.perf_counter()
+        produtos.campo_busca.setText("pulséira banhada 12")
+        assert produtos.busca.aguardar()
+        latencia = time.perf_counter() - inicio
+        assert produtos.modelo_cards.rowCount() == esperado
+        # Resultados na ordem de relevância do índice
+        assert produtos.modelo_cards.produto(0).nome == "Pulseira Banhada 12"
+        assert "resultado(s)" in janela.status_bar.currentMessage(), janela.status_bar.currentMessage()
+        print(f"✓ Produtos: {esperado} resultados em {latencia * 1000:.0f} ms "
+              f"— {janela.status_bar.currentMessage()}")
+
+        # Tabela de produtos: os IDs encontrados alimentam o proxy
+        tabela = ListaProdutos()
+        assert tabela.carregador.aguardar()
+        tabela.campo_busca.setText("pulseira 12")
+        assert tabela.busca.aguardar()
+        assert tabela.proxy_produtos.rowCount() == esperado
+        tabela.combo_categoria.setCurrentText("Relógios")
+        assert tabela.proxy_produtos.rowCount() == 0
+        tabela.deleteLater()
+
+        # Clientes: a busca é resolvida pelo índice de texto do banco, não pelas páginas carregadas
+        janela.nav_list.setCurrentRow(2)
+        clientes = janela.lista_clientes
+        assert clientes.carregador.aguardar()
+        assert all(c.nome.startswith("Amanda") for c in clientes.clientes)
+        clientes.campo_busca.setText("cliente 1")
+        assert clientes.busca.aguardar()
+        assert clientes.carregador.aguardar()
+        assert [c.nome for c in clientes.clientes] == ["Cliente 1"] + [f"Cliente {i}" for i in range(10, 20)]
+        assert clientes.tabela_clientes.rowCount() == 11
+        assert clientes.card_total.layout().itemAt(1).widget().text() == "350"
+        assert janela.status_bar.currentMessage().startswith('Busca "cliente 1": 11 resultado(s)')
+
+        # Vendas: a busca por cliente é resolvida pelo banco, depois da pausa na digitação
+        janela.nav_list.setCurrentRow(3)
+        vendas = janela.lista_vendas
+        assert vendas.carregador.aguardar()
+        vendas.date_inicio.setDate(QDate(2024, 1, 1))
+        assert vendas.busca.aguardar()
+        assert vendas.carregador.aguardar()
+        assert len(vendas.vendas) == 200
+        for termo in ("c", "cliente", "cliente 7"):
+            vendas.campo_busca.setText(termo)
+        assert vendas.busca.ocupado
+        assert vendas.busca.aguardar()
+        assert vendas.carregador.aguardar()
+        assert len(vendas.vendas) == 10 and all(v.cliente_nome == "Cliente 7" for v in vendas.vendas)
+        assert vendas.card_total.layout().itemAt(1).widget().text() == "10"
+        assert janela.status_bar.currentMessage().startswith('Busca "cliente 7": 10 resultado(s)')
+        print("✓ Clientes e vendas filtrados pela busca compartilhada")
+
+        janela.deleteLater()
+        app.processEvents()
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_busca_incremental,
+        test_busca_nas_listas,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Testes da busca por digitação concluídos!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para verificar que o carregamento de vendas executa
+um número constante de consultas, independentemente do volume de vendas.
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from database.db_manager import gerenciador_bd
+from apoio_testes import banco_temporario
+
+
+def popular_vendas(quantidade: int):
+    """Insere clientes, produtos e vendas com itens diretamente no banco."""
+    conexao = gerenciador_bd.conectar()
+    conexao.executemany(
+        "INSERT INTO clientes (nome, telefone) VALUES (?, ?)",
+        [(f"Cliente {i}", f"(31) 9{i:04d}-0000") for i in range(50)]
+    )
+    conexao.executemany(
+        "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, ?, ?, ?)",
+        [(f"Produto {i}", "Anéis", 10.0, 25.0, 100) for i in range(80)]
+    )
+    inicio = datetime(2024, 1, 1)
+    for i in range(quantidade):
+        status = "pendente" if i % 3 == 0 else "pago"
+        tipo = "Parcelado Boleto" if status == "pendente" else "PIX"
+        cursor = conexao.execute(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda) VALUES (?, ?, ?, ?, ?)",
+            ((i % 50) + 1, 75.0, tipo, status, (inicio + timedelta(hours=i)).isoformat())
+        )
+        venda_id = cursor.lastrowid
+        conexao.executemany(
+            "INSERT INTO itens_venda (venda_id, produto_id, quantidade, preco_unitario) VALUES (?, ?, ?, ?)",
+            [(venda_id, ((i + j) % 80) + 1, 1, 25.0) for j in range(3)]
+        )
+    conexao.commit()
+
+
+def contar_consultas(funcao):
+    """Executa a função e retorna (resultado, número de SELECTs, segundos)."""
+    consultas = []
+
+    def registrar(sql):
+        if sql.lstrip().upper().startswith("SELECT"):
+            consultas.append(sql)
+
+    gerenciador_bd.definir_rastreamento(registrar)
+    inicio = time.perf_counter()
+    try:
+        resultado = funcao()
+    finally:
+        gerenciador_bd.definir_rastreamento(None)
+    return resultado, len(consultas), time.perf_counter() - inicio
+
+
+def test_consultas_constantes_obter_todas():
+    """Verifica que Venda.obter_todas não executa consultas por venda."""
+    print("=== Testando Carregamento de Vendas em Lote ===")
+
+    from models.venda import Venda
+    from controllers.venda_controller import VendaController
+
+    medicoes = []
+    for volume in (50, 500):
+        with banco_temporario():
+            popular_vendas(volume)
+
+            vendas, n_consultas, segundos = contar_consultas(Venda.obter_todas)
+            assert len(vendas) == volume
+            assert all(len(v.itens) == 3 for v in vendas)
+            assert all(item.produto is not None for v in vendas for item in v.itens)
+            assert all(v.cliente is not None for v in vendas)
+            print(f"✓ obter_todas: {volume} vendas, {n_consultas} consultas, {segundos * 1000:.1f} ms")
+
+            pendentes, n_pendentes, _ = contar_consultas(Venda.obter_vendas_pendentes)
+            assert all(v.status == "pendente" for v in pendentes)
+            _, n_controller, _ = contar_consultas(VendaController.listar_vendas)
+            medicoes.append((n_consultas, n_pendentes, n_controller))
+
+    assert medicoes[0] == medicoes[1], f"Número de consultas cresceu com o volume: {medicoes}"
+    print(f"✓ Número de consultas constante entre volumes: {medicoes[0]}")
+    return True
+
+
+def test_obter_por_id_carrega_relacionamentos():
+    """Verifica que obter_por_id continua trazendo itens, produtos e cliente."""
+    print("=== Testando Venda.obter_por_id ===")
+
+    from models.venda import Venda
+
+    with banco_temporario():
+        popular_vendas(5)
+
+        venda = Venda.obter_por_id(2)
+        assert venda is not None and venda.id == 2
+        assert [item.produto.id for item in venda.itens] == [2, 3, 4]
+        assert venda.cliente is not None and venda.cliente.id == 2
+        assert Venda.obter_por_id(999) is None
+        assert len(Venda.obter_itens_venda(2)) == 3
+    print("✓ Venda carregada com itens, produtos e cliente")
+    return True
+
+
+def test_pagamentos_compartilham_venda():
+    """Verifica que os pagamentos de uma venda não recarregam a venda por pagamento."""
+    print("=== Testando Carregamento de Pagamentos ===")
+
+    from models.pagamento import Pagamento
+
+    with banco_temporario():
+        popular_vendas(30)
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO pagamentos (venda_id, valor) VALUES (?, ?)",
+            [(1, 5.0) for _ in range(10)] + [(venda_id, 5.0) for venda_id in range(2, 31)]
+        )
+        conexao.commit()
+
+        pagamentos, n_consultas, _ = contar_consultas(lambda: Pagamento.obter_por_venda(1))
+        assert len(pagamentos) == 10 and n_consultas == 1
+        vendas, n_lazy, _ = contar_consultas(lambda: [p.venda for p in pagamentos])
+        assert all(v is vendas[0] for v in vendas) and vendas[0].id == 1
+        print(f"✓ obter_por_venda: 1 consulta, venda carregada uma vez ({n_lazy} consultas)")
+
+        todos, n_todos, _ = contar_consultas(Pagamento.obter_todos)
+        _, n_acesso, _ = contar_consultas(lambda: [p.venda.cliente for p in todos])
+        assert len(todos) == 39 and n_acesso == 0
+        assert len({id(p.venda) for p in todos}) == 30
+        print(f"✓ obter_todos: {len(todos)} pagamentos em {n_todos} consultas")
+    return True
+
+
+def test_paginacao_por_chave():
+    """Verifica que as páginas percorrem todos os registros, sem repetir, a custo constante."""
+    print("=== Testando Paginação por Chave ===")
+
+    from models.venda import Venda
+    from controllers.venda_controller import VendaController
+    from controllers.cliente_controller import ClienteController
+    from controllers.consignacao_controller import ConsignacaoController
+
+    with banco_temporario():
+        popular_vendas(300)
+        conexao = gerenciador_bd.conectar()
+        # Vendas com a mesma data: o desempate é pelo ID
+        conexao.executemany(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda) VALUES (?, ?, ?, ?, ?)",
+            [(1, 10.0, "PIX", "pago", "2024-01-05T12:00:00") for _ in range(40)]
+        )
+        conexao.executemany(
+            "INSERT INTO clientes (nome) VALUES (?)", [("Cliente 1",) for _ in range(30)]
+        )
+        conexao.executemany(
+            "INSERT INTO consignacoes (cliente_id, data_envio, status) VALUES (?, ?, ?)",
+            [((i % 50) + 1, f"2024-02-{(i % 28) + 1:02d} 10:00:00", "Aberta") for i in range(120)]
+        )
+        conexao.commit()
+
+        def percorrer(listar_pagina, tamanho):
+            registros, consultas, apos_id = [], [], None
+            while True:
+                pagina, n_consultas, _ = contar_consultas(lambda: listar_pagina(tamanho, apos_id))
+                consultas.append(n_consultas)
+                registros.extend(pagina)
+                if len(pagina) < tamanho:
+                    return registros, consultas
+                apos_id = pagina[-1].id
+
+        todas = Venda.obter_todas()
+        vendas, consultas = percorrer(VendaController.listar_vendas_pagina, 37)
+        assert [v.id for v in vendas] == [v.id for v in todas]
+        assert all(len(v.itens) == len(t.itens) and v.cliente.id == t.cliente.id for v, t in zip(vendas, todas))
+        assert len(set(consultas)) == 1, consultas
+        print(f"✓ {len(vendas)} vendas em {len(consultas)} páginas, {consultas[0]} consultas por página")
+
+        clientes, _ = percorrer(ClienteController.listar_clientes_pagina, 16)
+        esperado = sorted(ClienteController.listar_clientes(), key=lambda c: (c.nome, c.id))
+        assert [c.id for c in clientes] == [c.id for c in esperado]
+        assert ClienteController.contar_clientes() == len(clientes) == 80
+
+        consignacoes, _ = percorrer(ConsignacaoController.listar_consignacoes_pagina, 25)
+        assert len({c.id for c in consignacoes}) == len(consignacoes) == 120
+        assert [(c.data_envio, c.id) for c in consignacoes] == sorted(
+            ((c.data_envio, c.id) for c in consignacoes), reverse=True)
+        print(f"✓ {len(clientes)} clientes e {len(consignacoes)} consignações paginados sem repetições")
+    return True
+
+
+def test_consulta_filtrada():
+    """Mede a consulta de vendas filtrada pelo banco e verifica os índices usados."""
+    print("=== Testando Consulta de Vendas Filtrada ===")
+
+    from datetime import date
+    from models.venda import Venda, FiltroVendas, LinhaVenda
+    from controllers.venda_controller import VendaController
+
+    with banco_temporario():
+        popular_vendas(20_000)
+
+        # Janeiro de 2024, pendentes, do "Cliente 7": uma página só com as colunas exibidas
+        filtro = FiltroVendas(data_inicio=date(2024, 1, 1), data_fim=date(2024, 1, 31),
+                              status="pendente", termo_cliente="cliente 7", limite=200)
+        linhas, _, segundos = contar_consultas(lambda: VendaController.consultar_vendas(filtro))
+        esperado = [
+            i + 1 for i in reversed(range(20_000))
+            if i % 3 == 0 and i % 50 == 7 and datetime(2024, 1, 1) + timedelta(hours=i) < datetime(2024, 2, 1)
+        ]
+        assert [l.id for l in linhas] == esperado, (len(linhas), len(esperado))
+        assert all(isinstance(l, LinhaVenda) for l in linhas)
+        assert linhas[0].cliente_nome == "Cliente 7" and linhas[0].data_venda.month == 1
+        print(f"✓ {len(linhas)} de 20000 vendas filtradas pelo banco em {segundos * 1000:.1f} ms")
+
+        # Sem filtros: páginas por chave cobrem o histórico sem repetições
+        filtro = FiltroVendas(limite=1000)
+        ids, inicio = [], time.perf_counter()
+        while True:
+            pagina = VendaController.consultar_vendas(filtro)
+            ids.extend(l.id for l in pagina)
+            if len(pagina) < filtro.limite:
+                break
+            filtro.apos_id = pagina[-1].id
+        assert ids == list(range(20_000, 0, -1))
+        print(f"✓ 20000 vendas em páginas de 1000: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+        # Totais de todo o filtro, não só da página
+        totais = VendaController.totais_vendas(FiltroVendas(status="pago", termo_cliente="cliente 7"))
+        assert list(totais) == ["pago"] and totais["pago"]["quantidade"] == sum(
+            1 for i in range(20_000) if i % 3 and i % 50 == 7)
+
+        # Período e status usam índices da tabela vendas, sem ordenação temporária
+        conexao = gerenciador_bd.conectar()
+        for status in ("", "pendente"):
+            filtro = FiltroVendas(data_inicio=date(2024, 3, 1), data_fim=date(2024, 3, 31), status=status)
+            condicoes, parametros = Venda._condicoes_filtro(filtro)
+            plano = " | ".join(row[3] for row in conexao.execute(
+                f"EXPLAIN QUERY PLAN SELECT v.id FROM vendas v WHERE {condicoes} "
+                f"ORDER BY v.data_venda DESC, v.id DESC LIMIT 200", parametros))
+            assert "INDEX idx_vendas_" in plano and "TEMP B-TREE" not in plano, plano
+        print(f"✓ Plano com índice e sem ordenação: {plano}")
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_consultas_constantes_obter_todas,
+        test_obter_por_id_carrega_relacionamentos,
+        test_pagamentos_compartilham_venda,
+        test_paginacao_por_chave,
+        test_consulta_filtrada,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Todos os testes de carregamento de vendas passaram!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,22 @@ Script de teste para verificar se o módulo de cobranças foi implementado corre
 """
 
 import sys
-import os
+import calendar
+import time
+from datetime import datetime, timedelta
+
+from database.db_manager import gerenciador_bd
+from apoio_testes import banco_temporario, caminho_temporario
+
+
+def vencimento_esperado(data_venda: datetime, dia_vencimento: int) -> datetime:
+    """Regra de vencimento de referência, calculada em Python."""
+    if not dia_vencimento:
+        return datetime.combine((data_venda + timedelta(days=30)).date(), datetime.min.time())
+    ano, mes = data_venda.year, data_venda.month
+    if data_venda.day > dia_vencimento:
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return datetime(ano, mes, min(dia_vencimento, calendar.monthrange(ano, mes)[1]))
 
 def test_modulo_cobrancas():
     """Testa se todos os componentes do módulo de cobranças podem ser importados corretamente."""
@@ -64,12 +79,241 @@ def test_integracao_main_window():
     print("Integração com janela principal está funcionando corretamente!\n")
     return True
 
+def test_calculo_dividas():
+    """Testa o cálculo agregado de dívidas pendentes (valores, vencimento e atraso)."""
+    print("=== Testando Cálculo de Dívidas Pendentes ===")
+
+    from controllers.pagamento_controller import PagamentoController
+
+    casos = [
+        (datetime(2024, 1, 31, 10, 30), 30),   # fevereiro bissexto: limitado ao dia 29
+        (datetime(2023, 1, 31, 10, 30), 31),   # fevereiro comum: limitado ao dia 28
+        (datetime(2024, 12, 20, 9, 0), 10),    # virada de ano
+        (datetime(2024, 3, 5, 18, 0), 15),     # mesmo mês
+        (datetime(2024, 4, 15, 8, 0), 15),     # vence no próprio dia da venda
+        (datetime(2024, 5, 10, 12, 0), None),  # sem dia: 30 dias após a venda
+    ]
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.execute("INSERT INTO clientes (nome, telefone) VALUES ('Maria', '(31) 99999-0000')")
+        for data_venda, dia in casos:
+            conexao.execute(
+                "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda, dia_vencimento) "
+                "VALUES (1, 100.0, 'Parcelado Boleto', 'pendente', ?, ?)",
+                (data_venda.isoformat(), dia)
+            )
+        # Vendas que não são dívidas em aberto
+        conexao.execute("INSERT INTO vendas (valor_total, tipo_pagamento, status) VALUES (50.0, 'PIX', 'pago')")
+        conexao.execute("INSERT INTO pagamentos (venda_id, valor) VALUES (1, 30.0)")
+        conexao.execute("INSERT INTO pagamentos (venda_id, valor) VALUES (1, 20.0)")
+        conexao.commit()
+
+        dividas = PagamentoController.obter_dividas_pendentes()
+        assert len(dividas) == len(casos)
+        hoje = datetime.now().date()
+        for divida in dividas:
+            data_venda, dia = casos[divida['venda'].id - 1]
+            esperado = vencimento_esperado(data_venda, dia)
+            assert divida['data_vencimento'] == esperado, (divida['venda'].id, divida['data_vencimento'], esperado)
+            assert divida['dias_atraso'] == max(0, (hoje - esperado.date()).days)
+            assert divida['cliente'].nome == 'Maria'
+        print("✓ Datas de vencimento e dias de atraso calculados corretamente")
+
+        primeira = next(d for d in dividas if d['venda'].id == 1)
+        assert primeira['valor_pago'] == 50.0 and primeira['valor_pendente'] == 50.0
+        assert len(primeira['pagamentos']) == 2
+        assert all(p.venda is primeira['venda'] for p in primeira['pagamentos'])
+
+        totais = PagamentoController.calcular_totais_dividas()
+        assert totais == {
+            'total_dividas': 600.0,
+            'total_pago': 50.0,
+            'total_pendente': 550.0,
+            'numero_clientes_devendo': 1
+        }
+        print("✓ Totais das dívidas calculados corretamente")
+    return True
+
+
+def test_desempenho_dividas():
+    """Mede o carregamento de dívidas com muitas parcelas em aberto."""
+    print("=== Medindo Desempenho de Dívidas (50.000 parcelas) ===")
+
+    from controllers.pagamento_controller import PagamentoController
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO clientes (nome) VALUES (?)", [(f"Cliente {i}",) for i in range(500)]
+        )
+        inicio = datetime(2024, 1, 1)
+        conexao.executemany(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda, dia_vencimento) "
+            "VALUES (?, 100.0, 'Parcelado Promissória', 'pendente', ?, ?)",
+            [((i % 500) + 1, (inicio + timedelta(minutes=i)).isoformat(), (i % 28) + 1) for i in range(50000)]
+        )
+        conexao.executemany(
+            "INSERT INTO pagamentos (venda_id, valor) VALUES (?, 10.0)", [(i,) for i in range(1, 50001, 2)]
+        )
+        conexao.commit()
+
+        consultas = []
+        gerenciador_bd.definir_rastreamento(consultas.append)
+        t0 = time.perf_counter()
+        totais = PagamentoController.calcular_totais_dividas()
+        t_totais = time.perf_counter() - t0
+        n_totais = len(consultas)
+
+        t0 = time.perf_counter()
+        dividas = PagamentoController.obter_dividas_pendentes(incluir_pagamentos=False)
+        t_dividas = time.perf_counter() - t0
+        gerenciador_bd.definir_rastreamento(None)
+
+        assert len(dividas) == 50000
+        assert totais['total_pago'] == 250000.0
+        assert n_totais == 1 and len(consultas) == 2
+        print(f"✓ calcular_totais_dividas: 1 consulta, {t_totais * 1000:.1f} ms")
+        print(f"✓ obter_dividas_pendentes: 1 consulta, {t_dividas * 1000:.1f} ms")
+    return True
+
+
+def test_quitacao_em_massa_atomica():
+    """Testa que uma venda inválida na quitação em massa desfaz todos os pagamentos."""
+    print("=== Testando Quitação em Massa ===")
+
+    from controllers.pagamento_controller import PagamentoController
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO vendas (valor_total, tipo_pagamento, status) VALUES (?, ?, ?)",
+            [(10.0, 'Parcelado Boleto', 'pendente'), (10.0, 'Dinheiro', 'pago')]
+        )
+        conexao.commit()
+
+        def estado():
+            return (gerenciador_bd.buscar_um("SELECT COUNT(*) FROM pagamentos")[0],
+                    [row[0] for row in gerenciador_bd.buscar_todos("SELECT status FROM vendas ORDER BY id")])
+
+        antes = estado()
+        for valores in ({1: 10.0, 2: 10.0}, {1: 10.0, 999: 5.0}):
+            try:
+                PagamentoController.quitar_vendas(valores)
+                assert False, "A quitação com venda inválida deveria falhar"
+            except ValueError:
+                pass
+            assert estado() == antes, estado()
+        assert not conexao.in_transaction
+        print("✓ Venda inválida na quitação em massa desfaz todos os pagamentos")
+
+        assert PagamentoController.quitar_vendas({1: 10.0}) == 1
+        assert estado() == (1, ['pago', 'pago'])
+        # Fora de uma transação o erro continua sendo informado com None
+        assert PagamentoController.registrar_pagamento(999, 5.0) is None
+        print("✓ Quitação válida registrada")
+    return True
+
+
+def test_saldos_das_vendas():
+    """Testa o valor pago e o saldo mantidos na venda a cada pagamento, e o recálculo."""
+    print("=== Testando Saldos das Vendas ===")
+
+    import sqlite3
+    from controllers.pagamento_controller import PagamentoController
+    from database import migracoes
+    from models.venda import Venda
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.execute("INSERT INTO clientes (nome) VALUES ('Maria')")
+        conexao.execute(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status) "
+            "VALUES (1, 100.0, 'Parcelado Boleto', 'pendente')"
+        )
+        conexao.commit()
+
+        def linha():
+            return tuple(gerenciador_bd.buscar_um("SELECT valor_pago, saldo, status FROM vendas WHERE id = 1"))
+
+        # 40 + 30 não quitam a venda de 100 (o pagamento novo não é somado duas vezes)
+        primeiro = PagamentoController.registrar_pagamento(1, 40.0)
+        PagamentoController.registrar_pagamento(1, 30.0)
+        assert linha() == (70.0, 30.0, 'pendente'), linha()
+        assert PagamentoController.obter_dividas_pendentes()[0]['valor_pendente'] == 30.0
+
+        # Alterar ou excluir um pagamento atualiza a venda na mesma instrução
+        primeiro.valor = 50.0
+        assert primeiro.salvar()
+        assert linha() == (80.0, 20.0, 'pendente'), linha()
+        assert primeiro.excluir()
+        assert linha() == (30.0, 70.0, 'pendente'), linha()
+
+        ultimo = PagamentoController.registrar_pagamento(1, 70.0)
+        assert linha() == (100.0, 0.0, 'pago'), linha()
+        venda = Venda.obter_por_id(1)
+        assert venda.valor_pago == 100.0 and venda.saldo == 0.0
+        print("✓ Valor pago e saldo acompanham inclusão, alteração e exclusão de pagamentos")
+
+        # Reduzir ou excluir um pagamento de uma venda quitada a reabre
+        ultimo.valor = 60.0
+        assert ultimo.salvar()
+        assert linha() == (90.0, 10.0, 'pendente'), linha()
+        ultimo.valor = 70.0
+        assert ultimo.salvar()
+        assert linha() == (100.0, 0.0, 'pago'), linha()
+        assert ultimo.excluir()
+        assert linha() == (30.0, 70.0, 'pendente'), linha()
+        assert Venda.obter_por_id(1).saldo == 70.0
+        PagamentoController.registrar_pagamento(1, 70.0)
+
+        # Venda à vista: paga sem pagamentos registrados, sem saldo
+        conexao.execute("INSERT INTO vendas (valor_total, tipo_pagamento, status) VALUES (10.0, 'Dinheiro', 'pago')")
+        conexao.commit()
+        assert tuple(gerenciador_bd.buscar_um("SELECT valor_pago, saldo, status FROM vendas WHERE id = 2")) == (
+            0.0, 0.0, 'pago')
+        assert Venda.obter_por_id(2).saldo == 0.0
+        print("✓ Status recalculado ao alterar ou excluir pagamentos; venda à vista sem saldo")
+
+        # Valor alterado por fora dos triggers: o recálculo corrige só a venda afetada
+        conexao.execute("UPDATE vendas SET valor_pago = 0 WHERE id = 1")
+        conexao.commit()
+        assert PagamentoController.recalcular_saldos() == 1
+        assert linha() == (100.0, 0.0, 'pago'), linha()
+        assert PagamentoController.recalcular_saldos() == 0
+        print("✓ Recálculo dos saldos a partir dos pagamentos")
+
+    # Banco anterior à coluna: o valor pago é calculado na migração
+    caminho = caminho_temporario()
+    anterior = sqlite3.connect(caminho)
+    versao_anterior = migracoes.MIGRACOES.index(migracoes._migracao_valor_pago_vendas)
+    for migracao in migracoes.MIGRACOES[:versao_anterior]:
+        migracao(anterior.cursor())
+    anterior.execute(f"PRAGMA user_version = {versao_anterior}")
+    anterior.executemany(
+        "INSERT INTO vendas (valor_total, tipo_pagamento, status) VALUES (?, 'Parcelado Boleto', 'pendente')",
+        [(100.0,), (60.0,)]
+    )
+    anterior.executemany("INSERT INTO pagamentos (venda_id, valor) VALUES (1, ?)", [(25.0,), (15.0,)])
+    anterior.commit()
+    anterior.close()
+    with banco_temporario(caminho):
+        saldos = [tuple(row) for row in gerenciador_bd.buscar_todos("SELECT valor_pago, saldo FROM vendas ORDER BY id")]
+        assert saldos == [(40.0, 60.0), (0.0, 60.0)], saldos
+        print("✓ Migração calcula o valor pago das vendas existentes")
+    return True
+
+
 if __name__ == "__main__":
     print("Testando módulo de cobranças...\n")
     
     sucesso = True
     sucesso &= test_modulo_cobrancas()
     sucesso &= test_integracao_main_window()
+    sucesso &= test_calculo_dividas()
+    sucesso &= test_desempenho_dividas()
+    sucesso &= test_quitacao_em_massa_atomica()
+    sucesso &= test_saldos_das_vendas()
     
     if sucesso:
         print("✅ Todos os testes passaram! O módulo de cobranças está pronto para uso.")
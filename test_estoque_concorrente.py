@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para a baixa de estoque das vendas e consignações:
+verifica que uma venda ou consignação sem saldo é recusada por inteiro e que
+vários processos vendendo o mesmo produto ao mesmo tempo nunca vendem mais
+peças do que havia em estoque.
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+
+from database.db_manager import gerenciador_bd
+from apoio_testes import banco_temporario
+
+PROCESSOS = 4
+TENTATIVAS_POR_PROCESSO = 40
+ESTOQUE_INICIAL = 100
+
+
+def preparar_banco():
+    """Popula o banco com um produto disputado, um produto folgado e um cliente."""
+    gerenciador_bd.executar_consulta(
+        "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, ?, ?, ?)",
+        ("Anel Disputado", "Anéis", 10.0, 25.0, ESTOQUE_INICIAL)
+    )
+    gerenciador_bd.executar_consulta(
+        "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, ?, ?, ?)",
+        ("Brinco Folgado", "Brincos", 5.0, 15.0, 10_000)
+    )
+    gerenciador_bd.executar_consulta("INSERT INTO clientes (nome) VALUES ('Balcão')")
+
+
+def vender_repetidamente(caminho: str, inicio, resultados):
+    """Processo de caixa: tenta vender o produto disputado várias vezes."""
+    from controllers.venda_controller import VendaController
+    from models.produto import EstoqueInsuficiente
+
+    gerenciador_bd.caminho_banco = caminho
+    itens = [
+        {'produto_id': 1, 'quantidade': 1, 'preco_unitario': 25.0},
+        {'produto_id': 2, 'quantidade': 1, 'preco_unitario': 15.0},
+    ]
+    vendidas = recusadas = erros = 0
+    inicio.wait()
+    for _ in range(TENTATIVAS_POR_PROCESSO):
+        try:
+            if VendaController.criar_venda(1, itens, "PIX") is None:
+                erros += 1
+            else:
+                vendidas += 1
+        except EstoqueInsuficiente:
+            recusadas += 1
+    gerenciador_bd.desconectar()
+    resultados.put((vendidas, recusadas, erros))
+
+
+def test_venda_sem_estoque_recusada():
+    """Verifica que a falta de um produto recusa a venda inteira."""
+    print("=== Testando Baixa de Estoque Condicional ===")
+
+    from controllers.venda_controller import VendaController
+    from models.produto import Produto, EstoqueInsuficiente
+
+    with banco_temporario():
+        preparar_banco()
+        gerenciador_bd.executar_consulta("UPDATE produtos SET quantidade = 2 WHERE id = 1")
+        vendas_antes = gerenciador_bd.buscar_um("SELECT COUNT(*) FROM vendas")[0]
+
+        # O produto 1 aparece em duas linhas: 3 peças pedidas, 2 disponíveis
+        itens = [
+            {'produto_id': 2, 'quantidade': 5, 'preco_unitario': 15.0},
+            {'produto_id': 1, 'quantidade': 2, 'preco_unitario': 25.0},
+            {'produto_id': 1, 'quantidade': 1, 'preco_unitario': 25.0},
+        ]
+        try:
+            VendaController.criar_venda(1, itens, "PIX")
+            assert False, "A venda sem estoque deveria ser recusada"
+        except EstoqueInsuficiente as e:
+            assert e.faltas == {1: ("Anel Disputado", 3, 2)}, e.faltas
+            assert "Anel Disputado" in str(e)
+        assert Produto.obter_por_id(1).quantidade == 2
+        assert Produto.obter_por_id(2).quantidade == 10_000
+        assert gerenciador_bd.buscar_um("SELECT COUNT(*) FROM vendas")[0] == vendas_antes
+        assert not gerenciador_bd.conectar().in_transaction
+        print("✓ Venda com falta de estoque recusada sem baixar os demais produtos")
+
+        venda = VendaController.criar_venda(1, itens[:2], "PIX")
+        assert venda is not None and Produto.obter_por_id(1).quantidade == 0
+        print("✓ Venda da última peça aceita")
+    return True
+
+
+def test_consignacao_sem_estoque_recusada():
+    """Uma consignação que disputa as últimas peças com uma venda não deixa o estoque negativo."""
+    print("=== Testando Consignação Concorrente com Venda ===")
+
+    from controllers.venda_controller import VendaController
+    from controllers.consignacao_controller import ConsignacaoController
+    from models.produto import Produto, EstoqueInsuficiente
+
+    with banco_temporario():
+        preparar_banco()
+        gerenciador_bd.executar_consulta("UPDATE produtos SET quantidade = 2 WHERE id = 1")
+        itens = [
+            {'produto_id': 2, 'qtd': 4, 'preco': 15.0, 'comissao': 30.0},
+            {'produto_id': 1, 'qtd': 2, 'preco': 25.0, 'comissao': 30.0},
+        ]
+
+        # A consignação começa enquanto a venda das mesmas peças ainda não foi confirmada
+        recusas = []
+
+        def consignar():
+            try:
+                ConsignacaoController.criar_consignacao(1, itens)
+            except EstoqueInsuficiente as e:
+                recusas.append(e.faltas)
+
+        concorrente = threading.Thread(target=consignar)
+        with gerenciador_bd.transacao():
+            concorrente.start()
+            time.sleep(0.2)
+            VendaController.criar_venda(1, [{'produto_id': 1, 'quantidade': 2, 'preco_unitario': 25.0}], "PIX")
+        concorrente.join()
+
+        assert recusas == [{1: ("Anel Disputado", 2, 0)}], recusas
+        assert Produto.obter_por_id(1).quantidade == 0
+        assert Produto.obter_por_id(2).quantidade == 10_000
+        assert gerenciador_bd.buscar_um("SELECT COUNT(*) FROM consignacoes")[0] == 0
+        print("✓ Consignação sem estoque recusada sem baixar os demais produtos")
+    return True
+
+
+def test_vendas_concorrentes_sem_vender_a_mais():
+    """Vários processos disputam o mesmo produto; o estoque nunca fica negativo."""
+    print("=== Testando Vendas Concorrentes do Mesmo Produto ===")
+
+    with banco_temporario() as caminho:
+        preparar_banco()
+        gerenciador_bd.desconectar()
+
+        contexto = multiprocessing.get_context("spawn")
+        inicio = contexto.Event()
+        resultados = contexto.Queue()
+        processos = [
+            contexto.Process(target=vender_repetidamente, args=(caminho, inicio, resultados))
+            for _ in range(PROCESSOS)
+        ]
+        for processo in processos:
+            processo.start()
+        cronometro = time.perf_counter()
+        inicio.set()
+        totais = [resultados.get(timeout=120) for _ in processos]
+        for processo in processos:
+            processo.join(timeout=30)
+        segundos = time.perf_counter() - cronometro
+
+        vendidas = sum(t[0] for t in totais)
+        recusadas = sum(t[1] for t in totais)
+        erros = sum(t[2] for t in totais)
+        assert erros == 0, totais
+        assert vendidas == ESTOQUE_INICIAL, totais
+        assert recusadas == PROCESSOS * TENTATIVAS_POR_PROCESSO - ESTOQUE_INICIAL, totais
+
+        assert gerenciador_bd.buscar_um("SELECT quantidade FROM produtos WHERE id = 1")[0] == 0
+        assert gerenciador_bd.buscar_um("SELECT quantidade FROM produtos WHERE id = 2")[0] == 10_000 - vendidas
+        assert gerenciador_bd.buscar_um(
+            "SELECT COALESCE(SUM(quantidade), 0) FROM itens_venda WHERE produto_id = 1")[0] == ESTOQUE_INICIAL
+        assert gerenciador_bd.buscar_um("SELECT COUNT(*) FROM vendas")[0] == vendidas
+        print(f"✓ {PROCESSOS} processos, {PROCESSOS * TENTATIVAS_POR_PROCESSO} tentativas em {segundos:.2f} s: "
+              f"{vendidas} vendidas, {recusadas} recusadas, estoque final 0")
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_venda_sem_estoque_recusada,
+        test_consignacao_sem_estoque_recusada,
+        test_vendas_concorrentes_sem_vender_a_mais,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Testes de baixa de estoque concluídos!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para a inicialização da janela principal: verifica
+que as páginas são criadas apenas na primeira navegação e que o tempo de
+abertura não depende do volume de dados.
+"""
+
+import os
+import sys
+import time
+
+from database.db_manager import gerenciador_bd
+from apoio_testes import banco_temporario
+from test_carregamento_vendas import popular_vendas
+
+
+def abrir_janela():
+    """Cria a janela principal e retorna (janela, consultas executadas, segundos)."""
+    from ui.janela_principal import JanelaPrincipal
+
+    consultas = []
+    gerenciador_bd.definir_rastreamento(
+        lambda sql: consultas.append(sql) if sql.lstrip().upper().startswith("SELECT") else None
+    )
+    inicio = time.perf_counter()
+    try:
+        janela = JanelaPrincipal()
+    finally:
+        gerenciador_bd.definir_rastreamento(None)
+    return janela, consultas, time.perf_counter() - inicio
+
+
+def test_inicializacao_independente_do_volume():
+    """Mede a abertura da janela com poucos e muitos registros."""
+    print("=== Testando Inicialização da Janela Principal ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtCore import QDate
+        from PyQt5.QtWidgets import QApplication
+        from ui.carregamento import TAMANHO_PAGINA
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, benchmark ignorado: {e}")
+        return True
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    medicoes = []
+    for volume in (50, 5000):
+        with banco_temporario():
+            popular_vendas(volume)
+
+            janela, consultas, segundos = abrir_janela()
+            assert janela.paginas_criadas == {0}, janela.paginas_criadas
+            assert not hasattr(janela, "lista_vendas")
+            medicoes.append(len(consultas))
+            print(f"✓ {volume} vendas: janela aberta em {segundos * 1000:.0f} ms com {len(consultas)} consultas")
+
+            # A página de vendas é criada e carregada na primeira navegação
+            janela.nav_list.setCurrentRow(3)
+            assert janela.stacked_widget.currentWidget() is janela.lista_vendas
+            assert janela.lista_vendas.carregador.aguardar()
+            # Apenas a primeira página do período é buscada
+            janela.lista_vendas.date_inicio.setDate(QDate(2024, 1, 1))
+            assert janela.lista_vendas.carregador.aguardar()
+            assert len(janela.lista_vendas.vendas) == min(volume, TAMANHO_PAGINA)
+            janela.nav_list.setCurrentRow(0)
+            janela.nav_list.setCurrentRow(3)
+            assert janela.paginas_criadas == {0, 3}
+            assert janela.stacked_widget.count() == len(janela.fabricas_paginas)
+
+            # Todas as páginas podem ser criadas sob demanda
+            for linha in range(janela.nav_list.count()):
+                janela.nav_list.setCurrentRow(linha)
+                pagina = janela.stacked_widget.currentWidget()
+                carregador = getattr(pagina, "carregador", None)
+                assert carregador is None or carregador.aguardar()
+            assert len(janela.paginas_criadas) == janela.stacked_widget.count()
+
+            janela.deleteLater()
+            app.processEvents()
+
+    assert medicoes[0] == medicoes[1] == 0, f"Abertura consultou o banco: {medicoes}"
+    print("✓ Nenhuma consulta ao banco na abertura, independentemente do volume")
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    try:
+        test_inicializacao_independente_do_volume()
+    except AssertionError as e:
+        print(f"✗ Teste de inicialização falhou: {e}")
+        return 1
+    print("\n🎉 Teste de inicialização concluído!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para o modelo da tabela de produtos (ListaProdutos):
+mede a latência do filtro por tecla digitada com 10 mil e 100 mil produtos.
+"""
+
+import sys
+import time
+
+from models.produto import Produto
+
+CATEGORIAS = ["Semijoias", "Relógios", "Acessórios", "Outros"]
+
+
+def gerar_produtos(quantidade: int) -> list:
+    """Gera produtos em memória, sem banco de dados."""
+    return [
+        Produto(id=i, nome=f"Anel Banhado {i}", categoria=CATEGORIAS[i % 4],
+                preco_custo=10.0, preco_venda=25.0, quantidade=i % 20)
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def test_filtro_modelo_produtos():
+    """Mede o tempo de filtragem do proxy a cada tecla digitada na busca."""
+    print("=== Testando Filtro da Tabela de Produtos ===")
+
+    try:
+        from PyQt5.QtCore import Qt
+        from ui.lista_produtos import ModeloTabelaProdutos, FiltroProdutosProxy
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, benchmark ignorado: {e}")
+        return True
+
+    for volume in (10_000, 100_000):
+        produtos = gerar_produtos(volume)
+        modelo = ModeloTabelaProdutos()
+        proxy = FiltroProdutosProxy()
+        proxy.setSourceModel(modelo)
+
+        inicio = time.perf_counter()
+        modelo.definir_produtos(produtos)
+        t_carga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        proxy.sort(4, Qt.DescendingOrder)
+        proxy.sort(1, Qt.AscendingOrder)
+        t_ordenacao = (time.perf_counter() - inicio) / 2
+
+        tempos = []
+        for termo in ("1", "12", "123", "1234", "123", ""):
+            inicio = time.perf_counter()
+            proxy.definir_filtro(termo, "Relógios")
+            linhas = proxy.rowCount()
+            tempos.append(time.perf_counter() - inicio)
+            esperado = [p for p in produtos if p.categoria == "Relógios" and termo in p.nome.lower()]
+            assert linhas == len(esperado), (termo, linhas, len(esperado))
+
+        nomes = [proxy.data(proxy.index(linha, 1)) for linha in range(50)]
+        assert nomes == sorted(nomes, key=str.casefold)
+
+        # Apenas as linhas visíveis são formatadas pela view
+        for linha in range(min(20, proxy.rowCount())):
+            for coluna in range(modelo.columnCount()):
+                proxy.data(proxy.index(linha, coluna))
+
+        print(f"✓ {volume} produtos: carga {t_carga * 1000:.1f} ms, ordenação {t_ordenacao * 1000:.1f} ms, "
+              f"filtro por tecla máx {max(tempos) * 1000:.1f} ms")
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    if test_filtro_modelo_produtos():
+        print("\n🎉 Teste da tabela de produtos concluído!")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
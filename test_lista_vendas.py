@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para as tabelas de vendas e clientes: verifica que
+status e ações são desenhados por delegates, mantendo o número de widgets
+constante com 20 mil vendas.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database.db_manager import gerenciador_bd
+from models.cliente import Cliente
+from models.venda import LinhaVenda
+
+
+def gerar_vendas(quantidade: int) -> list:
+    """Gera linhas da tabela de vendas em memória, sem banco de dados."""
+    inicio = datetime.now()
+    return [
+        LinhaVenda(i, inicio - timedelta(minutes=i), f"Cliente {i % 50 + 1}", 75.0, "PIX",
+                   "pendente" if i % 3 == 0 else "pago")
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def test_tabela_vendas_sem_widgets_por_linha():
+    """Mede o preenchimento da tabela e conta os widgets criados."""
+    print("=== Testando Tabela de Vendas com Delegates ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtCore import QPoint
+        from PyQt5.QtWidgets import QApplication, QWidget
+        from ui.lista_vendas import ListaVendas
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, benchmark ignorado: {e}")
+        return True
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    lista = ListaVendas()
+    assert lista.carregador.aguardar()
+    tabela = lista.tabela_vendas
+
+    lista.vendas_filtradas = gerar_vendas(100)
+    lista.atualizar_tabela()
+    widgets_base = len(tabela.findChildren(QWidget))
+
+    lista.vendas_filtradas = gerar_vendas(20_000)
+    inicio = time.perf_counter()
+    lista.atualizar_tabela()
+    segundos = time.perf_counter() - inicio
+
+    widgets = len(tabela.findChildren(QWidget))
+    assert widgets == widgets_base, (widgets_base, widgets)
+    assert tabela.cellWidget(0, 5) is None and tabela.cellWidget(0, 6) is None
+    print(f"✓ 20000 vendas em {segundos * 1000:.0f} ms com {widgets} widgets (igual a 100 vendas)")
+
+    # Pinta a área visível (badges e botões desenhados pelos delegates)
+    lista.resize(1200, 800)
+    inicio = time.perf_counter()
+    tabela.viewport().grab()
+    print(f"✓ Pintura da área visível em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    # Editar só aparece para vendas pendentes (id múltiplo de 3)
+    delegate = lista.delegate_acoes
+    pendente = tabela.model().index(2, 6)
+    paga = tabela.model().index(0, 6)
+    assert tabela.item(2, 5).text() == "Pendente" and tabela.item(0, 5).text() == "Pago"
+    assert [a[0] for a in delegate.acoes_visiveis(pendente)] == ["visualizar", "editar", "excluir", "mais"]
+    assert [a[0] for a in delegate.acoes_visiveis(paga)] == ["visualizar", "excluir", "mais"]
+
+    # O segundo botão é "editar" na pendente e "excluir" na paga
+    area = tabela.visualRect(paga)
+    segundo = delegate.retangulos_botoes(area, 2)[1].center()
+    assert delegate.acao_na_posicao(area, segundo, pendente)[0] == "editar"
+    assert delegate.acao_na_posicao(area, segundo, paga)[0] == "excluir"
+    assert delegate.acao_na_posicao(area, QPoint(area.left() + 1, area.top() + 1), paga) is None
+
+    acionadas = []
+    lista.executar_acao_venda = lambda acao, index: acionadas.append((acao, index.row()))
+    delegate.acao_acionada.disconnect()
+    delegate.acao_acionada.connect(lista.executar_acao_venda)
+    delegate.acao_acionada.emit("mais", paga)
+    assert acionadas == [("mais", 0)]
+    print("✓ Botões por linha e identificação do clique pela posição")
+
+    lista.deleteLater()
+    app.processEvents()
+    return True
+
+
+def test_tabela_clientes_sem_widgets_por_linha():
+    """Verifica que a tabela de clientes não cria widgets por linha."""
+    print("=== Testando Tabela de Clientes com Delegates ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication, QWidget
+        from ui.lista_clientes import ListaClientes
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, teste ignorado: {e}")
+        return True
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    lista = ListaClientes()
+    tabela = lista.tabela_clientes
+    widgets_base = len(tabela.findChildren(QWidget))
+
+    lista.clientes = [Cliente(id=i, nome=f"Cliente {i}") for i in range(1, 5001)]
+    lista.atualizar_tabela()
+    assert len(tabela.findChildren(QWidget)) == widgets_base
+    assert tabela.item(0, 4).text() == "Ativo" and tabela.cellWidget(0, 5) is None
+    print(f"✓ 5000 clientes com {widgets_base} widgets na tabela")
+
+    lista.deleteLater()
+    app.processEvents()
+    return True
+
+
+def test_carregamento_em_segundo_plano():
+    """Verifica que o carregamento não bloqueia a interface e descarta resultados antigos."""
+    print("=== Testando Carregamento em Segundo Plano ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtCore import QDate
+        from PyQt5.QtWidgets import QApplication
+        from ui.carregamento import CarregadorDados, IndicadorCarregamento, TAMANHO_PAGINA
+        from ui.lista_vendas import ListaVendas
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, teste ignorado: {e}")
+        return True
+
+    from apoio_testes import banco_temporario
+    from test_carregamento_vendas import popular_vendas
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    indicador = IndicadorCarregamento()
+    carregador = CarregadorDados(indicador=indicador)
+    resultados, erros = [], []
+
+    def lenta(valor):
+        time.sleep(0.3)
+        return valor
+
+    inicio = time.perf_counter()
+    carregador.carregar(lambda: lenta("antigo"), resultados.append)
+    carregador.carregar(lambda: lenta("novo"), resultados.append)
+    agendamento = time.perf_counter() - inicio
+    assert agendamento < 0.1, agendamento
+    assert carregador.ocupado and not indicador.isHidden()
+
+    assert carregador.aguardar()
+    app.processEvents()
+    assert resultados == ["novo"], resultados
+    assert indicador.isHidden()
+    print(f"✓ Agendamento em {agendamento * 1000:.1f} ms; apenas o carregamento mais recente aplicado")
+
+    def falha():
+        raise RuntimeError("banco indisponível")
+
+    carregador.carregar(falha, resultados.append, erros.append)
+    assert carregador.aguardar()
+    assert erros == ["banco indisponível"] and resultados == ["novo"]
+
+    carregador.carregar(lambda: lenta("cancelado"), resultados.append)
+    carregador.cancelar()
+    carregador.pool.waitForDone()
+    app.processEvents()
+    assert resultados == ["novo"] and not carregador.ocupado
+    print("✓ Falhas reportadas e carregamentos cancelados descartados")
+
+    with banco_temporario():
+        popular_vendas(2000)
+        inicio = time.perf_counter()
+        lista = ListaVendas()
+        construcao = time.perf_counter() - inicio
+        assert lista.vendas == [] and lista.carregador.ocupado
+        assert lista.carregador.aguardar()
+        # As vendas geradas são de 2024, fora do período padrão da tela
+        assert lista.vendas == []
+        inicio = time.perf_counter()
+        lista.date_inicio.setDate(QDate(2024, 1, 1))
+        assert lista.carregador.aguardar()
+        carga = time.perf_counter() - inicio
+        assert len(lista.vendas) == TAMANHO_PAGINA
+        lista.deleteLater()
+        app.processEvents()
+    print(f"✓ ListaVendas construída em {construcao * 1000:.0f} ms; primeira página em {carga * 1000:.0f} ms")
+    return True
+
+
+def test_rolagem_infinita_vendas():
+    """Verifica que as vendas são buscadas por página conforme a rolagem, até cobrir o período."""
+    print("=== Testando Rolagem Infinita de Vendas ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from ui.carregamento import TAMANHO_PAGINA
+        from ui.lista_vendas import ListaVendas
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, teste ignorado: {e}")
+        return True
+
+    from apoio_testes import banco_temporario
+    from controllers.venda_controller import VendaController
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with banco_temporario():
+        # Uma venda por hora; o filtro padrão da tela cobre os últimos 30 dias
+        agora = datetime.now()
+        conexao = gerenciador_bd.conectar()
+        conexao.execute("INSERT INTO clientes (nome) VALUES ('Cliente 1')")
+        conexao.executemany(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda) VALUES (?, ?, ?, ?, ?)",
+            [(1, 10.0, "PIX", "pago", (agora - timedelta(hours=i)).isoformat()) for i in range(2000)]
+        )
+        conexao.commit()
+
+        # Os totais dos cards são somados fora da thread da interface
+        threads_totais = []
+        totais_vendas = VendaController.totais_vendas
+
+        def totais_registrando_thread(filtro):
+            threads_totais.append(threading.current_thread())
+            return totais_vendas(filtro)
+
+        VendaController.totais_vendas = staticmethod(totais_registrando_thread)
+        try:
+            lista = ListaVendas()
+            lista.resize(1200, 800)
+            lista.show()
+            assert lista.carregador.aguardar() and lista.carregador_resumo.aguardar()
+            app.processEvents()
+        finally:
+            VendaController.totais_vendas = staticmethod(totais_vendas)
+        assert threads_totais and threading.main_thread() not in threads_totais, threads_totais
+        assert len(lista.vendas) == TAMANHO_PAGINA, len(lista.vendas)
+
+        data_inicio = lista.date_inicio.date().toPyDate()
+        no_periodo = sum(1 for i in range(2000) if (agora - timedelta(hours=i)).date() >= data_inicio)
+        assert lista.card_total.layout().itemAt(1).widget().text() == str(no_periodo)
+
+        barra = lista.tabela_vendas.verticalScrollBar()
+        primeira_linha = lista.tabela_vendas.item(0, 0)
+        paginas = 1
+        while True:
+            carregadas = len(lista.vendas)
+            barra.setValue(barra.maximum())
+            assert lista.carregador.aguardar()
+            app.processEvents()
+            if len(lista.vendas) == carregadas:
+                break
+            paginas += 1
+
+        # O banco só devolve vendas do período: a rolagem para ao fim do filtro
+        assert len(lista.vendas) == no_periodo, (len(lista.vendas), no_periodo)
+        assert paginas == -(-no_periodo // TAMANHO_PAGINA)
+        assert len({v.id for v in lista.vendas}) == len(lista.vendas)
+        # Cada página só acrescenta as próprias linhas: as já exibidas não são recriadas
+        assert lista.tabela_vendas.rowCount() == no_periodo
+        assert lista.tabela_vendas.item(0, 0) is primeira_linha
+        assert lista.tabela_vendas.item(no_periodo - 1, 0).text() == str(lista.vendas[-1].id)
+        print(f"✓ {paginas} páginas buscadas pela rolagem: {len(lista.vendas)} de 2000 vendas carregadas "
+              f"para {no_periodo} no período")
+
+        lista.deleteLater()
+        app.processEvents()
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_tabela_vendas_sem_widgets_por_linha,
+        test_tabela_clientes_sem_widgets_por_linha,
+        test_carregamento_em_segundo_plano,
+        test_rolagem_infinita_vendas,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Testes das tabelas de vendas e clientes concluídos!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
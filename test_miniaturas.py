@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para o cache de miniaturas da grade de produtos:
+verifica que refiltrar o catálogo não decodifica imagens e que as miniaturas
+em disco são reaproveitadas e invalidadas quando a imagem muda.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from models.produto import Produto
+
+
+def criar_imagens(diretorio: str, quantidade: int) -> list:
+    """Grava imagens grandes de cores diferentes e retorna seus caminhos."""
+    from PyQt5.QtGui import QImage, QColor
+
+    caminhos = []
+    for i in range(quantidade):
+        imagem = QImage(1600, 1200, QImage.Format_RGB32)
+        imagem.fill(QColor.fromHsv((i * 37) % 360, 200, 220))
+        caminho = os.path.join(diretorio, f"produto_{i}.png")
+        imagem.save(caminho)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def test_cache_miniaturas():
+    """Mede a reconstrução da grade com miniaturas em memória e em disco."""
+    print("=== Testando Cache de Miniaturas ===")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtWidgets import QApplication
+        from ui import miniaturas
+        from ui.lista_produtos_marketplace import ModeloCardsProdutos
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, benchmark ignorado: {e}")
+        return True
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    cache_original = miniaturas._cache_miniaturas
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = criar_imagens(diretorio, 24)
+        produtos = [
+            Produto(id=i + 1, nome=f"Anel {i}", categoria="Anéis", preco_custo=10.0, preco_venda=25.0,
+                    quantidade=1, caminho_imagem=caminho)
+            for i, caminho in enumerate(caminhos)
+        ]
+        # Dois produtos com a mesma imagem compartilham a miniatura
+        produtos.append(Produto(id=99, nome="Anel cópia", preco_custo=10.0, preco_venda=25.0,
+                                quantidade=1, caminho_imagem=caminhos[0]))
+        produtos.append(Produto(id=100, nome="Sem imagem", preco_custo=10.0, preco_venda=25.0,
+                                quantidade=1, caminho_imagem=os.path.join(diretorio, "inexistente.png")))
+
+        try:
+            cache = miniaturas._cache_miniaturas = miniaturas.CacheMiniaturas(os.path.join(diretorio, "cache"))
+
+            modelo = ModeloCardsProdutos()
+            atualizados = []
+            modelo.dataChanged.connect(lambda inicio, fim, papeis: atualizados.append(inicio.row()))
+
+            def miniaturas_exibidas():
+                return [modelo.data(modelo.index(linha), Qt.DecorationRole) for linha in range(modelo.rowCount())]
+
+            # Primeira exibição: os cards ficam com placeholder e são atualizados depois
+            modelo.definir_produtos(produtos)
+            inicio = time.perf_counter()
+            assert miniaturas_exibidas() == [None] * len(produtos)
+            miniaturas_exibidas()  # Repintura enquanto pendentes não duplica pedidos
+            t_pedido = time.perf_counter() - inicio
+            assert cache.aguardar()
+            assert cache.decodificacoes == 24, cache.decodificacoes
+            assert sorted(atualizados) == list(range(25)), atualizados
+            pixmaps = miniaturas_exibidas()
+            assert all(not pix.isNull() for pix in pixmaps[:-1]) and pixmaps[-1] is None
+            assert pixmaps[0].width() <= 260 and pixmaps[0].height() <= 190
+            print(f"✓ {len(produtos)} miniaturas pedidas em {t_pedido * 1000:.1f} ms; "
+                  f"24 imagens reduzidas em segundo plano")
+
+            # Refiltrar: as miniaturas já estão em memória, nada é decodificado
+            inicio = time.perf_counter()
+            modelo.definir_produtos(list(reversed(produtos)))
+            pixmaps = miniaturas_exibidas()
+            t_refiltro = time.perf_counter() - inicio
+            assert not cache.pendentes and cache.decodificacoes == 24
+            assert pixmaps[0] is None and all(not pix.isNull() for pix in pixmaps[1:])
+            print(f"✓ Grade refeita em {t_refiltro * 1000:.1f} ms sem decodificar imagens")
+
+            # Outro tamanho é uma miniatura separada; a exportação não espera a thread
+            pdf = cache.obter(caminhos[1], miniaturas.TAMANHO_PDF)
+            assert pdf.width() <= 100 and pdf.height() <= 100 and cache.decodificacoes == 25
+            arquivos = os.listdir(os.path.join(diretorio, "cache"))
+            assert len(arquivos) == 25 and all(a.endswith(".png") for a in arquivos), arquivos
+
+            # Nova sessão: as miniaturas vêm do disco
+            cache = miniaturas._cache_miniaturas = miniaturas.CacheMiniaturas(os.path.join(diretorio, "cache"))
+            modelo = ModeloCardsProdutos()
+            modelo.definir_produtos(produtos)
+            miniaturas_exibidas()
+            assert cache.aguardar()
+            assert cache.decodificacoes == 0 and cache.leituras_disco == 24, (cache.decodificacoes, cache.leituras_disco)
+            print("✓ Miniaturas reaproveitadas do disco em uma nova sessão")
+
+            # Trocar a imagem no mesmo caminho gera uma nova miniatura
+            from PyQt5.QtGui import QImage, QColor
+            nova = QImage(800, 800, QImage.Format_RGB32)
+            nova.fill(QColor("#000000"))
+            nova.save(caminhos[2])
+            os.utime(caminhos[2], ns=(time.time_ns(), time.time_ns() + 10**9))
+            assert miniaturas_exibidas()[2] is None
+            assert cache.aguardar()
+            assert cache.decodificacoes == 1
+            pixmap = miniaturas_exibidas()[2]
+            assert pixmap.toImage().pixelColor(10, 10) == QColor("#000000") and pixmap.width() == 190
+            print("✓ Imagem alterada invalida a miniatura")
+
+            # Falhas chegam pelo sinal falhou, sem perder a miniatura já reduzida
+            erros = []
+            cache.falhou.connect(lambda caminho, mensagem: erros.append(caminho))
+            assert cache.solicitar(diretorio, miniaturas.TAMANHO_CARD) is None
+            assert cache.aguardar() and erros == [diretorio]
+            sem_disco = miniaturas.CacheMiniaturas(caminhos[3])
+            sem_disco.falhou.connect(lambda caminho, mensagem: erros.append(mensagem))
+            assert not sem_disco.obter(caminhos[3], miniaturas.TAMANHO_PDF).isNull()
+            assert len(erros) == 2 and erros[1].startswith("Erro ao gravar miniatura em disco"), erros
+            print("✓ Falhas de geração e de gravação reportadas pelo sinal falhou")
+        finally:
+            cache.pool.waitForDone()
+            miniaturas._cache_miniaturas = cache_original
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    try:
+        test_cache_miniaturas()
+    except AssertionError as e:
+        print(f"✗ Teste do cache de miniaturas falhou: {e}")
+        return 1
+    print("\n🎉 Teste do cache de miniaturas concluído!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
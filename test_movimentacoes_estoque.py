@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de teste/benchmark para o registro de movimentações de estoque: verifica
+que vendas, consignações e ajustes manuais geram movimentações, que o saldo
+materializado acompanha cada uma e que a reconciliação encontra divergências
+sem percorrer a tabela de movimentações.
+"""
+
+import sqlite3
+import sys
+import time
+
+from database.db_manager import gerenciador_bd
+from database import migracoes
+from apoio_testes import banco_temporario, caminho_temporario
+
+
+def test_todas_as_alteracoes_registradas():
+    """Percorre vendas, consignações e ajustes e confere o registro de cada um."""
+    print("=== Testando Registro de Movimentações de Estoque ===")
+
+    from controllers.produto_controller import ProdutoController
+    from controllers.cliente_controller import ClienteController
+    from controllers.venda_controller import VendaController
+    from controllers.consignacao_controller import ConsignacaoController
+    from models.produto import EstoqueInsuficiente
+
+    with banco_temporario():
+        def movimentacoes(produto_id):
+            return [tuple(row) for row in gerenciador_bd.buscar_todos(
+                "SELECT tipo_movimentacao, quantidade, observacoes FROM movimentacoes_estoque "
+                "WHERE produto_id = ? ORDER BY id", (produto_id,))]
+
+        def saldo(produto_id):
+            return gerenciador_bd.buscar_um(
+                "SELECT quantidade FROM saldos_estoque WHERE produto_id = ?", (produto_id,))[0]
+
+        produto = ProdutoController.criar_produto("Colar Veneziana", "Colares", 20.0, 60.0, 30)
+        cliente = ClienteController.criar_cliente("Revendedora", tipo="Revendedora")
+
+        venda = VendaController.criar_venda(
+            cliente.id, [{'produto_id': produto.id, 'quantidade': 4, 'preco_unitario': 60.0}], "PIX")
+        consignacao = ConsignacaoController.criar_consignacao(
+            cliente.id, [{'produto_id': produto.id, 'qtd': 10, 'preco': 60.0, 'comissao': 30.0}])
+        item_id = ConsignacaoController.obter_consignacao(consignacao.id).itens[0].id
+        assert ConsignacaoController.registrar_acerto(
+            consignacao.id, [{'item_id': item_id, 'qtd_vendida': 3, 'qtd_devolvida': 2}])
+        assert ConsignacaoController.registrar_acerto(
+            consignacao.id, [{'item_id': item_id, 'qtd_vendida': 3, 'qtd_devolvida': 1}], finalizar=True)
+        ProdutoController.atualizar_produto(produto.id, quantidade=25)
+        ProdutoController.atualizar_produto(produto.id, preco_venda=65.0)
+
+        assert movimentacoes(produto.id) == [
+            ("entrada", 30, "Estoque inicial"),
+            ("saida", 4, f"Venda #{venda.id}"),
+            ("saida", 10, f"Consignação #{consignacao.id}"),
+            ("entrada", 2, f"Devolução Consignação #{consignacao.id}"),
+            ("saida", 1, f"Ajuste devolução Consignação #{consignacao.id}"),
+            ("entrada", 6, f"Retorno Consignação #{consignacao.id}"),
+            ("entrada", 2, "Ajuste manual"),
+        ], movimentacoes(produto.id)
+        assert ProdutoController.obter_produto(produto.id).quantidade == saldo(produto.id) == 25
+        # Produto cadastrado sem estoque: sem movimentações nem saldo materializado, mas conciliado
+        sem_estoque = ProdutoController.criar_produto("Anel Liso", "Anéis", 5.0, 15.0, 0)
+        assert movimentacoes(sem_estoque.id) == []
+        assert ProdutoController.reconciliar_estoque() == []
+        print(f"✓ {len(movimentacoes(produto.id))} movimentações registradas; saldo materializado = estoque = 25")
+
+        # Edição iniciada antes de uma venda: a venda não é sobrescrita
+        exibido = ProdutoController.obter_produto(produto.id)
+        VendaController.criar_venda(
+            cliente.id, [{'produto_id': produto.id, 'quantidade': 5, 'preco_unitario': 65.0}], "PIX")
+        registradas = len(movimentacoes(produto.id))
+        exibido.nome = "Colar Veneziana Dourado"
+        assert exibido.salvar()
+        assert ProdutoController.atualizar_produto(
+            produto.id, quantidade=25, quantidade_anterior=exibido.quantidade).quantidade == 20
+        assert len(movimentacoes(produto.id)) == registradas
+        assert ProdutoController.atualizar_produto(
+            produto.id, quantidade=28, quantidade_anterior=exibido.quantidade).quantidade == 23
+        assert movimentacoes(produto.id)[-1] == ("entrada", 3, "Ajuste manual")
+        assert ProdutoController.reconciliar_estoque() == []
+
+        # Redução maior que o estoque restante: recusada sem gravar nada do produto
+        exibido = ProdutoController.obter_produto(produto.id)
+        VendaController.criar_venda(
+            cliente.id, [{'produto_id': produto.id, 'quantidade': 20, 'preco_unitario': 65.0}], "PIX")
+        registradas = len(movimentacoes(produto.id))
+        try:
+            ProdutoController.atualizar_produto(
+                produto.id, nome="Colar Renomeado", quantidade=exibido.quantidade - 5,
+                quantidade_anterior=exibido.quantidade)
+            assert False, "A redução sem estoque deveria ser recusada"
+        except EstoqueInsuficiente as e:
+            assert e.faltas == {produto.id: ("Colar Renomeado", 5, 3)}, e.faltas
+        atual = ProdutoController.obter_produto(produto.id)
+        assert (atual.nome, atual.quantidade) == ("Colar Veneziana Dourado", 3)
+        assert len(movimentacoes(produto.id)) == registradas
+        assert ProdutoController.atualizar_produto(
+            produto.id, quantidade=exibido.quantidade - 3, quantidade_anterior=exibido.quantidade).quantidade == 0
+        assert movimentacoes(produto.id)[-1] == ("saida", 3, "Ajuste manual")
+        assert ProdutoController.reconciliar_estoque() == []
+        print("✓ Edição com estoque desatualizado aplica só a diferença informada")
+
+        # Alteração direta no banco, fora do registro: a reconciliação aponta o produto
+        gerenciador_bd.executar_consulta("UPDATE produtos SET quantidade = 40 WHERE id = ?", (produto.id,))
+        divergencias = ProdutoController.reconciliar_estoque()
+        assert [(d.produto_id, d.quantidade, d.saldo, d.movimentado) for d in divergencias] == [
+            (produto.id, 40, 0, 0)], divergencias
+        assert ProdutoController.reconciliar_estoque([produto.id]) == divergencias
+        assert ProdutoController.reconciliar_estoque([]) == []
+
+        # Excluir o produto remove o saldo materializado
+        ProdutoController.excluir_produto(produto.id)
+        assert gerenciador_bd.buscar_um("SELECT COUNT(*) FROM saldos_estoque")[0] == 0
+        print("✓ Alteração fora do registro detectada pela reconciliação")
+    return True
+
+
+def test_migracao_saldo_de_abertura():
+    """Um banco anterior ao registro recebe movimentações de abertura e fica conciliado."""
+    print("=== Testando Migração dos Saldos de Estoque ===")
+
+    from models.produto import Produto
+
+    caminho = caminho_temporario()
+    anterior = sqlite3.connect(caminho)
+    versao_anterior = migracoes.MIGRACOES.index(migracoes._migracao_saldos_estoque)
+    for migracao in migracoes.MIGRACOES[:versao_anterior]:
+        migracao(anterior.cursor())
+    anterior.execute(f"PRAGMA user_version = {versao_anterior}")
+    anterior.executemany(
+        "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, 'Anéis', 10, 25, ?)",
+        [("Anel A", 7), ("Anel B", 0), ("Anel C", 3)]
+    )
+    # Só a consignação do Anel A tinha sido registrada (5 enviados, 2 devolvidos)
+    anterior.executemany(
+        "INSERT INTO movimentacoes_estoque (produto_id, tipo_movimentacao, quantidade) VALUES (1, ?, ?)",
+        [("saida", 5), ("entrada", 2)]
+    )
+    anterior.commit()
+    anterior.close()
+
+    with banco_temporario(caminho):
+        abertura = [tuple(row) for row in gerenciador_bd.buscar_todos(
+            "SELECT produto_id, tipo_movimentacao, quantidade FROM movimentacoes_estoque "
+            "WHERE observacoes = 'Saldo de abertura' ORDER BY produto_id")]
+        assert abertura == [(1, "entrada", 10), (3, "entrada", 3)], abertura
+        saldos = dict(tuple(row) for row in gerenciador_bd.buscar_todos(
+            "SELECT produto_id, quantidade FROM saldos_estoque"))
+        assert saldos == {1: 7, 2: 0, 3: 3}, saldos
+        assert Produto.reconciliar_estoque() == []
+        print("✓ Estoque existente preservado com movimentações de abertura")
+    return True
+
+
+def test_reconciliacao_pelo_indice():
+    """Mede a reconciliação com 200 mil movimentações e verifica o plano de consulta."""
+    print("=== Testando Reconciliação do Estoque ===")
+
+    from models.produto import Produto
+    from database.migracoes import SINAL_MOVIMENTACAO
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, 'Anéis', 10, 25, 0)",
+            [(f"Produto {i}",) for i in range(400)]
+        )
+        conexao.commit()
+        # Movimentações registradas pelo trigger do saldo, como nas telas
+        inicio = time.perf_counter()
+        Produto.movimentar_estoque(
+            (i % 400 + 1, "entrada" if i % 4 else "saida", 3 if i % 4 else 1, None) for i in range(200_000)
+        )
+        gravacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        assert Produto.reconciliar_estoque() == []
+        completa = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        assert Produto.reconciliar_estoque([17, 42]) == []
+        parcial = time.perf_counter() - inicio
+        print(f"✓ 200000 movimentações gravadas em {gravacao * 1000:.0f} ms; reconciliação de 400 produtos "
+              f"em {completa * 1000:.0f} ms, de 2 produtos em {parcial * 1000:.1f} ms")
+
+        plano = " | ".join(row[3] for row in conexao.execute(
+            f"EXPLAIN QUERY PLAN SELECT produto_id, SUM({SINAL_MOVIMENTACAO}) FROM movimentacoes_estoque "
+            f"WHERE produto_id IN (17, 42) GROUP BY produto_id"))
+        assert "COVERING INDEX idx_movimentacoes_estoque_produto_tipo" in plano, plano
+        assert "TEMP B-TREE" not in plano, plano
+        print(f"✓ Soma lida apenas do índice: {plano}")
+    return True
+
+
+def main():
+    """Função principal de teste."""
+    testes = [
+        test_todas_as_alteracoes_registradas,
+        test_migracao_saldo_de_abertura,
+        test_reconciliacao_pelo_indice,
+    ]
+    sucesso = True
+    for teste in testes:
+        try:
+            teste()
+        except AssertionError as e:
+            print(f"✗ {teste.__name__} falhou: {e}")
+            sucesso = False
+
+    if sucesso:
+        print("\n🎉 Testes das movimentações de estoque concluídos!")
+        return 0
+    print("\n❌ Alguns testes falharam. Verifique os erros acima.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,12 +50,80 @@ def test_integracao_main_window():
     print("Integração com janela principal está funcionando corretamente!\n")
     return True
 
+def test_grade_virtualizada():
+    """Verifica que a grade de cards não cria widgets por produto e guarda a seleção no modelo."""
+    print("=== Testando Grade Virtualizada de Produtos ===")
+    
+    import time
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication, QWidget
+        from ui.lista_produtos_marketplace import ListaProdutosMarketplace
+    except ImportError as e:
+        print(f"⚠ PyQt5 indisponível, teste ignorado: {e}")
+        return True
+    
+    from database.db_manager import gerenciador_bd
+    from apoio_testes import banco_temporario
+    
+    app = QApplication.instance() or QApplication(sys.argv)
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO produtos (nome, categoria, preco_custo, preco_venda, quantidade) VALUES (?, ?, 10, 25, 5)",
+            [(f"Anel Banhado {i}" if i % 2 else f"Colar Perola {i}", "Anéis" if i % 2 else "Colares")
+             for i in range(5000)]
+        )
+        conexao.commit()
+        
+        lista = ListaProdutosMarketplace()
+        lista.resize(1280, 850)
+        lista.show()
+        app.processEvents()
+        grade = lista.grade_produtos
+        widgets = len(lista.findChildren(QWidget))
+        assert grade.model().rowCount() == 5000
+        
+        inicio = time.perf_counter()
+        for termo in ("c", "co", "col", "cola", "colar", ""):
+            lista.campo_busca.setText(termo)
+            lista.busca.executar_agora()
+            grade.viewport().grab()
+        t_filtro = (time.perf_counter() - inicio) / 6
+        assert len(lista.findChildren(QWidget)) == widgets
+        print(f"✓ 5000 produtos com {widgets} widgets; filtro e pintura em {t_filtro * 1000:.0f} ms por tecla")
+        
+        # Seleção e sacola pelo clique nos cards, mantidas ao trocar o filtro
+        delegate, modelo = lista.delegate_card, lista.modelo_cards
+        delegate.acao_acionada.emit("selecionar", modelo.index(0))
+        delegate.acao_acionada.emit("adicionar", modelo.index(1))
+        lista.campo_busca.setText("colar")
+        assert lista.busca.aguardar()
+        assert modelo.rowCount() == 2500
+        lista.selecionar_todos()
+        assert len(lista.selecionados) == 2501 and lista.lbl_selecionados.text() == "Selecionados: 2501"
+        assert lista.carrinho.quantidade_itens == 1
+        lista.limpar_selecao()
+        assert lista.selecionados == []
+        
+        area = grade.visualRect(modelo.index(0))
+        retangulos = delegate.retangulos(area)
+        assert delegate.acao_na_posicao(area, retangulos["adicionar"].center()) == "adicionar"
+        assert delegate.acao_na_posicao(area, retangulos["editar"].center()) == "editar"
+        assert delegate.acao_na_posicao(area, retangulos["imagem"].center()) == "selecionar"
+        print("✓ Seleção e sacola guardadas no modelo, independentes do filtro")
+        
+        lista.deleteLater()
+        app.processEvents()
+    return True
+
 if __name__ == "__main__":
     print("Testando módulo de produtos marketplace...\n")
     
     sucesso = True
     sucesso &= test_modulo_produtos_marketplace()
     sucesso &= test_integracao_main_window()
+    sucesso &= test_grade_virtualizada()
     
     if sucesso:
         print("✅ Todos os testes passaram! O módulo de produtos marketplace está pronto para uso.")
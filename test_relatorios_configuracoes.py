@@ -7,7 +7,11 @@ foram implementados corretamente.
 """
 
 import sys
-import os
+from datetime import datetime
+
+from database.db_manager import gerenciador_bd
+from apoio_testes import banco_temporario
+
 
 def test_modulo_relatorios():
     """Testa se todos os componentes do módulo de relatórios podem ser importados corretamente."""
@@ -65,6 +69,50 @@ def test_integracao_main_window():
     print("Integração com janela principal está funcionando corretamente!\n")
     return True
 
+def test_calculo_financeiro():
+    """Testa os totais do relatório financeiro calculados pelo banco."""
+    print("=== Testando Cálculo Financeiro ===")
+
+    from controllers.venda_controller import VendaController
+
+    with banco_temporario():
+        conexao = gerenciador_bd.conectar()
+        conexao.executemany(
+            "INSERT INTO clientes (nome, telefone) VALUES (?, ?)",
+            [("Ana", "1111"), ("Bruna", "2222"), ("Carla", None)]
+        )
+        vendas = [
+            (1, 100.0, "PIX", "pago", datetime(2024, 1, 10, 9, 0)),
+            (1, 200.0, "Parcelado Boleto", "pendente", datetime(2024, 1, 20, 9, 0)),
+            (1, 50.0, "Parcelado Boleto", "pendente", datetime(2024, 2, 5, 9, 0)),
+            (2, 300.0, "Parcelado Promissória", "pendente", datetime(2024, 3, 1, 9, 0)),
+            (3, 80.0, "Dinheiro", "pago", datetime(2024, 3, 15, 9, 0)),
+        ]
+        conexao.executemany(
+            "INSERT INTO vendas (cliente_id, valor_total, tipo_pagamento, status, data_venda) VALUES (?, ?, ?, ?, ?)",
+            [(c, v, t, s, d.isoformat()) for c, v, t, s, d in vendas]
+        )
+        conexao.commit()
+
+        consultas = []
+        gerenciador_bd.definir_rastreamento(consultas.append)
+        geral = VendaController.calcular_financeiro()
+        gerenciador_bd.definir_rastreamento(None)
+        assert geral["total_recebido"] == 180.0
+        assert geral["total_a_receber"] == 550.0
+        assert geral["numero_vendas"] == 5
+        assert [c.nome for c in geral["clientes_inadimplentes"]] == ["Ana", "Bruna"]
+        assert len([c for c in consultas if c.lstrip().upper().startswith("SELECT")]) == 2
+        print("✓ Totais gerais calculados com 2 consultas")
+
+        periodo = VendaController.calcular_financeiro(datetime(2024, 1, 15), datetime(2024, 3, 1, 23, 59))
+        assert periodo["total_recebido"] == 0.0
+        assert periodo["total_a_receber"] == 550.0
+        assert periodo["numero_vendas"] == 3
+        print("✓ Filtro por período aplicado corretamente")
+    return True
+
+
 if __name__ == "__main__":
     print("Testando módulos de relatórios e configurações...\n")
     
@@ -72,6 +120,7 @@ if __name__ == "__main__":
     sucesso &= test_modulo_relatorios()
     sucesso &= test_modulo_configuracoes()
     sucesso &= test_integracao_main_window()
+    sucesso &= test_calculo_financeiro()
     
     if sucesso:
         print("✅ Todos os testes passaram! Os módulos de relatórios e configurações estão prontos para uso.")
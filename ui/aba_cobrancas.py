@@ -14,6 +14,7 @@ from models.pagamento import Pagamento
 from controllers.pagamento_controller import PagamentoController
 from controllers.cliente_controller import ClienteController
 from ui.formulario_venda import FormularioVenda
+from ui.carregamento import CarregadorDados, IndicadorCarregamento
 
 class AbaCobrancas(QWidget):
     """Widget para exibir e gerenciar cobranças e dívidas pendentes."""
@@ -41,6 +42,11 @@ class AbaCobrancas(QWidget):
         # Cards de resumo
         self.criar_cards_resumo(layout_principal)
         
+        # Indicador de carregamento em segundo plano
+        self.indicador_carregamento = IndicadorCarregamento()
+        layout_principal.addWidget(self.indicador_carregamento)
+        self.carregador = CarregadorDados(self, self.indicador_carregamento)
+        
         # Tabela de cobranças
         self.criar_tabela_cobrancas(layout_principal)
         
@@ -233,20 +239,28 @@ class AbaCobrancas(QWidget):
         layout_principal.addWidget(container_tabela)
         
     def carregar_dividas(self):
-        """Carrega as dívidas pendentes."""
-        try:
-            # Obter dívidas pendentes
-            self.dividas = PagamentoController.obter_dividas_pendentes()
-            self.aplicar_filtro_mes()
-            
-            # Atualizar resumo
-            self.atualizar_resumo()
-            
-            # Atualizar tabela
-            self.atualizar_tabela()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível carregar as cobranças:\n{str(e)}")
+        """Carrega as dívidas pendentes em segundo plano."""
+        # O histórico de pagamentos é carregado ao abrir os detalhes
+        self.carregador.carregar(
+            lambda: PagamentoController.obter_dividas_pendentes(incluir_pagamentos=False),
+            self.dividas_carregadas,
+            self.falha_carregamento
+        )
+        
+    def dividas_carregadas(self, dividas):
+        """Exibe as dívidas carregadas pelo carregador."""
+        self.dividas = dividas
+        self.aplicar_filtro_mes()
+        
+        # Atualizar resumo
+        self.atualizar_resumo()
+        
+        # Atualizar tabela
+        self.atualizar_tabela()
+        
+    def falha_carregamento(self, mensagem):
+        """Informa a falha no carregamento das cobranças."""
+        QMessageBox.critical(self, "Erro", f"Não foi possível carregar as cobranças:\n{mensagem}")
             
     def atualizar_resumo(self):
         """Atualiza os cards de resumo."""
@@ -524,7 +538,9 @@ class AbaCobrancas(QWidget):
     def editar_cobranca(self, divida):
         """Edita uma cobrança."""
         try:
-            formulario = FormularioVenda(venda=divida['venda'], parent=self)
+            # A dívida traz apenas os dados da venda; o formulário precisa dos itens
+            venda = Venda.obter_por_id(divida['venda'].id)
+            formulario = FormularioVenda(venda=venda, parent=self)
             if formulario.exec_():
                 self.carregar_dividas()
         except Exception as e:
@@ -561,16 +577,14 @@ class AbaCobrancas(QWidget):
         
     def marcar_todas_como_pagas(self):
         try:
-            count = 0
-            for d in self.dividas:
-                pendente = d['valor_pendente']
-                if pendente > 0:
-                    PagamentoController.registrar_pagamento(d['venda'].id, pendente, "Quitação em massa")
-                    count += 1
+            count = PagamentoController.quitar_vendas(
+                {d['venda'].id: d['valor_pendente'] for d in self.dividas},
+                "Quitação em massa"
+            )
             QMessageBox.information(self, "Quitação", f"Registros atualizados: {count}")
             self.carregar_dividas()
         except Exception as e:
-            QMessageBox.critical(self, "Erro", "Não foi possível quitar em massa.")
+            QMessageBox.critical(self, "Erro", f"Não foi possível quitar em massa. Nenhum pagamento foi registrado.\n{str(e)}")
         
     def enviar_lembretes(self):
         try:
@@ -616,8 +630,7 @@ class DialogoRegistroPagamento(QDialog):
         super().__init__(parent)
         self.venda_id = venda_id
         self.venda = Venda.obter_por_id(venda_id)
-        self.pagamentos_existentes = Pagamento.obter_por_venda(venda_id)
-        self.total_pago = sum(p.valor for p in self.pagamentos_existentes)
+        self.total_pago = self.venda.valor_pago if self.venda else 0.0
         
         self.inicializar_ui()
         
@@ -670,7 +683,7 @@ class DialogoRegistroPagamento(QDialog):
             layout_info.addRow("Valor Já Pago:", lbl_valor_pago)
             
             # Valor pendente
-            valor_pendente = self.venda.valor_total - self.total_pago
+            valor_pendente = self.venda.saldo
             lbl_valor_pendente = QLabel(f"R$ {valor_pendente:.2f}")
             lbl_valor_pendente.setObjectName("texto_perigo")
             layout_info.addRow("Valor Pendente:", lbl_valor_pendente)
@@ -692,7 +705,7 @@ class DialogoRegistroPagamento(QDialog):
         self.spin_valor.setPrefix("R$ ")
         self.spin_valor.setMaximum(999999.99)
         self.spin_valor.setDecimals(2)
-        valor_pendente = self.venda.valor_total - self.total_pago if self.venda else 0
+        valor_pendente = self.venda.saldo if self.venda else 0
         self.spin_valor.setValue(max(valor_pendente, 0))
         layout_pagamento.addRow("Valor do Pagamento:", self.spin_valor)
         
@@ -741,7 +754,7 @@ class DialogoRegistroPagamento(QDialog):
                 return
                 
             # Verificar se o valor não excede o pendente
-            valor_pendente = self.venda.valor_total - self.total_pago
+            valor_pendente = self.venda.saldo
             if valor > valor_pendente:
                 resposta = QMessageBox.question(
                     self,
@@ -787,6 +800,8 @@ class DialogoDetalhesDivida(QDialog):
     def __init__(self, divida, parent=None):
         super().__init__(parent)
         self.divida = divida
+        if self.divida.get('pagamentos') is None:
+            self.divida['pagamentos'] = Pagamento.obter_por_venda(divida['venda'].id, divida['venda'])
         self.inicializar_ui()
         
     def inicializar_ui(self):
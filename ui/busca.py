@@ -0,0 +1,237 @@
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, pyqtSignal
+
+# Pausa na digitação (ms) antes de a busca ser executada
+ATRASO_BUSCA_MS = 250
+
+# Itens avaliados por vez; entre um bloco e outro a interface processa eventos
+BLOCO_BUSCA = 5000
+
+
+def normalizar_termo(termo: str) -> str:
+    """Termo em minúsculas, sem espaços nas pontas e com espaços internos simples."""
+    return " ".join(termo.casefold().split())
+
+
+class BuscaIncremental(QObject):
+    """
+    Busca por digitação compartilhada pelas listas.
+
+    A busca só é executada quando a digitação pausa por atraso_ms. Se o novo
+    termo apenas estende o anterior ("ane" -> "anel"), os candidatos são os
+    resultados da busca anterior, e não a lista inteira. A avaliação acontece
+    em blocos; uma nova tecla durante a avaliação a cancela, e apenas o termo
+    mais recente chega a aplicar().
+
+    Os filtros devem ser monotônicos: tudo que corresponde a um termo também
+    corresponde a qualquer prefixo dele (vale para busca por trecho e para a
+    busca por prefixo de palavras do índice de texto completo).
+    """
+
+    # Termo, quantidade de resultados, ms filtrando e ms desde a última tecla
+    concluida = pyqtSignal(str, int, float, float)
+
+    def __init__(self, campo, itens, criar_filtro, aplicar, parent=None,
+                 atraso_ms: int = ATRASO_BUSCA_MS, bloco: int = BLOCO_BUSCA):
+        """
+        Inicializa a busca.
+
+        Args:
+            campo (QLineEdit): Campo de busca observado
+            itens (callable): Retorna a lista completa de itens pesquisáveis
+            criar_filtro (callable): Recebe o termo normalizado (não vazio) e
+                retorna uma função item -> bool
+            aplicar (callable): Recebe (resultados, termo) na thread da interface
+            parent: Widget dono da busca (por padrão, o dono do campo)
+            atraso_ms (int): Pausa na digitação antes de buscar
+            bloco (int): Itens avaliados antes de devolver o controle à interface
+        """
+        super().__init__(parent or campo.parent())
+        self.campo = campo
+        self.itens = itens
+        self.criar_filtro = criar_filtro
+        self.aplicar = aplicar
+        self.bloco = bloco
+
+        self.geracao = 0
+        self.termo_anterior = None
+        self.resultados_anteriores = None
+        self.em_andamento = None
+        self.ultima_tecla = QElapsedTimer()
+        # Itens avaliados na última busca (para medir o ganho do estreitamento)
+        self.avaliados = 0
+
+        self.temporizador = QTimer(self)
+        self.temporizador.setSingleShot(True)
+        self.temporizador.setInterval(atraso_ms)
+        self.temporizador.timeout.connect(self.executar_agora)
+        campo.textChanged.connect(self.texto_alterado)
+
+    @property
+    def ocupado(self) -> bool:
+        """Indica se há busca aguardando a pausa na digitação ou em andamento."""
+        return self.temporizador.isActive() or self.em_andamento is not None
+
+    def texto_alterado(self, *args):
+        """Reinicia a espera e cancela a avaliação em andamento."""
+        self.geracao += 1
+        self.em_andamento = None
+        self.ultima_tecla.start()
+        self.temporizador.start()
+
+    def invalidar(self):
+        """Descarta os resultados anteriores (os itens pesquisáveis mudaram)."""
+        self.termo_anterior = None
+        self.resultados_anteriores = None
+
+    def executar_agora(self):
+        """Executa a busca do texto atual sem esperar a pausa na digitação."""
+        self.temporizador.stop()
+        self.geracao += 1
+        if not self.ultima_tecla.isValid():
+            self.ultima_tecla.start()
+
+        termo = normalizar_termo(self.campo.text())
+        if termo == self.termo_anterior and self.resultados_anteriores is not None:
+            # Mesmo termo já exibido (por exemplo, tecla digitada e apagada)
+            self.em_andamento = None
+            return
+        if self.resultados_anteriores is not None and termo.startswith(self.termo_anterior):
+            candidatos = self.resultados_anteriores
+        else:
+            candidatos = self.itens()
+
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        filtro = self.criar_filtro(termo) if termo else None
+        self.em_andamento = {
+            "geracao": self.geracao, "termo": termo, "candidatos": candidatos, "filtro": filtro,
+            "posicao": 0, "resultados": [], "ms_filtro": cronometro.nsecsElapsed() / 1e6,
+        }
+        self.avaliados = 0
+        self._processar_bloco(self.geracao)
+
+    def aguardar(self, tempo_limite_ms: int = 30000) -> bool:
+        """
+        Processa eventos até a busca pendente terminar.
+
+        Returns:
+            bool: True se terminou dentro do tempo limite
+        """
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        while self.ocupado and cronometro.elapsed() < tempo_limite_ms:
+            if self.temporizador.isActive():
+                self.executar_agora()
+            QApplication.processEvents()
+        return not self.ocupado
+
+    def _processar_bloco(self, geracao):
+        estado = self.em_andamento
+        if estado is None or estado["geracao"] != geracao:
+            return  # Cancelada por uma nova tecla
+
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        inicio = estado["posicao"]
+        bloco = estado["candidatos"][inicio:inicio + self.bloco]
+        filtro = estado["filtro"]
+        estado["resultados"].extend(bloco if filtro is None else [item for item in bloco if filtro(item)])
+        estado["posicao"] = inicio + len(bloco)
+        self.avaliados += len(bloco)
+        estado["ms_filtro"] += cronometro.nsecsElapsed() / 1e6
+
+        if estado["posicao"] < len(estado["candidatos"]):
+            QTimer.singleShot(0, lambda: self._processar_bloco(geracao))
+            return
+
+        self.em_andamento = None
+        self.termo_anterior = estado["termo"]
+        self.resultados_anteriores = estado["resultados"]
+        cronometro.restart()
+        self.aplicar(estado["resultados"], estado["termo"])
+        ms_filtro = estado["ms_filtro"] + cronometro.nsecsElapsed() / 1e6
+        self.concluida.emit(estado["termo"], len(estado["resultados"]), ms_filtro,
+                            self.ultima_tecla.nsecsElapsed() / 1e6)
+
+
+class BuscaNoBanco(QObject):
+    """
+    Busca por digitação resolvida por uma consulta ao banco.
+
+    Usada quando a lista exibida é apenas uma página dos registros e por isso
+    não pode ser estreitada em memória. Como em BuscaIncremental, a consulta
+    só é disparada quando a digitação pausa por atraso_ms. A lista informa
+    o fim da consulta (que pode rodar em segundo plano) chamando concluir().
+    """
+
+    # Termo, quantidade de resultados, ms consultando e ms desde a última tecla
+    concluida = pyqtSignal(str, int, float, float)
+
+    def __init__(self, campo, executar, parent=None, atraso_ms: int = ATRASO_BUSCA_MS):
+        """
+        Inicializa a busca.
+
+        Args:
+            campo (QLineEdit): Campo de busca observado
+            executar (callable): Recebe o termo normalizado e dispara a consulta
+            parent: Widget dono da busca (por padrão, o dono do campo)
+            atraso_ms (int): Pausa na digitação antes de buscar
+        """
+        super().__init__(parent or campo.parent())
+        self.campo = campo
+        self.executar = executar
+
+        self.termo = ""
+        self.pendente = False
+        self.ultima_tecla = QElapsedTimer()
+        self.cronometro = QElapsedTimer()
+
+        self.temporizador = QTimer(self)
+        self.temporizador.setSingleShot(True)
+        self.temporizador.setInterval(atraso_ms)
+        self.temporizador.timeout.connect(self.executar_agora)
+        campo.textChanged.connect(self.texto_alterado)
+
+    @property
+    def ocupado(self) -> bool:
+        """Indica se há busca aguardando a pausa na digitação ou a resposta do banco."""
+        return self.temporizador.isActive() or self.pendente
+
+    def texto_alterado(self, *args):
+        """Reinicia a espera pela pausa na digitação."""
+        self.ultima_tecla.start()
+        self.temporizador.start()
+
+    def executar_agora(self):
+        """Dispara a consulta do texto atual sem esperar a pausa na digitação."""
+        self.temporizador.stop()
+        if not self.ultima_tecla.isValid():
+            self.ultima_tecla.start()
+        self.termo = normalizar_termo(self.campo.text())
+        self.pendente = True
+        self.cronometro.start()
+        self.executar(self.termo)
+
+    def concluir(self, quantidade: int):
+        """Registra o fim da consulta disparada pela busca e emite concluida."""
+        if not self.pendente:
+            return  # Recarga sem relação com a digitação
+        self.pendente = False
+        self.concluida.emit(self.termo, quantidade, self.cronometro.nsecsElapsed() / 1e6,
+                            self.ultima_tecla.nsecsElapsed() / 1e6)
+
+    def aguardar(self, tempo_limite_ms: int = 30000) -> bool:
+        """
+        Processa eventos até a busca pendente terminar.
+
+        Returns:
+            bool: True se terminou dentro do tempo limite
+        """
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        while self.ocupado and cronometro.elapsed() < tempo_limite_ms:
+            if self.temporizador.isActive():
+                self.executar_agora()
+            QApplication.processEvents()
+        return not self.ocupado
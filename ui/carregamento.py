@@ -0,0 +1,241 @@
+from PyQt5.QtWidgets import QProgressBar, QApplication
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QElapsedTimer, QTimer, pyqtSignal, pyqtSlot
+
+# Quantidade de registros buscada por página nas listas com rolagem infinita
+TAMANHO_PAGINA = 200
+
+
+class SinaisTarefa(QObject):
+    """Sinais de uma tarefa de carregamento (emitidos a partir da thread de trabalho)."""
+
+    # Geração da solicitação e resultado da função
+    concluida = pyqtSignal(int, object)
+    # Geração da solicitação e mensagem de erro
+    falhou = pyqtSignal(int, str)
+
+
+class TarefaCarregamento(QRunnable):
+    """Executa uma chamada de controller em uma thread do pool."""
+
+    def __init__(self, geracao, funcao, carregador):
+        super().__init__()
+        self.geracao = geracao
+        self.funcao = funcao
+        self.carregador = carregador
+        self.sinais = SinaisTarefa()
+
+    def run(self):
+        """Executa a função, a menos que a solicitação já tenha sido substituída."""
+        if self.carregador.geracao != self.geracao:
+            # Substituída antes de começar: avisa apenas para liberar a referência
+            self.sinais.concluida.emit(self.geracao, None)
+            return
+        try:
+            resultado = self.funcao()
+        except Exception as e:
+            self.sinais.falhou.emit(self.geracao, str(e))
+        else:
+            self.sinais.concluida.emit(self.geracao, resultado)
+
+
+class IndicadorCarregamento(QProgressBar):
+    """Barra fina em modo ocupado, exibida enquanto há carregamento em andamento."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 0)
+        self.setTextVisible(False)
+        self.setFixedHeight(4)
+        self.setObjectName("indicador_carregamento")
+        self.hide()
+
+
+class CarregadorDados(QObject):
+    """
+    Executa chamadas de controller fora da thread da interface.
+
+    Cada chamada a carregar() substitui a anterior: solicitações antigas que
+    ainda não começaram são puladas e resultados que chegam atrasados são
+    descartados, de modo que apenas o carregamento mais recente atualiza a tela.
+    Os callbacks sempre rodam na thread da interface.
+    """
+
+    # Emitidos quando o carregamento mais recente começa e termina
+    iniciado = pyqtSignal()
+    finalizado = pyqtSignal()
+
+    def __init__(self, parent=None, indicador=None, pool=None):
+        """
+        Inicializa o carregador.
+
+        Args:
+            parent: Widget dono do carregador
+            indicador (QWidget, optional): Widget exibido enquanto houver carregamento pendente
+            pool (QThreadPool, optional): Pool de threads; por padrão o global da aplicação
+        """
+        super().__init__(parent)
+        self.indicador = indicador
+        self.pool = pool or QThreadPool.globalInstance()
+        self.geracao = 0
+        self.pendentes = {}
+        self.callbacks = None
+
+    @property
+    def ocupado(self) -> bool:
+        """Indica se o carregamento mais recente ainda não terminou."""
+        return self.callbacks is not None
+
+    def carregar(self, funcao, ao_concluir, ao_falhar=None) -> int:
+        """
+        Agenda a função em segundo plano, cancelando o carregamento anterior.
+
+        Args:
+            funcao (callable): Função sem argumentos executada fora da thread da interface
+            ao_concluir (callable): Recebe o resultado da função
+            ao_falhar (callable, optional): Recebe a mensagem de erro
+
+        Returns:
+            int: Geração da solicitação
+        """
+        self.geracao += 1
+        self.callbacks = (ao_concluir, ao_falhar)
+
+        tarefa = TarefaCarregamento(self.geracao, funcao, self)
+        tarefa.sinais.concluida.connect(self._tarefa_concluida)
+        tarefa.sinais.falhou.connect(self._tarefa_falhou)
+        # Mantém a tarefa (e seus sinais) viva até o resultado chegar
+        self.pendentes[self.geracao] = tarefa
+
+        if self.indicador is not None:
+            self.indicador.show()
+        self.iniciado.emit()
+        self.pool.start(tarefa)
+        return self.geracao
+
+    def cancelar(self):
+        """Descarta o carregamento em andamento, se houver."""
+        if self.callbacks is None:
+            return
+        self.geracao += 1
+        self._finalizar()
+
+    def aguardar(self, tempo_limite_ms: int = 30000) -> bool:
+        """
+        Processa eventos até o carregamento mais recente terminar.
+
+        Returns:
+            bool: True se terminou dentro do tempo limite
+        """
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        while self.ocupado and cronometro.elapsed() < tempo_limite_ms:
+            self.pool.waitForDone(10)
+            QApplication.processEvents()
+        return not self.ocupado
+
+    def _finalizar(self):
+        self.callbacks = None
+        if self.indicador is not None:
+            self.indicador.hide()
+        self.finalizado.emit()
+
+    @pyqtSlot(int, object)
+    def _tarefa_concluida(self, geracao, resultado):
+        self.pendentes.pop(geracao, None)
+        if geracao != self.geracao or self.callbacks is None:
+            return
+        ao_concluir, _ = self.callbacks
+        self._finalizar()
+        ao_concluir(resultado)
+
+    @pyqtSlot(int, str)
+    def _tarefa_falhou(self, geracao, mensagem):
+        self.pendentes.pop(geracao, None)
+        if geracao != self.geracao or self.callbacks is None:
+            return
+        _, ao_falhar = self.callbacks
+        self._finalizar()
+        if ao_falhar is not None:
+            ao_falhar(mensagem)
+
+
+class PaginadorRolagem(QObject):
+    """
+    Busca a próxima página de registros quando a rolagem de uma view se
+    aproxima do fim (rolagem infinita).
+
+    As páginas são buscadas pelo carregador, fora da thread da interface, com
+    paginação por chave: cada página começa após o ID do último registro
+    recebido. Uma nova recarga substitui a busca de página em andamento.
+    """
+
+    def __init__(self, view, carregador, buscar_pagina, ao_receber, ao_falhar=None,
+                 precisa_mais=None, tamanho_pagina=TAMANHO_PAGINA):
+        """
+        Inicializa o paginador.
+
+        Args:
+            view (QAbstractScrollArea): View cuja barra de rolagem vertical é observada
+            carregador (CarregadorDados): Carregador usado para as buscas
+            buscar_pagina (callable): Recebe (limite, apos_id) e retorna a lista da página
+            ao_receber (callable): Recebe (itens, primeira_pagina) na thread da interface
+            ao_falhar (callable, optional): Recebe a mensagem de erro
+            precisa_mais (callable, optional): Retorna se ainda vale buscar páginas
+                (por exemplo, se os registros carregados ainda cobrem o filtro)
+            tamanho_pagina (int): Quantidade de registros por página
+        """
+        super().__init__(view)
+        self.view = view
+        self.carregador = carregador
+        self.buscar_pagina = buscar_pagina
+        self.ao_receber = ao_receber
+        self.ao_falhar = ao_falhar
+        self.precisa_mais = precisa_mais
+        self.tamanho_pagina = tamanho_pagina
+        self.apos_id = None
+        self.esgotado = False
+
+        # Verificação adiada para depois que a view atualizar a barra de rolagem
+        self.temporizador = QTimer(self)
+        self.temporizador.setSingleShot(True)
+        self.temporizador.timeout.connect(self.verificar_rolagem)
+
+        barra = view.verticalScrollBar()
+        barra.valueChanged.connect(self.verificar_rolagem)
+        barra.rangeChanged.connect(self.verificar_rolagem)
+
+    def recarregar(self):
+        """Descarta as páginas carregadas e busca a primeira novamente."""
+        self.apos_id = None
+        self.esgotado = False
+        self._buscar(primeira=True)
+
+    def carregar_proxima(self):
+        """Busca a próxima página, se houver e não houver busca em andamento."""
+        if self.esgotado or self.carregador.ocupado:
+            return
+        self._buscar(primeira=False)
+
+    def verificar_rolagem(self, *args):
+        """Busca a próxima página quando a view visível está a menos de uma tela do fim."""
+        if not self.view.isVisible() or (self.precisa_mais and not self.precisa_mais()):
+            return
+        barra = self.view.verticalScrollBar()
+        if barra.maximum() - barra.value() <= barra.pageStep():
+            self.carregar_proxima()
+
+    def _buscar(self, primeira):
+        limite, apos_id = self.tamanho_pagina, self.apos_id
+        self.carregador.carregar(
+            lambda: self.buscar_pagina(limite, apos_id),
+            lambda itens: self._pagina_recebida(itens, primeira),
+            self.ao_falhar
+        )
+
+    def _pagina_recebida(self, itens, primeira):
+        self.esgotado = len(itens) < self.tamanho_pagina
+        if itens:
+            self.apos_id = itens[-1].id
+        self.ao_receber(itens, primeira)
+        # Se a página não encheu a área visível, a próxima é buscada em seguida
+        self.temporizador.start(0)
@@ -0,0 +1,174 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+from PyQt5.QtCore import Qt, QEvent, QRect, QSize, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor, QPen, QPainter, QCursor, QFont, QFontMetrics
+from ui.styles import COLOR_BORDER, COLOR_PRIMARY_LIGHT, COLOR_TEXT_MAIN, COLOR_TEXT_SEC
+
+
+class DelegateBotoesAcao(QStyledItemDelegate):
+    """
+    Desenha botões de ação em uma célula da tabela sem criar widgets por linha.
+
+    Os botões são apenas pintados; o clique é identificado pela posição do
+    mouse e reportado pelo sinal acao_acionada com o nome da ação e o índice
+    da célula (no modelo da view, normalmente o proxy).
+    """
+
+    # Sinal emitido com o nome da ação clicada e o índice da célula
+    acao_acionada = pyqtSignal(str, QModelIndex)
+
+    LARGURA_BOTAO = 34
+    ALTURA_BOTAO = 30
+    MARGEM = 10
+    ESPACAMENTO = 8
+
+    def __init__(self, acoes, parent=None, filtro_acoes=None):
+        """
+        Inicializa o delegate.
+
+        Args:
+            acoes (list): Tuplas (nome, texto, dica) de cada botão, na ordem de exibição
+            parent: View dona do delegate
+            filtro_acoes (callable, optional): Recebe o índice da célula e retorna
+                se a ação (pelo nome) aparece naquela linha. Sem filtro, todas aparecem.
+        """
+        super().__init__(parent)
+        self.acoes = acoes
+        self.filtro_acoes = filtro_acoes
+
+    def acoes_visiveis(self, index) -> list:
+        """Retorna as ações exibidas na linha do índice."""
+        if self.filtro_acoes is None:
+            return self.acoes
+        return [acao for acao in self.acoes if self.filtro_acoes(index, acao[0])]
+
+    def retangulos_botoes(self, area: QRect, quantidade: int = None) -> list:
+        """Retorna o retângulo de cada botão dentro da área da célula."""
+        if quantidade is None:
+            quantidade = len(self.acoes)
+        topo = area.top() + (area.height() - self.ALTURA_BOTAO) // 2
+        retangulos = []
+        for posicao in range(quantidade):
+            esquerda = area.left() + self.MARGEM + posicao * (self.LARGURA_BOTAO + self.ESPACAMENTO)
+            retangulos.append(QRect(esquerda, topo, self.LARGURA_BOTAO, self.ALTURA_BOTAO))
+        return retangulos
+
+    def acao_na_posicao(self, area: QRect, posicao, index=None):
+        """Retorna a ação (nome, texto, dica) sob a posição, ou None."""
+        acoes = self.acoes if index is None else self.acoes_visiveis(index)
+        for acao, retangulo in zip(acoes, self.retangulos_botoes(area, len(acoes))):
+            if retangulo.contains(posicao):
+                return acao
+        return None
+
+    def paint(self, painter, option, index):
+        """Desenha o fundo da célula e os botões."""
+        super().paint(painter, option, index)
+
+        view = option.widget
+        posicao_mouse = view.viewport().mapFromGlobal(QCursor.pos()) if view else None
+
+        acoes = self.acoes_visiveis(index)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        for (_, texto, _), retangulo in zip(acoes, self.retangulos_botoes(option.rect, len(acoes))):
+            sob_mouse = (option.state & QStyle.State_MouseOver) and posicao_mouse is not None \
+                and retangulo.contains(posicao_mouse)
+            painter.setPen(QPen(QColor(COLOR_BORDER)))
+            painter.setBrush(QColor(COLOR_PRIMARY_LIGHT) if sob_mouse else QColor("#FFFFFF"))
+            painter.drawRoundedRect(retangulo, 6, 6)
+            painter.setPen(QColor(COLOR_TEXT_MAIN))
+            painter.drawText(retangulo, Qt.AlignCenter, texto)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """Emite acao_acionada quando um botão é clicado."""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            acao = self.acao_na_posicao(option.rect, event.pos(), index)
+            if acao:
+                self.acao_acionada.emit(acao[0], index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        """Exibe a dica do botão sob o mouse."""
+        if event.type() == QEvent.ToolTip:
+            acao = self.acao_na_posicao(option.rect, event.pos(), index)
+            if acao:
+                QToolTip.showText(event.globalPos(), acao[2], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def sizeHint(self, option, index):
+        """Largura suficiente para todos os botões."""
+        largura = 2 * self.MARGEM + len(self.acoes) * self.LARGURA_BOTAO \
+            + (len(self.acoes) - 1) * self.ESPACAMENTO
+        return QSize(largura, self.ALTURA_BOTAO + 2 * self.ESPACAMENTO)
+
+
+class DelegateBadgeStatus(QStyledItemDelegate):
+    """
+    Desenha o texto da célula como um badge arredondado (equivalente aos
+    QLabel#badge_* do tema), sem criar widgets por linha.
+    """
+
+    # Cores (fundo, texto) por texto exibido, as mesmas de badge_success/badge_warning
+    CORES_PADRAO = {
+        "Pago": ("#D5F4E6", "#27AE60"),
+        "Ativo": ("#D5F4E6", "#27AE60"),
+        "Pendente": ("#FEF5E7", "#F39C12"),
+    }
+
+    ALTURA_BADGE = 24
+    PADDING = 10
+
+    def __init__(self, cores=None, parent=None):
+        """
+        Inicializa o delegate.
+
+        Args:
+            cores (dict, optional): Texto do badge -> (cor de fundo, cor do texto)
+            parent: View dona do delegate
+        """
+        super().__init__(parent)
+        self.cores = cores or self.CORES_PADRAO
+        self.fonte = QFont()
+        self.fonte.setPointSize(8)
+        self.fonte.setBold(True)
+        self.metricas = QFontMetrics(self.fonte)
+
+    def paint(self, painter, option, index):
+        """Desenha o fundo da célula e o badge centralizado."""
+        texto = index.data(Qt.DisplayRole)
+        if texto is None:
+            return super().paint(painter, option, index)
+
+        # Fundo (seleção/linhas alternadas) sem o texto, que é desenhado no badge
+        opcao = option.__class__(option)
+        self.initStyleOption(opcao, index)
+        opcao.text = ""
+        estilo = option.widget.style() if option.widget else None
+        if estilo:
+            estilo.drawControl(QStyle.CE_ItemViewItem, opcao, painter, option.widget)
+
+        fundo, cor_texto = self.cores.get(texto, ("#EDF2F7", COLOR_TEXT_SEC))
+        largura = self.metricas.horizontalAdvance(texto) + 2 * self.PADDING
+        area = option.rect
+        badge = QRect(area.left() + (area.width() - largura) // 2,
+                      area.top() + (area.height() - self.ALTURA_BADGE) // 2,
+                      largura, self.ALTURA_BADGE)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(fundo))
+        painter.drawRoundedRect(badge, self.ALTURA_BADGE / 2, self.ALTURA_BADGE / 2)
+        painter.setFont(self.fonte)
+        painter.setPen(QColor(cor_texto))
+        painter.drawText(badge, Qt.AlignCenter, texto)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        """Largura do badge com margens."""
+        texto = index.data(Qt.DisplayRole) or ""
+        return QSize(self.metricas.horizontalAdvance(texto) + 2 * self.PADDING + 20,
+                     self.ALTURA_BADGE + 16)
@@ -8,7 +8,7 @@ from controllers.cliente_controller import ClienteController
 from controllers.produto_controller import ProdutoController
 from controllers.consignacao_controller import ConsignacaoController
 from models.cliente import Cliente
-from models.produto import Produto
+from models.produto import Produto, EstoqueInsuficiente
 
 class FormularioConsignacao(QDialog):
     """Formulário para criar e gerenciar consignações."""
@@ -203,37 +203,11 @@ class FormularioConsignacao(QDialog):
         
         # Carregar Produtos (apenas se criando)
         if not self.consignacao:
-            try:
-                # Preciso de um método para listar produtos no ProdutoController ou usar model direto
-                # Usando Produto.obter_todos() se existir ou controller
-                # Vou usar Produto.obter_todos() via hack ou adicionar no controller se não tiver
-                # Verifiquei ProdutoController e não vi 'listar_produtos'. Vou checar Produto model.
-                # Produto.obter_todos() não estava no snippet lido, mas geralmente existe.
-                # Vou assumir que existe ou usar SQL direto se falhar.
-                # Melhor: ler ProdutoController novamente ou assumir que existe algo similar.
-                # Vou usar uma query direta aqui se necessário, mas melhor tentar ser limpo.
-                from models.produto import Produto
-                # Assumindo que eu possa adicionar obter_todos no Produto se não tiver
-                pass
-            except:
-                pass
-                
-            # Popula combo produtos
-            # (Simplificação: listar todos)
-            # Na prática deveria ser paginado ou busca, mas ok para MVP
-            pass
-            
-            # Vou popular produtos no showEvent ou timer para não travar init
-            # Mas aqui vou chamar direto
             self.popular_produtos()
 
     def popular_produtos(self):
-        # TODO: Implementar listagem eficiente
-        # Por enquanto, vou tentar usar uma query direta ou adicionar metodo no controller
-        # Vou usar query direta para garantir
-        from database.db_manager import gerenciador_bd
-        rows = gerenciador_bd.buscar_todos("SELECT * FROM produtos WHERE quantidade > 0 ORDER BY nome")
-        self.produtos_cache = [Produto.from_row(row) for row in rows]
+        # Lista compartilhada (em cache) dos produtos; apenas os com estoque
+        self.produtos_cache = [p for p in ProdutoController.listar_produtos() if p.quantidade > 0]
         
         self.combo_produto.clear()
         for p in self.produtos_cache:
@@ -311,6 +285,9 @@ class FormularioConsignacao(QDialog):
                 self.accept()
             else:
                 QMessageBox.critical(self, "Erro", "Erro ao criar consignação.")
+        except EstoqueInsuficiente as e:
+            # Outra venda ou consignação levou as peças depois que os itens foram adicionados
+            QMessageBox.warning(self, "Estoque Insuficiente", f"A consignação não foi registrada.\n{str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro: {str(e)}")
 
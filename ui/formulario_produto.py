@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
 from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QFont, QPixmap
 from controllers.produto_controller import ProdutoController
-from models.produto import Produto
+from models.produto import Produto, EstoqueInsuficiente
 import os
 
 class FormularioProduto(QDialog):
@@ -220,7 +220,8 @@ class FormularioProduto(QDialog):
                     preco_custo=preco_custo,
                     preco_venda=preco_venda,
                     quantidade=quantidade,
-                    caminho_imagem=self.caminho_imagem
+                    caminho_imagem=self.caminho_imagem,
+                    quantidade_anterior=self.produto.quantidade
                 )
             else:
                 # Cria novo produto
@@ -238,5 +239,7 @@ class FormularioProduto(QDialog):
                 self.accept()
             else:
                 QMessageBox.critical(self, "Erro", "Não foi possível salvar o produto.")
+        except EstoqueInsuficiente as e:
+            QMessageBox.warning(self, "Estoque Insuficiente", f"O produto não foi alterado.\n{str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao salvar o produto:\n{str(e)}")
\ No newline at end of file
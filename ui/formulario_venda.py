@@ -10,7 +10,7 @@ from controllers.venda_controller import VendaController
 from controllers.produto_controller import ProdutoController
 from controllers.cliente_controller import ClienteController
 from models.venda import Venda
-from models.produto import Produto
+from models.produto import Produto, EstoqueInsuficiente
 from models.cliente import Cliente
 from datetime import datetime
 
@@ -453,5 +453,8 @@ class FormularioVenda(QDialog):
             else:
                 QMessageBox.critical(self, "Erro", "Não foi possível registrar a venda.")
                 
+        except EstoqueInsuficiente as e:
+            # Outro caixa vendeu as peças depois que os itens foram adicionados
+            QMessageBox.warning(self, "Estoque Insuficiente", f"A venda não foi registrada.\n{str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao registrar a venda:\n{str(e)}")
\ No newline at end of file
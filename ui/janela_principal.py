@@ -13,6 +13,7 @@ from ui.lista_vendas import ListaVendas
 from ui.lista_relatorios import ListaRelatorios
 from ui.lista_configuracoes import ListaConfiguracoes
 from ui.aba_cobrancas import AbaCobrancas
+from ui.busca import BuscaIncremental, BuscaNoBanco
 
 class JanelaPrincipal(QMainWindow):
     """Janela principal da aplicação com novo design integrado."""
@@ -93,19 +94,47 @@ class JanelaPrincipal(QMainWindow):
         """Cria o widget empilhado para as diferentes abas."""
         self.stacked_widget = QStackedWidget()
         
-        # Criar widgets para cada aba
-        self.criar_widget_dashboard()
-        self.criar_widget_produtos()
-        self.criar_widget_clientes()
-        self.criar_widget_vendas()
-        self.criar_widget_consignacoes()
-        self.criar_widget_cobrancas()
-        self.criar_widget_relatorios()
-        self.criar_widget_configuracoes()
+        # Fábricas das páginas, na ordem da sidebar. Cada página (e a consulta
+        # ao banco que ela dispara) só é criada na primeira navegação até ela.
+        self.fabricas_paginas = [
+            self.criar_widget_dashboard,
+            self.criar_widget_produtos,
+            self.criar_widget_clientes,
+            self.criar_widget_vendas,
+            self.criar_widget_consignacoes,
+            self.criar_widget_cobrancas,
+            self.criar_widget_relatorios,
+            self.criar_widget_configuracoes,
+        ]
+        self.paginas_criadas = set()
+        for _ in self.fabricas_paginas:
+            self.stacked_widget.addWidget(QWidget())
         
         self.layout_principal.addWidget(self.stacked_widget)
         self.nav_list.setCurrentRow(0) # Iniciar no Dashboard
         
+    def garantir_pagina(self, index):
+        """Cria a página do índice, substituindo o espaço reservado, se ainda não existir."""
+        if index in self.paginas_criadas or not 0 <= index < len(self.fabricas_paginas):
+            return
+        self.paginas_criadas.add(index)
+        pagina = self.fabricas_paginas[index]()
+        provisoria = self.stacked_widget.widget(index)
+        self.stacked_widget.insertWidget(index, pagina)
+        self.stacked_widget.removeWidget(provisoria)
+        provisoria.deleteLater()
+        # Latência das buscas por digitação exibida na barra de status
+        for busca in pagina.findChildren((BuscaIncremental, BuscaNoBanco)):
+            busca.concluida.connect(self.exibir_metricas_busca)
+        
+    def exibir_metricas_busca(self, termo, quantidade, ms_filtro, ms_total):
+        """Mostra na barra de status o resultado e o tempo da última busca."""
+        descricao = f'Busca "{termo}"' if termo else "Busca limpa"
+        self.status_bar.showMessage(
+            f"{descricao}: {quantidade} resultado(s) em {ms_filtro:.1f} ms "
+            f"({ms_total:.0f} ms após a última tecla)", 5000
+        )
+        
     def criar_widget_dashboard(self):
         """Cria o widget do dashboard moderno."""
         widget = QWidget()
@@ -167,7 +196,7 @@ class JanelaPrincipal(QMainWindow):
         layout.addWidget(container)
         
         layout.addStretch()
-        self.stacked_widget.addWidget(widget)
+        return widget
 
     def criar_card_dashboard(self, titulo, valor, icone, object_name):
         """Cria um card de resumo para o dashboard."""
@@ -196,40 +225,41 @@ class JanelaPrincipal(QMainWindow):
     def criar_widget_produtos(self):
         """Cria o widget de produtos."""
         self.lista_produtos = ListaProdutosMarketplace()
-        self.stacked_widget.addWidget(self.lista_produtos)
+        return self.lista_produtos
         
     def criar_widget_clientes(self):
         """Cria o widget de clientes."""
         self.lista_clientes = ListaClientes()
-        self.stacked_widget.addWidget(self.lista_clientes)
+        return self.lista_clientes
         
     def criar_widget_vendas(self):
         """Cria o widget de vendas."""
         self.lista_vendas = ListaVendas()
-        self.stacked_widget.addWidget(self.lista_vendas)
+        return self.lista_vendas
         
     def criar_widget_consignacoes(self):
         """Cria o widget de consignações."""
         self.lista_consignacoes = ListaConsignacoes()
-        self.stacked_widget.addWidget(self.lista_consignacoes)
+        return self.lista_consignacoes
         
     def criar_widget_cobrancas(self):
         """Cria o widget de cobranças."""
         self.aba_cobrancas = AbaCobrancas()
-        self.stacked_widget.addWidget(self.aba_cobrancas)
+        return self.aba_cobrancas
         
     def criar_widget_relatorios(self):
         """Cria o widget de relatórios."""
         self.lista_relatorios = ListaRelatorios()
-        self.stacked_widget.addWidget(self.lista_relatorios)
+        return self.lista_relatorios
         
     def criar_widget_configuracoes(self):
         """Cria o widget de configurações."""
         self.lista_configuracoes = ListaConfiguracoes()
-        self.stacked_widget.addWidget(self.lista_configuracoes)
+        return self.lista_configuracoes
         
     def mudar_aba(self, index):
-        """Muda a aba exibida conforme a seleção na sidebar."""
+        """Muda a aba exibida conforme a seleção na sidebar, criando-a no primeiro acesso."""
+        self.garantir_pagina(index)
         self.stacked_widget.setCurrentIndex(index)
         
     def criar_barra_status(self):
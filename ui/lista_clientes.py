@@ -2,11 +2,14 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QTableWidget, QTableWidgetItem, QHeaderView, 
                              QMessageBox, QAbstractItemView, QLabel, QLineEdit,
                              QSpacerItem, QSizePolicy, QFrame, QMenu)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, pyqtSignal, QModelIndex
+from PyQt5.QtGui import QFont, QColor, QCursor
 from models.cliente import Cliente
 from controllers.cliente_controller import ClienteController
 from ui.formulario_cliente import FormularioCliente
+from ui.delegates import DelegateBotoesAcao, DelegateBadgeStatus
+from ui.carregamento import CarregadorDados, IndicadorCarregamento, PaginadorRolagem
+from ui.busca import BuscaNoBanco
 
 class ListaClientes(QWidget):
     """Widget para exibir e gerenciar a lista de clientes."""
@@ -16,8 +19,9 @@ class ListaClientes(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.clientes = []
-        self.clientes_filtrados = []
+        self.clientes = []  # Clientes das páginas já buscadas para a busca atual
+        self.termo_busca = ""
+        self.versao_clientes = None
         self.inicializar_ui()
         self.carregar_clientes()
         
@@ -36,9 +40,22 @@ class ListaClientes(QWidget):
         # Cards de resumo
         self.criar_cards_resumo(layout_principal)
         
+        # Indicador de carregamento em segundo plano
+        self.indicador_carregamento = IndicadorCarregamento()
+        layout_principal.addWidget(self.indicador_carregamento)
+        self.carregador = CarregadorDados(self, self.indicador_carregamento)
+        # Contagens dos cards, em paralelo à primeira página
+        self.carregador_resumo = CarregadorDados(self)
+        
         # Tabela de clientes
         self.criar_tabela_clientes(layout_principal)
         
+        # Clientes da busca atual buscados por página conforme a rolagem
+        self.paginador = PaginadorRolagem(
+            self.tabela_clientes, self.carregador, self.buscar_pagina,
+            self.pagina_clientes_recebida, self.falha_carregamento
+        )
+        
     def criar_cabecalho_pagina(self, layout_principal):
         """Cria o cabeçalho da página com título e breadcrumb."""
         layout_header = QHBoxLayout()
@@ -110,8 +127,8 @@ class ListaClientes(QWidget):
         self.campo_busca = QLineEdit()
         self.campo_busca.setPlaceholderText("🔍 Buscar por nome, telefone ou email...")
         self.campo_busca.setMinimumWidth(300)
-        self.campo_busca.textChanged.connect(self.filtrar_clientes)
         layout_toolbar.addWidget(self.campo_busca)
+        self.busca = BuscaNoBanco(self.campo_busca, lambda termo: self.carregar_clientes(), self)
         
         # Botão atualizar
         btn_atualizar = QPushButton("↻ Atualizar")
@@ -204,8 +221,21 @@ class ListaClientes(QWidget):
         self.tabela_clientes.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tabela_clientes.setAlternatingRowColors(True)
         self.tabela_clientes.setShowGrid(False)
+        self.tabela_clientes.setMouseTracking(True)
         self.tabela_clientes.verticalHeader().setVisible(False)
         
+        # Status e ações desenhados por delegates (sem widgets por linha)
+        self.delegate_status = DelegateBadgeStatus(parent=self.tabela_clientes)
+        self.tabela_clientes.setItemDelegateForColumn(4, self.delegate_status)
+        self.delegate_acoes = DelegateBotoesAcao([
+            ("visualizar", "👁", "Visualizar detalhes"),
+            ("editar", "✏", "Editar cliente"),
+            ("excluir", "✖", "Excluir cliente"),
+            ("mais", "⋮", "Mais ações"),
+        ], self.tabela_clientes)
+        self.delegate_acoes.acao_acionada.connect(self.executar_acao_cliente)
+        self.tabela_clientes.setItemDelegateForColumn(5, self.delegate_acoes)
+        
         # Configurar cabeçalho
         header = self.tabela_clientes.horizontalHeader()
         header.setStretchLastSection(False)
@@ -222,33 +252,64 @@ class ListaClientes(QWidget):
         layout_container.addWidget(self.tabela_clientes)
         layout_principal.addWidget(container_tabela)
         
+    def showEvent(self, event):
+        """Recarrega ao voltar para a aba apenas se algum cliente foi gravado desde a carga."""
+        super().showEvent(event)
+        if self.versao_clientes != ClienteController.versao_clientes():
+            self.carregar_clientes()
+            
     def carregar_clientes(self):
-        """Carrega a lista de clientes."""
-        try:
-            self.clientes = ClienteController.listar_clientes()
-            self.clientes_filtrados = self.clientes.copy()
-            self.atualizar_resumo()
+        """Carrega a primeira página de clientes da busca atual e as contagens em segundo plano."""
+        self.versao_clientes = ClienteController.versao_clientes()
+        self.termo_busca = termo = self.campo_busca.text()
+        self.paginador.recarregar()
+        self.carregador_resumo.carregar(
+            lambda: (ClienteController.contar_clientes(), ClienteController.contar_clientes(termo)),
+            self.resumo_carregado,
+            self.falha_carregamento
+        )
+        
+    def buscar_pagina(self, limite, apos_id):
+        """Busca uma página da busca atual (executado fora da thread da interface)."""
+        return ClienteController.listar_clientes_pagina(limite, apos_id, self.termo_busca)
+        
+    def pagina_clientes_recebida(self, clientes, primeira):
+        """Exibe uma página de clientes recebida pelo paginador."""
+        if primeira:
+            self.clientes = clientes
             self.atualizar_tabela()
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível carregar os clientes:\n{str(e)}")
-            
-    def atualizar_resumo(self):
-        """Atualiza os cards de resumo."""
-        try:
-            total = len(self.clientes)
-            # Por enquanto, todos são considerados ativos
-            ativos = total
-            # Implementar lógica de dívidas se necessário
-            dividas = 0
-            # Novos este mês (simplificado)
-            novos = 0
+        else:
+            # Só as linhas da nova página são criadas; as anteriores ficam como estão
+            inicio = len(self.clientes)
+            self.clientes.extend(clientes)
+            self.atualizar_tabela(inicio)
+        
+    def falha_carregamento(self, mensagem):
+        """Informa a falha no carregamento dos clientes."""
+        self.busca.concluir(0)
+        QMessageBox.critical(self, "Erro", f"Não foi possível carregar os clientes:\n{mensagem}")
             
-            self.atualizar_card_valor(self.card_total, str(total))
-            self.atualizar_card_valor(self.card_ativos, str(ativos))
-            self.atualizar_card_valor(self.card_dividas, str(dividas))
-            self.atualizar_card_valor(self.card_novos, str(novos))
-        except Exception as e:
-            print(f"Erro ao atualizar resumo: {e}")
+    def resumo_carregado(self, contagens):
+        """
+        Atualiza os cards de resumo com as contagens do banco (as páginas
+        seguintes ainda não foram carregadas) e conclui a busca.
+        
+        Args:
+            contagens (tuple): (total de clientes, clientes encontrados pela busca)
+        """
+        total, encontrados = contagens
+        # Por enquanto, todos são considerados ativos
+        ativos = total
+        # Implementar lógica de dívidas se necessário
+        dividas = 0
+        # Novos este mês (simplificado)
+        novos = 0
+        
+        self.atualizar_card_valor(self.card_total, str(total))
+        self.atualizar_card_valor(self.card_ativos, str(ativos))
+        self.atualizar_card_valor(self.card_dividas, str(dividas))
+        self.atualizar_card_valor(self.card_novos, str(novos))
+        self.busca.concluir(encontrados)
             
     def atualizar_card_valor(self, card, valor):
         """Atualiza o valor em um card de resumo."""
@@ -260,11 +321,17 @@ class ListaClientes(QWidget):
                 if lbl_valor:
                     lbl_valor.setText(valor)
                     
-    def atualizar_tabela(self):
-        """Atualiza a tabela de clientes."""
-        self.tabela_clientes.setRowCount(len(self.clientes_filtrados))
+    def atualizar_tabela(self, inicio: int = 0):
+        """
+        Atualiza a tabela de clientes.
         
-        for linha, cliente in enumerate(self.clientes_filtrados):
+        Args:
+            inicio (int): Primeira linha a preencher; as anteriores são mantidas
+        """
+        self.tabela_clientes.setRowCount(len(self.clientes))
+        
+        for linha in range(inicio, len(self.clientes)):
+            cliente = self.clientes[linha]
             # Código
             item_codigo = QTableWidgetItem(str(cliente.id))
             item_codigo.setTextAlignment(Qt.AlignCenter)
@@ -283,81 +350,20 @@ class ListaClientes(QWidget):
             item_email = QTableWidgetItem(cliente.email or "---")
             self.tabela_clientes.setItem(linha, 3, item_email)
             
-            # Status
-            widget_status = self.criar_badge_status(cliente)
-            self.tabela_clientes.setCellWidget(linha, 4, widget_status)
-            
-            # Ações
-            widget_acoes = self.criar_widget_acoes(cliente)
-            self.tabela_clientes.setCellWidget(linha, 5, widget_acoes)
+            # Status (desenhado pelo DelegateBadgeStatus)
+            self.tabela_clientes.setItem(linha, 4, QTableWidgetItem("Ativo"))
             
-    def criar_badge_status(self, cliente):
-        """Cria o badge de status."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        badge = QLabel("Ativo")
-        badge.setObjectName("badge_confirmado")
-        badge.setAlignment(Qt.AlignCenter)
-        layout.addWidget(badge)
-        
-        return widget
-        
-    def criar_widget_acoes(self, cliente):
-        """Cria o widget com botões de ação."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)
-        layout.setSpacing(5)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        # Botão Visualizar
-        btn_view = QPushButton("👁")
-        btn_view.setObjectName("btn_action_view")
-        btn_view.setToolTip("Visualizar detalhes")
-        btn_view.clicked.connect(lambda: self.visualizar_cliente(cliente))
-        layout.addWidget(btn_view)
-        
-        # Botão Editar
-        btn_edit = QPushButton("✏")
-        btn_edit.setObjectName("btn_action_edit")
-        btn_edit.setToolTip("Editar cliente")
-        btn_edit.clicked.connect(lambda: self.editar_cliente(cliente))
-        layout.addWidget(btn_edit)
-        
-        # Botão Excluir
-        btn_delete = QPushButton("✖")
-        btn_delete.setObjectName("btn_action_delete")
-        btn_delete.setToolTip("Excluir cliente")
-        btn_delete.clicked.connect(lambda: self.excluir_cliente(cliente))
-        layout.addWidget(btn_delete)
-        
-        # Botão Mais
-        btn_more = QPushButton("⋮")
-        btn_more.setObjectName("btn_action_more")
-        btn_more.setToolTip("Mais ações")
-        btn_more.clicked.connect(lambda: self.mais_acoes_item(cliente))
-        layout.addWidget(btn_more)
-        
-        return widget
-        
-    def filtrar_clientes(self):
-        """Filtra a lista de clientes."""
-        texto_busca = self.campo_busca.text().lower()
-        
-        if not texto_busca:
-            self.clientes_filtrados = self.clientes.copy()
-        else:
-            self.clientes_filtrados = [
-                c for c in self.clientes
-                if (texto_busca in c.nome.lower() or
-                    (c.telefone and texto_busca in c.telefone.lower()) or
-                    (c.email and texto_busca in c.email.lower()))
-            ]
-        
-        self.atualizar_tabela()
+    def executar_acao_cliente(self, acao: str, index: QModelIndex):
+        """Executa a ação clicada na coluna de ações."""
+        cliente = self.clientes[index.row()]
+        if acao == "visualizar":
+            self.visualizar_cliente(cliente)
+        elif acao == "editar":
+            self.editar_cliente(cliente)
+        elif acao == "excluir":
+            self.excluir_cliente(cliente)
+        elif acao == "mais":
+            self.mais_acoes_item(cliente)
         
     def adicionar_cliente(self):
         """Adiciona um novo cliente."""
@@ -429,9 +435,7 @@ class ListaClientes(QWidget):
             menu.addAction("📧 Enviar email")
             menu.addAction("💬 Enviar SMS")
             
-            btn = self.sender()
-            if btn:
-                menu.exec_(btn.mapToGlobal(btn.rect().bottomLeft()))
+            menu.exec_(QCursor.pos())
         except Exception as e:
             self.editar_cliente(cliente)
             
@@ -439,7 +443,8 @@ class ListaClientes(QWidget):
         """Mostra vendas do cliente."""
         try:
             janela = self.window()
-            if hasattr(janela, "nav_list") and hasattr(janela, "lista_vendas"):
+            if hasattr(janela, "nav_list"):
+                # A página de vendas é criada na primeira navegação
                 janela.nav_list.setCurrentRow(3)
                 vendas = janela.lista_vendas
                 vendas.campo_busca.setText(cliente.nome)
@@ -452,7 +457,8 @@ class ListaClientes(QWidget):
         """Mostra dívidas do cliente."""
         try:
             janela = self.window()
-            if hasattr(janela, "nav_list") and hasattr(janela, "lista_vendas"):
+            if hasattr(janela, "nav_list"):
+                # A página de vendas é criada na primeira navegação
                 janela.nav_list.setCurrentRow(3)
                 vendas = janela.lista_vendas
                 vendas.campo_busca.setText(cliente.nome)
@@ -7,6 +7,14 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt5.QtCore import Qt, pyqtSignal, QSettings
 from PyQt5.QtGui import QFont, QColor, QPixmap
 import os
+from database.db_manager import gerenciador_bd, PERFIS_BANCO, PERFIL_BANCO_PADRAO
+from controllers.pagamento_controller import PagamentoController
+
+# Descrição exibida para cada perfil de banco de dados
+DESCRICOES_PERFIS_BANCO = {
+    "Desempenho": "Gravações mais rápidas; relatórios podem ser gerados enquanto o caixa registra vendas.",
+    "Padrão": "Modo tradicional do SQLite, com sincronização completa do arquivo a cada gravação.",
+}
 
 class ListaConfiguracoes(QWidget):
     """Widget para exibir e gerenciar as configurações do sistema."""
@@ -48,6 +56,9 @@ class ListaConfiguracoes(QWidget):
         # Grupo de backup
         self.criar_grupo_backup(layout_container)
         
+        # Grupo de banco de dados
+        self.criar_grupo_banco_dados(layout_container)
+        
         layout_principal.addWidget(container)
         
         # Botões de ação
@@ -265,6 +276,55 @@ class ListaConfiguracoes(QWidget):
         
         layout_pai.addWidget(grupo_backup)
         
+    def criar_grupo_banco_dados(self, layout_pai):
+        """Cria o grupo de configurações do banco de dados."""
+        grupo_banco = QGroupBox("Banco de Dados")
+        layout_grupo = QVBoxLayout(grupo_banco)
+        layout_grupo.setSpacing(15)
+        
+        # Perfil de desempenho
+        layout_perfil = QHBoxLayout()
+        lbl_perfil = QLabel("Perfil de Desempenho:")
+        lbl_perfil.setMinimumWidth(150)
+        layout_perfil.addWidget(lbl_perfil)
+        self.combo_perfil_banco = QComboBox()
+        self.combo_perfil_banco.addItems(list(PERFIS_BANCO))
+        self.combo_perfil_banco.setMaximumWidth(200)
+        self.combo_perfil_banco.currentTextChanged.connect(self.atualizar_descricao_perfil)
+        layout_perfil.addWidget(self.combo_perfil_banco)
+        layout_perfil.addStretch()
+        layout_grupo.addLayout(layout_perfil)
+        
+        self.lbl_descricao_perfil = QLabel()
+        self.lbl_descricao_perfil.setWordWrap(True)
+        self.lbl_descricao_perfil.setStyleSheet("color: #6B7280;")
+        layout_grupo.addWidget(self.lbl_descricao_perfil)
+        
+        # Recálculo dos saldos das vendas a partir dos pagamentos
+        layout_saldos = QHBoxLayout()
+        layout_saldos.addStretch()
+        self.btn_recalcular_saldos = QPushButton("🔄 Recalcular Saldos das Vendas")
+        self.btn_recalcular_saldos.setObjectName("secondary")
+        self.btn_recalcular_saldos.setMinimumWidth(200)
+        self.btn_recalcular_saldos.clicked.connect(self.recalcular_saldos)
+        layout_saldos.addWidget(self.btn_recalcular_saldos)
+        layout_grupo.addLayout(layout_saldos)
+        
+        layout_pai.addWidget(grupo_banco)
+        
+    def atualizar_descricao_perfil(self, perfil):
+        """Exibe a descrição do perfil de banco selecionado."""
+        self.lbl_descricao_perfil.setText(DESCRICOES_PERFIS_BANCO.get(perfil, ""))
+        
+    def recalcular_saldos(self):
+        """Recalcula o valor pago e o saldo de todas as vendas a partir dos pagamentos."""
+        try:
+            corrigidas = PagamentoController.recalcular_saldos()
+            QMessageBox.information(self, "Saldos das Vendas",
+                                    f"Saldos recalculados. {corrigidas} venda(s) corrigida(s).")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Falha ao recalcular os saldos:\n{str(e)}")
+            
     def criar_botoes_acao(self, layout_principal):
         """Cria os botões de ação."""
         layout_botoes = QHBoxLayout()
@@ -343,6 +403,11 @@ class ListaConfiguracoes(QWidget):
             index = self.combo_frequencia.findText(freq)
             if index >= 0:
                 self.combo_frequencia.setCurrentIndex(index)
+            perfil = self.configuracoes.value("perfil_banco", PERFIL_BANCO_PADRAO)
+            index = self.combo_perfil_banco.findText(perfil)
+            if index >= 0:
+                self.combo_perfil_banco.setCurrentIndex(index)
+            self.atualizar_descricao_perfil(self.combo_perfil_banco.currentText())
         except Exception as e:
             print(f"Erro ao carregar configurações: {e}")
         
@@ -354,6 +419,8 @@ class ListaConfiguracoes(QWidget):
             self.configuracoes.setValue("endereco", self.campo_endereco.text())
             self.configuracoes.setValue("diretorio_backup", self.campo_diretorio_backup.text())
             self.configuracoes.setValue("frequencia_backup", self.combo_frequencia.currentText())
+            self.configuracoes.setValue("perfil_banco", self.combo_perfil_banco.currentText())
+            gerenciador_bd.definir_perfil(self.combo_perfil_banco.currentText())
             
             QMessageBox.information(self, "Sucesso", "✓ Configurações salvas com sucesso!")
             self.configuracoes_salvas.emit()
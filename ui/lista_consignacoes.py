@@ -6,6 +6,7 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor
 from controllers.consignacao_controller import ConsignacaoController
 from ui.formulario_consignacao import FormularioConsignacao
+from ui.carregamento import CarregadorDados, IndicadorCarregamento
 
 class ListaConsignacoes(QWidget):
     """Widget para exibir e gerenciar a lista de consignações."""
@@ -34,6 +35,11 @@ class ListaConsignacoes(QWidget):
         # Cards de resumo
         self.criar_cards_resumo(layout_principal)
         
+        # Indicador de carregamento em segundo plano
+        self.indicador_carregamento = IndicadorCarregamento()
+        layout_principal.addWidget(self.indicador_carregamento)
+        self.carregador = CarregadorDados(self, self.indicador_carregamento)
+        
         # Tabela de consignações
         self.criar_tabela_consignacoes(layout_principal)
         
@@ -188,13 +194,19 @@ class ListaConsignacoes(QWidget):
         layout_principal.addWidget(self.tabela)
         
     def carregar_consignacoes(self):
-        """Carrega a lista de consignações do banco de dados."""
-        try:
-            self.consignacoes = ConsignacaoController.listar_consignacoes()
-            self.atualizar_tabela()
-            self.atualizar_cards_resumo()
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível carregar as consignações:\n{str(e)}")
+        """Carrega a lista de consignações do banco de dados em segundo plano."""
+        self.carregador.carregar(ConsignacaoController.listar_consignacoes,
+                                 self.consignacoes_carregadas, self.falha_carregamento)
+        
+    def consignacoes_carregadas(self, consignacoes):
+        """Exibe as consignações carregadas pelo carregador."""
+        self.consignacoes = consignacoes
+        self.atualizar_tabela()
+        self.atualizar_cards_resumo()
+        
+    def falha_carregamento(self, mensagem):
+        """Informa a falha no carregamento das consignações."""
+        QMessageBox.critical(self, "Erro", f"Não foi possível carregar as consignações:\n{mensagem}")
             
     def atualizar_cards_resumo(self):
         """Atualiza os valores nos cards de resumo."""
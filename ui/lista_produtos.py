@@ -1,12 +1,197 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, 
+                             QTableView, QHeaderView, 
                              QMessageBox, QAbstractItemView, QLabel, QLineEdit,
                              QComboBox, QSpacerItem, QSizePolicy, QFrame)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import (Qt, pyqtSignal, QAbstractTableModel, QSortFilterProxyModel,
+                          QModelIndex)
+from PyQt5.QtGui import QFont, QColor, QBrush
 from models.produto import Produto
 from controllers.produto_controller import ProdutoController
 from ui.formulario_produto import FormularioProduto
+from ui.delegates import DelegateBotoesAcao
+from ui.carregamento import CarregadorDados, IndicadorCarregamento
+from ui.busca import BuscaIncremental
+
+class ModeloTabelaProdutos(QAbstractTableModel):
+    """
+    Modelo da tabela de produtos.
+    
+    A view consulta data() apenas para as células visíveis, então nenhum item
+    é criado por linha; a lista inteira é trocada de uma vez em definir_produtos.
+    """
+    
+    COLUNAS = ["ID", "Nome", "Categoria", "Preço Custo", "Preço Venda", "Quantidade", "Ações"]
+    COLUNA_ACOES = 6
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.produtos = []
+        self.chaves_busca = []
+        self.ordenacao = None  # (coluna, ordem) aplicada em sort()
+        self.fonte_destaque = QFont("", -1, QFont.Bold)
+        self.cor_estoque_baixo = QBrush(QColor("#FF6B6B"))  # Vermelho
+        
+    def definir_produtos(self, produtos):
+        """Substitui os produtos exibidos."""
+        self.beginResetModel()
+        self.produtos = list(produtos)
+        if self.ordenacao:
+            self.produtos.sort(key=self.chave_ordenacao(self.ordenacao[0]),
+                               reverse=self.ordenacao[1] == Qt.DescendingOrder)
+        # Texto pré-processado para a busca não recalcular lower() a cada tecla
+        self.chaves_busca = [f"{p.nome}\n{p.categoria}".lower() for p in self.produtos]
+        self.endResetModel()
+        
+    @staticmethod
+    def chave_ordenacao(coluna: int):
+        """Função de chave para ordenar os produtos pela coluna."""
+        atributo = ("id", "nome", "categoria", "preco_custo", "preco_venda", "quantidade")[coluna]
+        if atributo in ("nome", "categoria"):
+            return lambda produto: getattr(produto, atributo).casefold()
+        return lambda produto: getattr(produto, atributo)
+        
+    def sort(self, coluna, ordem=Qt.AscendingOrder):
+        """Ordena a lista inteira de uma vez, preservando a seleção."""
+        if coluna < 0 or coluna == self.COLUNA_ACOES:
+            return
+        self.ordenacao = (coluna, ordem)
+        self.layoutAboutToBeChanged.emit()
+        indices_persistentes = self.persistentIndexList()
+        produtos_persistentes = [self.produtos[i.row()] for i in indices_persistentes]
+        
+        chave = self.chave_ordenacao(coluna)
+        posicoes = sorted(range(len(self.produtos)), key=lambda i: chave(self.produtos[i]),
+                          reverse=ordem == Qt.DescendingOrder)
+        self.produtos = [self.produtos[i] for i in posicoes]
+        self.chaves_busca = [self.chaves_busca[i] for i in posicoes]
+        
+        if indices_persistentes:
+            nova_linha = {id(produto): linha for linha, produto in enumerate(self.produtos)}
+            self.changePersistentIndexList(indices_persistentes, [
+                self.index(nova_linha[id(produto)], indice.column())
+                for produto, indice in zip(produtos_persistentes, indices_persistentes)
+            ])
+        self.layoutChanged.emit()
+        
+    def produto(self, linha: int) -> Produto:
+        """Retorna o produto da linha (no modelo de origem)."""
+        return self.produtos[linha]
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.produtos)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+        
+    def headerData(self, secao, orientacao, papel=Qt.DisplayRole):
+        if orientacao == Qt.Horizontal and papel == Qt.DisplayRole:
+            return self.COLUNAS[secao]
+        return None
+        
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        
+    def data(self, index, papel=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        produto = self.produtos[index.row()]
+        coluna = index.column()
+        
+        if papel == Qt.DisplayRole:
+            if coluna == 0:
+                return str(produto.id)
+            if coluna == 1:
+                return produto.nome
+            if coluna == 2:
+                return produto.categoria
+            if coluna == 3:
+                return f"R$ {produto.preco_custo:.2f}"
+            if coluna == 4:
+                return f"R$ {produto.preco_venda:.2f}"
+            if coluna == 5:
+                return str(produto.quantidade)
+            return None
+        
+        if papel == Qt.TextAlignmentRole:
+            if coluna in (0, 5):
+                return Qt.AlignCenter
+            if coluna in (3, 4):
+                return Qt.AlignRight | Qt.AlignVCenter
+            return None
+        
+        # Colorir quantidade baixa
+        if coluna == 5 and produto.quantidade <= 5:
+            if papel == Qt.ForegroundRole:
+                return self.cor_estoque_baixo
+            if papel == Qt.FontRole:
+                return self.fonte_destaque
+        return None
+
+
+class FiltroProdutosProxy(QSortFilterProxyModel):
+    """Filtra os produtos por categoria e termo de busca sem recriar a tabela."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.termo_busca = ""
+        self.categoria = None
+        self.ids_busca = None
+        self.linhas_aceitas = None  # Resultado do filtro por linha do modelo de origem
+        
+    def setSourceModel(self, modelo):
+        super().setSourceModel(modelo)
+        # Linhas trocadas ou reordenadas: o filtro é reavaliado sob demanda
+        modelo.modelAboutToBeReset.connect(self.descartar_filtro_calculado)
+        modelo.layoutAboutToBeChanged.connect(self.descartar_filtro_calculado)
+        
+    def descartar_filtro_calculado(self):
+        self.linhas_aceitas = None
+        
+    def definir_filtro(self, termo_busca: str, categoria: str = None, ids_busca: set = None):
+        """
+        Atualiza os critérios de filtro.
+        
+        Args:
+            termo_busca (str): Trecho procurado no nome ou na categoria
+            categoria (str, opcional): Categoria exata, ou None para todas
+            ids_busca (set, opcional): IDs encontrados pela busca textual do banco;
+                quando informado, substitui a comparação por trecho
+        """
+        termo_busca = termo_busca.lower()
+        if (termo_busca, categoria, ids_busca) == (self.termo_busca, self.categoria, self.ids_busca):
+            return
+        self.termo_busca = termo_busca
+        self.categoria = categoria
+        self.ids_busca = ids_busca
+        self.linhas_aceitas = None
+        self.invalidateFilter()
+        
+    def calcular_filtro(self) -> list:
+        """Avalia o filtro para todas as linhas de uma vez, em Python puro."""
+        modelo = self.sourceModel()
+        termo, categoria = self.termo_busca, self.categoria
+        if self.ids_busca is not None:
+            ids = self.ids_busca
+            return [
+                (not categoria or produto.categoria == categoria) and produto.id in ids
+                for produto in modelo.produtos
+            ]
+        return [
+            (not categoria or produto.categoria == categoria) and termo in chave
+            for produto, chave in zip(modelo.produtos, modelo.chaves_busca)
+        ]
+        
+    def filterAcceptsRow(self, linha, parent):
+        # Chamado pelo Qt para cada linha: apenas consulta o resultado pré-calculado
+        if self.linhas_aceitas is None:
+            self.linhas_aceitas = self.calcular_filtro()
+        return self.linhas_aceitas[linha]
+        
+    def sort(self, coluna, ordem=Qt.AscendingOrder):
+        # Ordena no modelo de origem (uma única ordenação em Python), em vez
+        # das comparações célula a célula do proxy a cada filtragem
+        self.sourceModel().sort(coluna, ordem)
+
 
 class ListaProdutos(QWidget):
     """Widget para exibir e gerenciar a lista de produtos."""
@@ -17,7 +202,9 @@ class ListaProdutos(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.produtos = []
-        self.produtos_filtrados = []
+        self.versao_produtos = None
+        self.termo_busca = ""
+        self.ids_busca = None  # IDs encontrados pela busca por digitação (None: sem busca)
         self.inicializar_ui()
         self.carregar_produtos()
         
@@ -36,6 +223,11 @@ class ListaProdutos(QWidget):
         # Cards de resumo
         self.criar_cards_resumo(layout_principal)
         
+        # Indicador de carregamento em segundo plano
+        self.indicador_carregamento = IndicadorCarregamento()
+        layout_principal.addWidget(self.indicador_carregamento)
+        self.carregador = CarregadorDados(self, self.indicador_carregamento)
+        
         # Tabela de produtos
         self.criar_tabela_produtos(layout_principal)
         
@@ -109,8 +301,9 @@ class ListaProdutos(QWidget):
         self.campo_busca = QLineEdit()
         self.campo_busca.setPlaceholderText("🔍 Buscar produtos...")
         self.campo_busca.setMinimumWidth(250)
-        self.campo_busca.textChanged.connect(self.filtrar_produtos)
         layout_toolbar.addWidget(self.campo_busca)
+        self.busca = BuscaIncremental(self.campo_busca, lambda: self.produtos,
+                                      self.criar_filtro_busca, self.busca_concluida, self)
         
         layout_principal.addWidget(frame_toolbar)
 
@@ -174,11 +367,12 @@ class ListaProdutos(QWidget):
 
     def criar_tabela_produtos(self, layout_principal):
         """Cria a tabela de produtos com estilo moderno."""
-        self.tabela_produtos = QTableWidget()
-        self.tabela_produtos.setColumnCount(7)
-        self.tabela_produtos.setHorizontalHeaderLabels([
-            "ID", "Nome", "Categoria", "Preço Custo", "Preço Venda", "Quantidade", "Ações"
-        ])
+        self.modelo_produtos = ModeloTabelaProdutos(self)
+        self.proxy_produtos = FiltroProdutosProxy(self)
+        self.proxy_produtos.setSourceModel(self.modelo_produtos)
+        
+        self.tabela_produtos = QTableView()
+        self.tabela_produtos.setModel(self.proxy_produtos)
         
         # Configurações da tabela
         self.tabela_produtos.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -186,6 +380,18 @@ class ListaProdutos(QWidget):
         self.tabela_produtos.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tabela_produtos.setAlternatingRowColors(True)
         self.tabela_produtos.setShowGrid(False)  # Remove grades verticais para visual mais limpo
+        self.tabela_produtos.setSortingEnabled(True)
+        self.tabela_produtos.sortByColumn(1, Qt.AscendingOrder)
+        self.tabela_produtos.setMouseTracking(True)
+        self.tabela_produtos.verticalHeader().setVisible(False)
+        
+        # Botões de ação desenhados pelo delegate (sem widgets por linha)
+        self.delegate_acoes = DelegateBotoesAcao([
+            ("editar", "✏️", "Editar Produto"),
+            ("excluir", "🗑️", "Excluir Produto"),
+        ], self.tabela_produtos)
+        self.delegate_acoes.acao_acionada.connect(self.executar_acao_produto)
+        self.tabela_produtos.setItemDelegateForColumn(ModeloTabelaProdutos.COLUNA_ACOES, self.delegate_acoes)
         
         # Configurar cabeçalho
         header = self.tabela_produtos.horizontalHeader()
@@ -195,22 +401,40 @@ class ListaProdutos(QWidget):
         header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Preço Venda
         header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Quantidade
         header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Ações
+        # Ajusta as colunas pelas linhas visíveis, não pela tabela inteira
+        header.setResizeContentsPrecision(0)
         
-        # Altura das linhas
+        # Altura fixa das linhas (evita medir cada linha)
+        self.tabela_produtos.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.tabela_produtos.verticalHeader().setDefaultSectionSize(50)
         
         layout_principal.addWidget(self.tabela_produtos)
         
+    def showEvent(self, event):
+        """Recarrega ao voltar para a aba apenas se algum produto foi gravado desde a carga."""
+        super().showEvent(event)
+        if self.versao_produtos != ProdutoController.versao_produtos():
+            self.carregar_produtos()
+            
     def carregar_produtos(self):
-        """Carrega a lista de produtos do banco de dados."""
-        try:
-            self.produtos = ProdutoController.listar_produtos()
-            self.produtos_filtrados = self.produtos.copy()
-            self.atualizar_tabela()
-            self.atualizar_cards_resumo()
-            self.produtos_atualizados.emit()
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível carregar os produtos:\n{str(e)}")
+        """Carrega a lista de produtos do banco de dados em segundo plano."""
+        self.versao_produtos = ProdutoController.versao_produtos()
+        self.carregador.carregar(ProdutoController.listar_produtos, self.produtos_carregados,
+                                 self.falha_carregamento)
+        
+    def produtos_carregados(self, produtos):
+        """Exibe os produtos carregados pelo carregador."""
+        self.produtos = produtos
+        self.modelo_produtos.definir_produtos(self.produtos)
+        # Refaz a busca textual: produtos novos ou renomeados podem passar a corresponder
+        self.busca.invalidar()
+        self.busca.executar_agora()
+        self.atualizar_cards_resumo()
+        self.produtos_atualizados.emit()
+        
+    def falha_carregamento(self, mensagem):
+        """Informa a falha no carregamento dos produtos."""
+        QMessageBox.critical(self, "Erro", f"Não foi possível carregar os produtos:\n{mensagem}")
             
     def atualizar_cards_resumo(self):
         """Atualiza os valores nos cards de resumo."""
@@ -222,98 +446,35 @@ class ListaProdutos(QWidget):
         self.lbl_estoque_baixo.setText(str(estoque_baixo))
         self.lbl_valor_estoque.setText(f"R$ {valor_estoque:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
 
+    def criar_filtro_busca(self, termo):
+        """Filtro da busca: produtos encontrados pelo índice de texto do banco (sem acentos, por prefixo)."""
+        ids = ProdutoController.buscar_ids_produtos(termo)
+        if ids is None:
+            return None
+        return lambda produto: produto.id in ids
+        
+    def busca_concluida(self, resultados, termo):
+        """Aplica à tabela o resultado da busca por digitação."""
+        self.termo_busca = termo
+        self.ids_busca = {p.id for p in resultados} if termo else None
+        self.filtrar_produtos()
+        
     def filtrar_produtos(self):
         """Filtra os produtos com base nos critérios selecionados."""
-        termo_busca = self.campo_busca.text().lower()
         categoria = self.combo_categoria.currentText()
+        self.proxy_produtos.definir_filtro(
+            self.termo_busca,
+            None if categoria == "Todas as categorias" else categoria,
+            self.ids_busca
+        )
         
-        self.produtos_filtrados = self.produtos.copy()
-        
-        # Filtrar por categoria
-        if categoria != "Todas as categorias":
-            self.produtos_filtrados = [
-                p for p in self.produtos_filtrados 
-                if p.categoria == categoria
-            ]
-            
-        # Filtrar por termo de busca
-        if termo_busca:
-            self.produtos_filtrados = [
-                p for p in self.produtos_filtrados 
-                if termo_busca in p.nome.lower() or termo_busca in p.categoria.lower()
-            ]
-            
-        self.atualizar_tabela()
-        
-    def atualizar_tabela(self):
-        """Atualiza a tabela com os produtos."""
-        self.tabela_produtos.setRowCount(len(self.produtos_filtrados))
-        
-        for linha, produto in enumerate(self.produtos_filtrados):
-            # Coluna ID
-            item_id = QTableWidgetItem(str(produto.id))
-            item_id.setTextAlignment(Qt.AlignCenter)
-            item_id.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.tabela_produtos.setItem(linha, 0, item_id)
-            
-            # Coluna Nome
-            item_nome = QTableWidgetItem(produto.nome)
-            item_nome.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.tabela_produtos.setItem(linha, 1, item_nome)
-            
-            # Coluna Categoria
-            item_categoria = QTableWidgetItem(produto.categoria)
-            item_categoria.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.tabela_produtos.setItem(linha, 2, item_categoria)
-            
-            # Coluna Preço Custo
-            item_custo = QTableWidgetItem(f"R$ {produto.preco_custo:.2f}")
-            item_custo.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            item_custo.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.tabela_produtos.setItem(linha, 3, item_custo)
-            
-            # Coluna Preço Venda
-            item_venda = QTableWidgetItem(f"R$ {produto.preco_venda:.2f}")
-            item_venda.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            item_venda.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.tabela_produtos.setItem(linha, 4, item_venda)
-            
-            # Coluna Quantidade
-            item_quantidade = QTableWidgetItem(str(produto.quantidade))
-            item_quantidade.setTextAlignment(Qt.AlignCenter)
-            item_quantidade.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            
-            # Colorir quantidade baixa
-            if produto.quantidade <= 5:
-                item_quantidade.setForeground(QColor("#FF6B6B"))  # Vermelho
-                item_quantidade.setFont(QFont("", -1, QFont.Bold))
-                
-            self.tabela_produtos.setItem(linha, 5, item_quantidade)
-            
-            # Coluna Ações (botões)
-            widget_acoes = QWidget()
-            layout_acoes = QHBoxLayout(widget_acoes)
-            layout_acoes.setContentsMargins(10, 5, 10, 5)
-            layout_acoes.setSpacing(8)
-            
-            btn_editar = QPushButton("✏️")
-            btn_editar.setObjectName("btn_action_edit")
-            btn_editar.setToolTip("Editar Produto")
-            btn_editar.clicked.connect(lambda checked, p=produto: self.editar_produto(p))
-            layout_acoes.addWidget(btn_editar)
-            
-            btn_excluir = QPushButton("🗑️")
-            btn_excluir.setObjectName("btn_action_delete")
-            btn_excluir.setToolTip("Excluir Produto")
-            btn_excluir.clicked.connect(lambda checked, p=produto: self.excluir_produto(p))
-            layout_acoes.addWidget(btn_excluir)
-            
-            layout_acoes.addStretch()
-            self.tabela_produtos.setCellWidget(linha, 6, widget_acoes)
-            
-        # Ajustar altura das linhas
-        for i in range(self.tabela_produtos.rowCount()):
-            self.tabela_produtos.setRowHeight(i, 50)
+    def executar_acao_produto(self, acao: str, index: QModelIndex):
+        """Executa a ação clicada na coluna de ações."""
+        produto = self.modelo_produtos.produto(self.proxy_produtos.mapToSource(index).row())
+        if acao == "editar":
+            self.editar_produto(produto)
+        elif acao == "excluir":
+            self.excluir_produto(produto)
             
     def adicionar_produto(self):
         """Abre o formulário para adicionar um novo produto."""
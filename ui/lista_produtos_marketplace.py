@@ -1,9 +1,10 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QScrollArea, QFrame, QMessageBox, QLabel, QLineEdit,
                              QComboBox, QSpinBox, QGridLayout, QGroupBox,
-                             QDialog, QListWidget, QTextEdit, QSizePolicy, QFileDialog)
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
-from PyQt5.QtGui import QPixmap, QFont, QColor, QPainter, QPainterPath
+                             QDialog, QListWidget, QTextEdit, QSizePolicy, QFileDialog,
+                             QListView, QStyledItemDelegate, QStyle, QAbstractItemView)
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QRect, QEvent, QModelIndex, QAbstractListModel
+from PyQt5.QtGui import QPixmap, QFont, QColor, QPainter, QPainterPath, QPen, QCursor
 from PyQt5.QtPrintSupport import QPrinter
 from models.produto import Produto
 from models.cliente import Cliente
@@ -12,87 +13,253 @@ from controllers.produto_controller import ProdutoController
 from controllers.cliente_controller import ClienteController
 from controllers.venda_controller import VendaController
 from ui.formulario_produto import FormularioProduto
+from ui.miniaturas import cache_miniaturas, TAMANHO_CARD, TAMANHO_PDF
+from ui.styles import COLOR_BORDER, COLOR_DARK, COLOR_PRIMARY
+from ui.busca import BuscaIncremental
 import os
 
-class ProdutoCard(QFrame):
-    """Componente customizado para exibir um produto com design moderno."""
+# Papel do modelo que indica se o produto está selecionado
+PAPEL_SELECIONADO = Qt.UserRole + 1
+
+class ModeloCardsProdutos(QAbstractListModel):
+    """
+    Modelo da grade de produtos do marketplace.
+    
+    Guarda os produtos exibidos e a seleção (por ID, de modo que ela sobrevive
+    às trocas de filtro). As miniaturas são pedidas ao cache apenas quando a
+    view consulta um item visível.
+    """
     
-    adicionado_ao_carrinho = pyqtSignal(object)
-    selecionado_alterado = pyqtSignal(object, bool)
+    # Emitido quando a seleção muda, com a quantidade de produtos selecionados
+    selecao_alterada = pyqtSignal(int)
     
-    def __init__(self, produto, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.produto = produto
-        self.setObjectName("card_produto_moderno")
-        self.setFixedSize(300, 420)
-        self.selecionado = False
-        self.inicializar_ui()
+        self.produtos = []
+        self.linhas_por_id = {}
+        self.ids_selecionados = set()
+        self.miniaturas_pendentes = set()
         
-    def inicializar_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-        layout.setSpacing(10)
-        
-        self.lbl_imagem = QLabel()
-        self.lbl_imagem.setFixedSize(260, 190)
-        self.lbl_imagem.setObjectName("placeholder_imagem_moderna")
-        self.lbl_imagem.setAlignment(Qt.AlignCenter)
-        if getattr(self.produto, "caminho_imagem", None) and os.path.exists(self.produto.caminho_imagem):
-            pix = QPixmap(self.produto.caminho_imagem).scaled(260, 190, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.lbl_imagem.setPixmap(pix)
+    def definir_produtos(self, produtos):
+        """Substitui os produtos exibidos, mantendo a seleção."""
+        self.beginResetModel()
+        self.produtos = list(produtos)
+        self.linhas_por_id = {produto.id: linha for linha, produto in enumerate(self.produtos)}
+        self.endResetModel()
+        
+    def produto(self, linha: int):
+        """Retorna o produto da linha."""
+        return self.produtos[linha]
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.produtos)
+        
+    def data(self, index, papel=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        produto = self.produtos[index.row()]
+        if papel == Qt.DisplayRole:
+            return produto.nome
+        if papel == Qt.DecorationRole:
+            return self.miniatura(produto)
+        if papel == PAPEL_SELECIONADO:
+            return produto.id in self.ids_selecionados
+        return None
+        
+    def miniatura(self, produto):
+        """Miniatura do produto, ou None enquanto ela é gerada (ou se não há imagem)."""
+        caminho = getattr(produto, "caminho_imagem", None)
+        if not caminho:
+            return None
+        # Um único callback por produto enquanto a miniatura está pendente
+        ao_carregar = None
+        if produto.id not in self.miniaturas_pendentes:
+            ao_carregar = lambda _, produto_id=produto.id: self._miniatura_pronta(produto_id)
+        pixmap = cache_miniaturas().solicitar(caminho, TAMANHO_CARD, ao_carregar)
+        if pixmap is None and ao_carregar is not None:
+            self.miniaturas_pendentes.add(produto.id)
+        return pixmap
+        
+    def _miniatura_pronta(self, produto_id):
+        self.miniaturas_pendentes.discard(produto_id)
+        linha = self.linhas_por_id.get(produto_id)
+        if linha is not None:
+            indice = self.index(linha)
+            self.dataChanged.emit(indice, indice, [Qt.DecorationRole])
+        
+    def alternar_selecao(self, linha: int):
+        """Marca ou desmarca o produto da linha."""
+        produto_id = self.produtos[linha].id
+        if produto_id in self.ids_selecionados:
+            self.ids_selecionados.discard(produto_id)
         else:
-            self.lbl_imagem.setText("💎")
-            self.lbl_imagem.setStyleSheet("background-color: #F8F9FA; border-radius: 12px; font-size: 60px; color: #BDC3C7;")
-        layout.addWidget(self.lbl_imagem)
+            self.ids_selecionados.add(produto_id)
+        indice = self.index(linha)
+        self.dataChanged.emit(indice, indice, [PAPEL_SELECIONADO])
+        self.selecao_alterada.emit(len(self.ids_selecionados))
         
-        # Informações
-        lbl_categoria = QLabel(self.produto.categoria.upper() if self.produto.categoria else "GERAL")
-        lbl_categoria.setStyleSheet("color: #27AE60; font-weight: bold; font-size: 10px; letter-spacing: 1px;")
-        layout.addWidget(lbl_categoria)
-        
-        lbl_nome = QLabel(self.produto.nome)
-        lbl_nome.setObjectName("produto_nome_moderno")
-        lbl_nome.setWordWrap(True)
-        lbl_nome.setStyleSheet("font-size: 16px; font-weight: bold; color: #34495E;")
-        layout.addWidget(lbl_nome)
-        
-        lbl_ref = QLabel(f"REF: {self.produto.id:04d}")
-        lbl_ref.setStyleSheet("color: #95A5A6; font-size: 11px;")
-        layout.addWidget(lbl_ref)
-        
-        layout.addStretch()
-        
-        h_layout = QHBoxLayout()
-        lbl_preco = QLabel(f"R$ {self.produto.preco_venda:,.2f}")
-        lbl_preco.setStyleSheet("font-size: 20px; font-weight: 800; color: #2C3E50;")
-        h_layout.addWidget(lbl_preco)
+    def selecionar_todos(self):
+        """Seleciona todos os produtos exibidos."""
+        self.ids_selecionados.update(self.linhas_por_id)
+        self._selecao_redefinida()
+        
+    def limpar_selecao(self):
+        """Desmarca todos os produtos, inclusive os ocultos pelo filtro."""
+        self.ids_selecionados.clear()
+        self._selecao_redefinida()
+        
+    def _selecao_redefinida(self):
+        if self.produtos:
+            self.dataChanged.emit(self.index(0), self.index(len(self.produtos) - 1), [PAPEL_SELECIONADO])
+        self.selecao_alterada.emit(len(self.ids_selecionados))
+
 
-        btn_edit = QPushButton("✏")
-        btn_edit.setFixedSize(40, 40)
-        btn_edit.setObjectName("btn_action_edit")
-        btn_edit.clicked.connect(self.editar_produto)
-        h_layout.addWidget(btn_edit)
-        
-        layout.addLayout(h_layout)
-        
-        btn_add_full = QPushButton("Adicionar à sacola")
-        btn_add_full.setObjectName("primary")
-        btn_add_full.setMinimumHeight(40)
-        btn_add_full.clicked.connect(lambda: self.adicionado_ao_carrinho.emit(self.produto))
-        layout.addWidget(btn_add_full)
+class DelegateCardProduto(QStyledItemDelegate):
+    """
+    Desenha cada produto como um card (imagem, categoria, nome, referência,
+    preço e botões) sem criar widgets por item.
     
-    def toggle_selecao(self):
-        self.selecionado = not self.selecionado
-        self.setStyleSheet("border: 2px solid #2ECC71;" if self.selecionado else "")
-        self.selecionado_alterado.emit(self.produto, self.selecionado)
+    Como em DelegateBotoesAcao, os botões são apenas pintados e o clique é
+    identificado pela posição: acao_acionada recebe "editar", "adicionar" ou,
+    para cliques no restante do card, "selecionar".
+    """
     
-    def editar_produto(self):
-        try:
-            formulario = FormularioProduto(produto=self.produto, parent=self)
-            if formulario.exec_():
-                self.parent().parent().parent().carregar_produtos()
-        except Exception:
-            pass
+    acao_acionada = pyqtSignal(str, QModelIndex)
+    
+    LARGURA = 300
+    ALTURA = 420
+    MARGEM = 15
+    ALTURA_IMAGEM = 190
+    ALTURA_BOTAO = 40
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.fonte_categoria = QFont()
+        self.fonte_categoria.setPixelSize(10)
+        self.fonte_categoria.setBold(True)
+        self.fonte_nome = QFont()
+        self.fonte_nome.setPixelSize(16)
+        self.fonte_nome.setBold(True)
+        self.fonte_ref = QFont()
+        self.fonte_ref.setPixelSize(11)
+        self.fonte_preco = QFont()
+        self.fonte_preco.setPixelSize(20)
+        self.fonte_preco.setWeight(QFont.ExtraBold)
+        self.fonte_placeholder = QFont()
+        self.fonte_placeholder.setPixelSize(60)
+        self.fonte_botao = QFont()
+        self.fonte_botao.setBold(True)
+        
+    def retangulos(self, area: QRect) -> dict:
+        """Retorna as áreas do card dentro do retângulo do item."""
+        card = QRect(area.left(), area.top(), self.LARGURA, self.ALTURA)
+        interno = card.adjusted(self.MARGEM, self.MARGEM, -self.MARGEM, -self.MARGEM)
+        adicionar = QRect(interno.left(), interno.bottom() - self.ALTURA_BOTAO + 1,
+                          interno.width(), self.ALTURA_BOTAO)
+        editar = QRect(interno.right() - self.ALTURA_BOTAO + 1, adicionar.top() - 10 - self.ALTURA_BOTAO,
+                       self.ALTURA_BOTAO, self.ALTURA_BOTAO)
+        return {
+            "card": card,
+            "imagem": QRect(interno.left(), interno.top(), interno.width(), self.ALTURA_IMAGEM),
+            "categoria": QRect(interno.left(), interno.top() + self.ALTURA_IMAGEM + 10, interno.width(), 16),
+            "nome": QRect(interno.left(), interno.top() + self.ALTURA_IMAGEM + 32, interno.width(), 44),
+            "ref": QRect(interno.left(), interno.top() + self.ALTURA_IMAGEM + 80, interno.width(), 16),
+            "preco": QRect(interno.left(), editar.top(), editar.left() - interno.left() - 10, self.ALTURA_BOTAO),
+            "editar": editar,
+            "adicionar": adicionar,
+        }
+        
+    def acao_na_posicao(self, area: QRect, posicao):
+        """Retorna a ação sob a posição ("editar", "adicionar", "selecionar") ou None."""
+        retangulos = self.retangulos(area)
+        for acao in ("editar", "adicionar"):
+            if retangulos[acao].contains(posicao):
+                return acao
+        return "selecionar" if retangulos["card"].contains(posicao) else None
+        
+    def paint(self, painter, option, index):
+        """Desenha o card do produto."""
+        produto = index.model().produto(index.row())
+        retangulos = self.retangulos(option.rect)
+        selecionado = index.data(PAPEL_SELECIONADO)
+        sob_mouse = bool(option.state & QStyle.State_MouseOver)
+        
+        view = option.widget
+        posicao_mouse = view.viewport().mapFromGlobal(QCursor.pos()) if view and sob_mouse else None
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Fundo e borda (verde quando selecionado ou sob o mouse)
+        if selecionado:
+            painter.setPen(QPen(QColor("#2ECC71"), 2))
+        else:
+            painter.setPen(QPen(QColor(COLOR_PRIMARY if sob_mouse else COLOR_BORDER)))
+        painter.setBrush(QColor("#FFFFFF"))
+        painter.drawRoundedRect(retangulos["card"].adjusted(1, 1, -1, -1), 12, 12)
+        
+        # Imagem ou placeholder enquanto a miniatura não está pronta
+        area_imagem = retangulos["imagem"]
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            x = area_imagem.left() + (area_imagem.width() - pixmap.width()) // 2
+            y = area_imagem.top() + (area_imagem.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#F8F9FA"))
+            painter.drawRoundedRect(area_imagem, 12, 12)
+            painter.setFont(self.fonte_placeholder)
+            painter.setPen(QColor("#BDC3C7"))
+            painter.drawText(area_imagem, Qt.AlignCenter, "💎")
+        
+        # Informações
+        painter.setFont(self.fonte_categoria)
+        painter.setPen(QColor("#27AE60"))
+        painter.drawText(retangulos["categoria"], Qt.AlignLeft | Qt.AlignVCenter,
+                         produto.categoria.upper() if produto.categoria else "GERAL")
+        
+        painter.setFont(self.fonte_nome)
+        painter.setPen(QColor("#34495E"))
+        painter.drawText(retangulos["nome"], Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, produto.nome)
+        
+        painter.setFont(self.fonte_ref)
+        painter.setPen(QColor("#95A5A6"))
+        painter.drawText(retangulos["ref"], Qt.AlignLeft | Qt.AlignVCenter, f"REF: {produto.id:04d}")
+        
+        painter.setFont(self.fonte_preco)
+        painter.setPen(QColor("#2C3E50"))
+        painter.drawText(retangulos["preco"], Qt.AlignLeft | Qt.AlignVCenter, f"R$ {produto.preco_venda:,.2f}")
+        
+        # Botões
+        editar, adicionar = retangulos["editar"], retangulos["adicionar"]
+        painter.setFont(self.fonte_botao)
+        painter.setPen(QPen(QColor(COLOR_BORDER)))
+        sobre_editar = posicao_mouse is not None and editar.contains(posicao_mouse)
+        painter.setBrush(QColor("#F7FAFC" if sobre_editar else "#FFFFFF"))
+        painter.drawRoundedRect(editar, 6, 6)
+        painter.setPen(QColor(COLOR_DARK))
+        painter.drawText(editar, Qt.AlignCenter, "✏")
+        
+        painter.setPen(Qt.NoPen)
+        sobre_adicionar = posicao_mouse is not None and adicionar.contains(posicao_mouse)
+        painter.setBrush(QColor("#38A169" if sobre_adicionar else COLOR_PRIMARY))
+        painter.drawRoundedRect(adicionar, 6, 6)
+        painter.setPen(QColor("#FFFFFF"))
+        painter.drawText(adicionar, Qt.AlignCenter, "Adicionar à sacola")
+        painter.restore()
+        
+    def editorEvent(self, event, model, option, index):
+        """Emite acao_acionada com a ação sob o clique."""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            acao = self.acao_na_posicao(option.rect, event.pos())
+            if acao:
+                self.acao_acionada.emit(acao, index)
+                return True
+        return super().editorEvent(event, model, option, index)
+        
+    def sizeHint(self, option, index):
+        return QSize(self.LARGURA, self.ALTURA)
 
 class ListaProdutosMarketplace(QWidget):
     """Aba de Produtos padronizada com o novo Design System."""
@@ -100,8 +267,8 @@ class ListaProdutosMarketplace(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.produtos = []
+        self.versao_produtos = None
         self.carrinho = CarrinhoCompras()
-        self.selecionados = []
         self.inicializar_ui()
         self.carregar_produtos()
         
@@ -137,12 +304,14 @@ class ListaProdutosMarketplace(QWidget):
         self.campo_busca = QLineEdit()
         self.campo_busca.setPlaceholderText("🔍 Pesquisar por nome ou referência...")
         self.campo_busca.setMinimumWidth(400)
-        self.campo_busca.textChanged.connect(self.filtrar_produtos)
         layout_toolbar.addWidget(self.campo_busca)
+        self.busca = BuscaIncremental(self.campo_busca, lambda: self.produtos,
+                                      self.criar_filtro_busca, self.busca_concluida, self)
         
         self.combo_cat = QComboBox()
         self.combo_cat.addItems(["Todas as Categorias", "Anéis", "Brincos", "Colares", "Relógios"])
         self.combo_cat.setMinimumWidth(200)
+        self.combo_cat.currentTextChanged.connect(self.filtrar_produtos)
         layout_toolbar.addWidget(self.combo_cat)
         
         layout_toolbar.addStretch()
@@ -186,19 +355,26 @@ class ListaProdutosMarketplace(QWidget):
         
         layout_principal.addWidget(frame_actions)
         
-        # Área de Scroll dos Cards
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setObjectName("scroll_area_clean")
-        self.scroll.setStyleSheet("background: transparent; border: none;")
+        # Grade de cards: apenas os itens visíveis são desenhados pelo delegate
+        self.modelo_cards = ModeloCardsProdutos(self)
+        self.modelo_cards.selecao_alterada.connect(self.atualizar_selecao)
+        self.delegate_card = DelegateCardProduto(self)
+        self.delegate_card.acao_acionada.connect(self.executar_acao_card)
         
-        self.widget_cards = QWidget()
-        self.layout_grid = QGridLayout(self.widget_cards)
-        self.layout_grid.setSpacing(20)
-        self.layout_grid.setAlignment(Qt.AlignLeft | Qt.AlignTop)
-        
-        self.scroll.setWidget(self.widget_cards)
-        layout_principal.addWidget(self.scroll)
+        self.grade_produtos = QListView()
+        self.grade_produtos.setObjectName("scroll_area_clean")
+        self.grade_produtos.setStyleSheet("background: transparent; border: none;")
+        self.grade_produtos.setViewMode(QListView.IconMode)
+        self.grade_produtos.setResizeMode(QListView.Adjust)
+        self.grade_produtos.setMovement(QListView.Static)
+        self.grade_produtos.setUniformItemSizes(True)
+        self.grade_produtos.setSpacing(10)
+        self.grade_produtos.setSelectionMode(QAbstractItemView.NoSelection)
+        self.grade_produtos.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.grade_produtos.setMouseTracking(True)
+        self.grade_produtos.setModel(self.modelo_cards)
+        self.grade_produtos.setItemDelegate(self.delegate_card)
+        layout_principal.addWidget(self.grade_produtos)
         
         barra = QFrame()
         barra.setObjectName("toolbar_header")
@@ -222,31 +398,65 @@ class ListaProdutosMarketplace(QWidget):
         hbar.addWidget(btn_limpar)
         layout_principal.addWidget(barra)
         
+    def showEvent(self, event):
+        """Recarrega ao voltar para a aba apenas se algum produto foi gravado desde a carga."""
+        super().showEvent(event)
+        if self.versao_produtos != ProdutoController.versao_produtos():
+            self.carregar_produtos()
+            
     def carregar_produtos(self):
         """Busca produtos no banco e preenche a grid."""
         try:
+            self.versao_produtos = ProdutoController.versao_produtos()
             self.produtos = ProdutoController.listar_produtos()
-            self.atualizar_grid(self.produtos)
+            self.filtrar_produtos()
         except Exception as e:
             print(f"Erro ao carregar produtos: {e}")
             
     def atualizar_grid(self, lista_produtos):
-        """Limpa e preenche a grid de cards."""
-        # Limpar grid atual
-        for i in reversed(range(self.layout_grid.count())): 
-            self.layout_grid.itemAt(i).widget().setParent(None)
+        """Exibe os produtos na grade de cards."""
+        self.modelo_cards.definir_produtos(lista_produtos)
+        
+    @property
+    def selecionados(self) -> list:
+        """Produtos selecionados, inclusive os ocultos pelo filtro atual."""
+        ids = self.modelo_cards.ids_selecionados
+        return [p for p in self.produtos if p.id in ids]
+        
+    def executar_acao_card(self, acao: str, index: QModelIndex):
+        """Executa a ação clicada em um card."""
+        produto = self.modelo_cards.produto(index.row())
+        if acao == "adicionar":
+            self.adicionar_item_carrinho(produto)
+        elif acao == "editar":
+            self.editar_produto(produto)
+        elif acao == "selecionar":
+            self.modelo_cards.alternar_selecao(index.row())
             
-        colunas = 4
-        for index, prod in enumerate(lista_produtos):
-            card = ProdutoCard(prod)
-            card.adicionado_ao_carrinho.connect(self.adicionar_item_carrinho)
-            card.selecionado_alterado.connect(self.atualizar_selecao)
-            self.layout_grid.addWidget(card, index // colunas, index % colunas)
+    def editar_produto(self, produto):
+        formulario = FormularioProduto(produto=produto, parent=self)
+        if formulario.exec_():
+            self.carregar_produtos()
             
     def filtrar_produtos(self):
-        termo = self.campo_busca.text().lower()
+        """Refaz a busca e o filtro de categoria sobre os produtos carregados."""
+        self.busca.invalidar()
+        self.busca.executar_agora()
+        
+    def criar_filtro_busca(self, termo):
+        # Busca textual no banco, só os IDs; a posição no resultado é a ordem de relevância
+        ids = ProdutoController.buscar_ids_produtos_por_relevancia(termo)
+        if ids is None:
+            self.relevancia = None
+            return None
+        self.relevancia = {produto_id: posicao for posicao, produto_id in enumerate(ids)}
+        return lambda produto: produto.id in self.relevancia
+        
+    def busca_concluida(self, resultados, termo):
+        filtrados = resultados
+        if termo and self.relevancia is not None:
+            filtrados = sorted(resultados, key=lambda p: self.relevancia[p.id])
         cat = self.combo_cat.currentText()
-        filtrados = [p for p in self.produtos if termo in p.nome.lower()]
         if cat and cat != "Todas as Categorias":
             filtrados = [p for p in filtrados if (p.categoria or "").lower() == cat.lower()]
         self.atualizar_grid(filtrados)
@@ -256,27 +466,14 @@ class ListaProdutosMarketplace(QWidget):
         if formulario.exec_():
             self.carregar_produtos()
     
-    def atualizar_selecao(self, produto, selecionado):
-        if selecionado:
-            if produto not in self.selecionados:
-                self.selecionados.append(produto)
-        else:
-            self.selecionados = [p for p in self.selecionados if p.id != produto.id]
-        self.lbl_selecionados.setText(f"Selecionados: {len(self.selecionados)}")
+    def atualizar_selecao(self, quantidade):
+        self.lbl_selecionados.setText(f"Selecionados: {quantidade}")
     
     def selecionar_todos(self):
-        for i in range(self.layout_grid.count()):
-            w = self.layout_grid.itemAt(i).widget()
-            if isinstance(w, ProdutoCard) and not w.selecionado:
-                w.toggle_selecao()
+        self.modelo_cards.selecionar_todos()
     
     def limpar_selecao(self):
-        for i in range(self.layout_grid.count()):
-            w = self.layout_grid.itemAt(i).widget()
-            if isinstance(w, ProdutoCard) and w.selecionado:
-                w.toggle_selecao()
-        self.selecionados = []
-        self.lbl_selecionados.setText("Selecionados: 0")
+        self.modelo_cards.limpar_selecao()
     
     def adicionar_item_carrinho(self, produto):
         self.carrinho.adicionar_item(produto, 1)
@@ -300,11 +497,11 @@ class ListaProdutosMarketplace(QWidget):
             y = margem
             largura = printer.pageRect().width() - 2*margem
             linha_altura = 120
-            itens = self.selecionados if self.selecionados else self.produtos
+            itens = self.selecionados or self.produtos
             for p in itens:
                 painter.drawText(x, y, f"{p.nome}  •  R$ {p.preco_venda:.2f}  •  REF {p.id:04d}")
-                if getattr(p, "caminho_imagem", None) and os.path.exists(p.caminho_imagem):
-                    pix = QPixmap(p.caminho_imagem).scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pix = cache_miniaturas().obter(p.caminho_imagem, TAMANHO_PDF) if getattr(p, "caminho_imagem", None) else None
+                if pix is not None:
                     painter.drawPixmap(x + largura - 120, y - 20, pix)
                 y += linha_altura
                 if y + linha_altura > printer.pageRect().height() - margem:
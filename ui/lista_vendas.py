@@ -3,12 +3,16 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QMessageBox, QAbstractItemView, QLabel, QLineEdit,
                              QComboBox, QDateEdit, QSpacerItem, QSizePolicy,
                              QGroupBox, QFrame, QMenu, QInputDialog)
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
-from PyQt5.QtGui import QFont, QColor
-from models.venda import Venda
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QModelIndex
+from PyQt5.QtGui import QFont, QColor, QCursor
+from models.venda import Venda, FiltroVendas
 from controllers.venda_controller import VendaController
 from ui.formulario_venda import FormularioVenda
-from datetime import datetime, date
+from ui.delegates import DelegateBotoesAcao, DelegateBadgeStatus
+from ui.carregamento import CarregadorDados, IndicadorCarregamento, PaginadorRolagem
+from ui.busca import BuscaNoBanco
+from dataclasses import replace
+from datetime import datetime, date, time
 
 class ListaVendas(QWidget):
     """Widget para exibir e gerenciar a lista de vendas."""
@@ -18,8 +22,9 @@ class ListaVendas(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.vendas = []
-        self.vendas_filtradas = []
+        self.vendas = []  # Linhas (LinhaVenda) das páginas já buscadas para o filtro atual
+        self.vendas_filtradas = self.vendas
+        self.filtro = FiltroVendas()
         self.inicializar_ui()
         self.carregar_vendas()
         
@@ -38,9 +43,22 @@ class ListaVendas(QWidget):
         # Cards de resumo
         self.criar_cards_resumo(layout_principal)
         
+        # Indicador de carregamento em segundo plano
+        self.indicador_carregamento = IndicadorCarregamento()
+        layout_principal.addWidget(self.indicador_carregamento)
+        self.carregador = CarregadorDados(self, self.indicador_carregamento)
+        # Totais dos cards, em paralelo à primeira página
+        self.carregador_resumo = CarregadorDados(self)
+        
         # Tabela de vendas
         self.criar_tabela_vendas(layout_principal)
         
+        # Vendas do filtro atual buscadas por página conforme a rolagem
+        self.paginador = PaginadorRolagem(
+            self.tabela_vendas, self.carregador, self.buscar_pagina,
+            self.pagina_vendas_recebida, self.falha_carregamento
+        )
+        
     def criar_cabecalho_pagina(self, layout_principal):
         """Cria o cabeçalho da página."""
         layout_header = QHBoxLayout()
@@ -130,10 +148,15 @@ class ListaVendas(QWidget):
         self.combo_status.setFixedWidth(100)
         layout_toolbar.addWidget(self.combo_status)
         
+        self.date_inicio.dateChanged.connect(self.filtrar_vendas)
+        self.date_fim.dateChanged.connect(self.filtrar_vendas)
+        self.combo_status.currentIndexChanged.connect(self.filtrar_vendas)
+        
         self.campo_busca = QLineEdit()
         self.campo_busca.setPlaceholderText("🔍 Buscar cliente...")
         self.campo_busca.setFixedWidth(180)
         layout_toolbar.addWidget(self.campo_busca)
+        self.busca = BuscaNoBanco(self.campo_busca, lambda termo: self.carregar_vendas(), self)
         
         btn_atualizar = QPushButton("↻")
         btn_atualizar.setObjectName("secondary")
@@ -223,8 +246,21 @@ class ListaVendas(QWidget):
         self.tabela_vendas.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tabela_vendas.setAlternatingRowColors(True)
         self.tabela_vendas.setShowGrid(False)
+        self.tabela_vendas.setMouseTracking(True)
         self.tabela_vendas.verticalHeader().setVisible(False)
         
+        # Status e ações desenhados por delegates (sem widgets por linha)
+        self.delegate_status = DelegateBadgeStatus(parent=self.tabela_vendas)
+        self.tabela_vendas.setItemDelegateForColumn(5, self.delegate_status)
+        self.delegate_acoes = DelegateBotoesAcao([
+            ("visualizar", "👁", "Visualizar detalhes"),
+            ("editar", "✏", "Editar venda"),
+            ("excluir", "✖", "Excluir venda"),
+            ("mais", "⋮", "Mais ações"),
+        ], self.tabela_vendas, filtro_acoes=self.acao_disponivel)
+        self.delegate_acoes.acao_acionada.connect(self.executar_acao_venda)
+        self.tabela_vendas.setItemDelegateForColumn(6, self.delegate_acoes)
+        
         # Configurar cabeçalho
         header = self.tabela_vendas.horizontalHeader()
         header.setStretchLastSection(False)
@@ -243,30 +279,64 @@ class ListaVendas(QWidget):
         layout_principal.addWidget(container_tabela)
         
     def carregar_vendas(self):
-        """Carrega a lista de vendas."""
-        try:
-            self.vendas = VendaController.listar_vendas()
-            self.vendas_filtradas = self.vendas.copy()
-            self.filtrar_vendas()
-            self.atualizar_resumo()
-            self.vendas_atualizadas.emit()
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível carregar as vendas:\n{str(e)}")
-            
-    def atualizar_resumo(self):
-        """Atualiza os cards de resumo."""
-        try:
-            total_vendas = len(self.vendas_filtradas)
-            valor_pagas = sum(v.valor_total for v in self.vendas_filtradas if v.status == "pago")
-            valor_pendentes = sum(v.valor_total for v in self.vendas_filtradas if v.status == "pendente")
-            valor_total = sum(v.valor_total for v in self.vendas_filtradas)
+        """Carrega a primeira página de vendas do filtro atual e os totais em segundo plano."""
+        self.filtro = filtro = self.filtro_atual()
+        self.paginador.recarregar()
+        self.carregador_resumo.carregar(
+            lambda: VendaController.totais_vendas(filtro),
+            self.resumo_carregado,
+            self.falha_carregamento
+        )
+        
+    def filtro_atual(self) -> FiltroVendas:
+        """Lê o período, o status e a busca por cliente da barra de ferramentas."""
+        return FiltroVendas(
+            data_inicio=self.date_inicio.date().toPyDate(),
+            data_fim=self.date_fim.date().toPyDate(),
+            status=self.combo_status.currentData() or "",
+            termo_cliente=self.campo_busca.text()
+        )
+        
+    def buscar_pagina(self, limite, apos_id):
+        """Busca uma página do filtro atual (executado fora da thread da interface)."""
+        return VendaController.consultar_vendas(replace(self.filtro, limite=limite, apos_id=apos_id))
+        
+    def pagina_vendas_recebida(self, vendas, primeira):
+        """Exibe uma página de vendas recebida pelo paginador."""
+        if primeira:
+            self.vendas = self.vendas_filtradas = vendas
+            self.atualizar_tabela()
+        else:
+            # Só as linhas da nova página são criadas; as anteriores ficam como estão
+            inicio = len(self.vendas)
+            self.vendas.extend(vendas)
+            self.atualizar_tabela(inicio)
+        self.vendas_atualizadas.emit()
+        
+    def falha_carregamento(self, mensagem):
+        """Informa a falha no carregamento das vendas."""
+        self.busca.concluir(0)
+        QMessageBox.critical(self, "Erro", f"Não foi possível carregar as vendas:\n{mensagem}")
             
-            self.atualizar_card_valor(self.card_total, str(total_vendas))
-            self.atualizar_card_valor(self.card_pagas, f"R$ {valor_pagas:,.2f}")
-            self.atualizar_card_valor(self.card_pendentes, f"R$ {valor_pendentes:,.2f}")
-            self.atualizar_card_valor(self.card_valor_total, f"R$ {valor_total:,.2f}")
-        except Exception as e:
-            print(f"Erro ao atualizar resumo: {e}")
+    def resumo_carregado(self, totais):
+        """
+        Atualiza os cards de resumo com os totais de todas as vendas do filtro,
+        inclusive das páginas ainda não carregadas, e conclui a busca.
+        
+        Args:
+            totais (dict): Quantidade e valor total das vendas do filtro, por status
+        """
+        vazio = {'valor_total': 0.0, 'quantidade': 0}
+        total_vendas = sum(t['quantidade'] for t in totais.values())
+        valor_pagas = totais.get("pago", vazio)['valor_total']
+        valor_pendentes = totais.get("pendente", vazio)['valor_total']
+        valor_total = sum(t['valor_total'] for t in totais.values())
+        
+        self.atualizar_card_valor(self.card_total, str(total_vendas))
+        self.atualizar_card_valor(self.card_pagas, f"R$ {valor_pagas:,.2f}")
+        self.atualizar_card_valor(self.card_pendentes, f"R$ {valor_pendentes:,.2f}")
+        self.atualizar_card_valor(self.card_valor_total, f"R$ {valor_total:,.2f}")
+        self.busca.concluir(total_vendas)
             
     def atualizar_card_valor(self, card, valor):
         """Atualiza o valor em um card."""
@@ -279,45 +349,20 @@ class ListaVendas(QWidget):
                     lbl_valor.setText(valor)
             
     def filtrar_vendas(self):
-        """Filtra as vendas."""
-        try:
-            data_inicio = self.date_inicio.date().toPyDate()
-            data_fim = self.date_fim.date().toPyDate()
-            status = self.combo_status.currentData()
-            termo_busca = self.campo_busca.text().lower()
-            
-            self.vendas_filtradas = self.vendas.copy()
-            
-            # Filtrar por data
-            self.vendas_filtradas = [
-                v for v in self.vendas_filtradas 
-                if v.data_venda.date() >= data_inicio and v.data_venda.date() <= data_fim
-            ]
-            
-            # Filtrar por status
-            if status:
-                self.vendas_filtradas = [
-                    v for v in self.vendas_filtradas 
-                    if v.status == status
-                ]
-                
-            # Filtrar por busca
-            if termo_busca:
-                self.vendas_filtradas = [
-                    v for v in self.vendas_filtradas 
-                    if (v.cliente and termo_busca in v.cliente.nome.lower())
-                ]
-                
-            self.atualizar_tabela()
-            self.atualizar_resumo()
-        except Exception as e:
-            print(f"Erro ao filtrar vendas: {e}")
+        """Refaz a consulta com o período, o status e a busca por cliente atuais."""
+        self.busca.executar_agora()
+        
+    def atualizar_tabela(self, inicio: int = 0):
+        """
+        Atualiza a tabela de vendas.
         
-    def atualizar_tabela(self):
-        """Atualiza a tabela de vendas."""
+        Args:
+            inicio (int): Primeira linha a preencher; as anteriores são mantidas
+        """
         self.tabela_vendas.setRowCount(len(self.vendas_filtradas))
         
-        for linha, venda in enumerate(self.vendas_filtradas):
+        for linha in range(inicio, len(self.vendas_filtradas)):
+            venda = self.vendas_filtradas[linha]
             # Código
             item_id = QTableWidgetItem(str(venda.id))
             item_id.setTextAlignment(Qt.AlignCenter)
@@ -330,7 +375,7 @@ class ListaVendas(QWidget):
             self.tabela_vendas.setItem(linha, 1, item_data)
             
             # Cliente
-            nome_cliente = venda.cliente.nome if venda.cliente else "Não informado"
+            nome_cliente = venda.cliente_nome or "Não informado"
             item_cliente = QTableWidgetItem(nome_cliente)
             self.tabela_vendas.setItem(linha, 2, item_cliente)
             
@@ -345,71 +390,32 @@ class ListaVendas(QWidget):
             item_tipo.setTextAlignment(Qt.AlignCenter)
             self.tabela_vendas.setItem(linha, 4, item_tipo)
             
-            # Status
-            widget_status = self.criar_badge_status(venda)
-            self.tabela_vendas.setCellWidget(linha, 5, widget_status)
+            # Status (desenhado pelo DelegateBadgeStatus)
+            status = "Pago" if venda.status == "pago" else "Pendente"
+            self.tabela_vendas.setItem(linha, 5, QTableWidgetItem(status))
             
-            # Ações
-            widget_acoes = self.criar_widget_acoes(venda)
-            self.tabela_vendas.setCellWidget(linha, 6, widget_acoes)
-            
-    def criar_badge_status(self, venda):
-        """Cria o badge de status."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        if venda.status == "pago":
-            badge = QLabel("Pago")
-            badge.setObjectName("badge_confirmado")
-        else:
-            badge = QLabel("Pendente")
-            badge.setObjectName("badge_pendente")
-        
-        badge.setAlignment(Qt.AlignCenter)
-        layout.addWidget(badge)
-        
-        return widget
-        
-    def criar_widget_acoes(self, venda):
-        """Cria o widget de ações."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)
-        layout.setSpacing(5)
-        layout.setAlignment(Qt.AlignCenter)
-        
-        # Botão Visualizar
-        btn_view = QPushButton("👁")
-        btn_view.setObjectName("btn_action_view")
-        btn_view.setToolTip("Visualizar detalhes")
-        btn_view.clicked.connect(lambda: self.visualizar_venda(venda))
-        layout.addWidget(btn_view)
-        
-        # Botão Editar (só se pendente)
-        if venda.status == "pendente":
-            btn_edit = QPushButton("✏")
-            btn_edit.setObjectName("btn_action_edit")
-            btn_edit.setToolTip("Editar venda")
-            btn_edit.clicked.connect(lambda: self.editar_venda(venda))
-            layout.addWidget(btn_edit)
-        
-        # Botão Excluir
-        btn_delete = QPushButton("✖")
-        btn_delete.setObjectName("btn_action_delete")
-        btn_delete.setToolTip("Excluir venda")
-        btn_delete.clicked.connect(lambda: self.excluir_venda(venda))
-        layout.addWidget(btn_delete)
-        
-        # Botão Mais
-        btn_more = QPushButton("⋮")
-        btn_more.setObjectName("btn_action_more")
-        btn_more.setToolTip("Mais ações")
-        btn_more.clicked.connect(lambda: self.mais_acoes_item(venda))
-        layout.addWidget(btn_more)
-        
-        return widget
+    def acao_disponivel(self, index: QModelIndex, acao: str) -> bool:
+        """Indica se a ação aparece na linha (editar só para vendas pendentes)."""
+        if acao == "editar":
+            return self.vendas_filtradas[index.row()].status == "pendente"
+        return True
+        
+    def executar_acao_venda(self, acao: str, index: QModelIndex):
+        """Executa a ação clicada na coluna de ações."""
+        # A linha da tabela tem só as colunas exibidas; as ações usam a venda completa
+        venda = VendaController.obter_venda(self.vendas_filtradas[index.row()].id)
+        if venda is None:
+            QMessageBox.warning(self, "Aviso", "A venda não foi encontrada. A lista será atualizada.")
+            self.carregar_vendas()
+            return
+        if acao == "visualizar":
+            self.visualizar_venda(venda)
+        elif acao == "editar":
+            self.editar_venda(venda)
+        elif acao == "excluir":
+            self.excluir_venda(venda)
+        elif acao == "mais":
+            self.mais_acoes_item(venda)
         
     def registrar_venda(self):
         """Registra uma nova venda."""
@@ -490,9 +496,7 @@ class ListaVendas(QWidget):
             menu.addAction("📄 Imprimir recibo")
             menu.addAction("📧 Enviar por email")
             
-            btn = self.sender()
-            if btn:
-                menu.exec_(btn.mapToGlobal(btn.rect().bottomLeft()))
+            menu.exec_(QCursor.pos())
         except Exception as e:
             if venda.status == "pendente":
                 self.registrar_pagamento(venda)
@@ -0,0 +1,278 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QElapsedTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QImage, QPixmap
+
+# Tamanhos (largura, altura) em que as imagens de produto são exibidas
+TAMANHO_CARD = (260, 190)
+TAMANHO_PDF = (100, 100)
+
+# Quantidade de miniaturas mantidas em memória
+CAPACIDADE_MEMORIA = 512
+
+# Diretório padrão das miniaturas em disco, ao lado do banco de dados
+DIRETORIO_MINIATURAS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "miniaturas"
+)
+
+
+def assinatura_arquivo(caminho: str):
+    """
+    Retorna (caminho, mtime, tamanho) do arquivo, ou None se ele não existe.
+
+    A assinatura muda quando o arquivo é substituído ou alterado e evita
+    recalcular o hash do conteúdo a cada exibição.
+    """
+    try:
+        estado = os.stat(caminho)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (caminho, estado.st_mtime_ns, estado.st_size)
+
+
+class SinaisMiniatura(QObject):
+    """Sinais de uma tarefa de miniatura (emitidos a partir da thread de trabalho)."""
+
+    # Chave da solicitação, hash do conteúdo, imagem reduzida (None em caso de falha)
+    # e mensagem de erro (vazia se não houve)
+    concluida = pyqtSignal(object, str, object, str)
+
+
+class TarefaMiniatura(QRunnable):
+    """Gera (ou lê do disco) a miniatura de uma imagem em uma thread do pool."""
+
+    def __init__(self, chave, cache):
+        super().__init__()
+        self.chave = chave
+        self.cache = cache
+        self.sinais = SinaisMiniatura()
+
+    def run(self):
+        assinatura, largura, altura = self.chave
+        try:
+            hash_conteudo, imagem, erro = self.cache.gerar_imagem(assinatura, largura, altura)
+        except Exception as e:
+            hash_conteudo, imagem, erro = "", None, f"Erro ao gerar miniatura de {assinatura[0]}: {e}"
+        self.sinais.concluida.emit(self.chave, hash_conteudo, imagem, erro)
+
+
+class CacheMiniaturas(QObject):
+    """
+    Cache de miniaturas das imagens de produto em dois níveis.
+
+    Em disco, cada miniatura é gravada uma vez por tamanho, com o nome derivado
+    do hash do conteúdo da imagem: trocar a imagem (mesmo mantendo o caminho)
+    gera uma nova chave, e imagens iguais em produtos diferentes compartilham a
+    miniatura. Em memória, os QPixmaps mais recentes ficam em um LRU.
+
+    A decodificação e a redução das imagens acontecem em threads de trabalho
+    (QImage); apenas a conversão final para QPixmap roda na thread da interface.
+    """
+
+    # Caminho da imagem original e mensagem de erro (emitido na thread da interface)
+    falhou = pyqtSignal(str, str)
+
+    def __init__(self, diretorio: str = DIRETORIO_MINIATURAS, capacidade: int = CAPACIDADE_MEMORIA,
+                 pool: QThreadPool = None, parent=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio (str): Diretório das miniaturas em disco
+            capacidade (int): Quantidade de QPixmaps mantidos em memória
+            pool (QThreadPool, optional): Pool de threads; por padrão um pool próprio
+                de duas threads, para não disputar com os carregamentos das listas
+            parent: Objeto dono do cache
+        """
+        super().__init__(parent)
+        self.diretorio = diretorio
+        self.capacidade = capacidade
+        if pool is None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(2)
+        self.pool = pool
+
+        self.pixmaps = OrderedDict()  # (hash, largura, altura) -> QPixmap
+        self.pendentes = {}  # (assinatura, largura, altura) -> [callbacks]
+        self.tarefas = {}  # Mantém as tarefas (e seus sinais) vivas até a conclusão
+
+        # Compartilhados com as threads de trabalho
+        self._trava = threading.Lock()
+        self._hashes = {}  # assinatura -> hash do conteúdo
+        self.decodificacoes = 0  # Imagens originais decodificadas e reduzidas
+        self.leituras_disco = 0  # Miniaturas lidas do cache em disco
+
+    def _hash_conteudo(self, assinatura) -> str:
+        """Retorna o hash do conteúdo do arquivo, calculado uma vez por assinatura."""
+        with self._trava:
+            hash_conteudo = self._hashes.get(assinatura)
+        if hash_conteudo is None:
+            with open(assinatura[0], "rb") as arquivo:
+                hash_conteudo = hashlib.sha1(arquivo.read()).hexdigest()
+            with self._trava:
+                self._hashes[assinatura] = hash_conteudo
+        return hash_conteudo
+
+    def caminho_disco(self, hash_conteudo: str, largura: int, altura: int) -> str:
+        """Caminho da miniatura em disco para o conteúdo e o tamanho."""
+        return os.path.join(self.diretorio, f"{hash_conteudo}_{largura}x{altura}.png")
+
+    def gerar_imagem(self, assinatura, largura: int, altura: int):
+        """
+        Lê a miniatura do disco ou a gera a partir da imagem original.
+
+        Pode ser chamado fora da thread da interface.
+
+        Returns:
+            tuple: (hash do conteúdo, QImage reduzida ou None se a imagem é inválida,
+                mensagem de erro da gravação em disco ou "")
+        """
+        hash_conteudo = self._hash_conteudo(assinatura)
+        arquivo = self.caminho_disco(hash_conteudo, largura, altura)
+
+        imagem = QImage(arquivo) if os.path.exists(arquivo) else QImage()
+        if not imagem.isNull():
+            with self._trava:
+                self.leituras_disco += 1
+            return hash_conteudo, imagem, ""
+
+        original = QImage(assinatura[0])
+        if original.isNull():
+            return hash_conteudo, None, ""
+        imagem = original.scaled(largura, altura, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        with self._trava:
+            self.decodificacoes += 1
+
+        # Grava em um arquivo temporário e renomeia, para nunca expor miniaturas parciais
+        erro = ""
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            temporario = f"{arquivo}.{threading.get_ident()}.tmp"
+            if imagem.save(temporario, "PNG"):
+                os.replace(temporario, arquivo)
+        except OSError as e:
+            erro = f"Erro ao gravar miniatura em disco: {e}"
+        return hash_conteudo, imagem, erro
+
+    def _em_memoria(self, assinatura, largura, altura):
+        with self._trava:
+            hash_conteudo = self._hashes.get(assinatura)
+        if hash_conteudo is None:
+            return None
+        chave = (hash_conteudo, largura, altura)
+        pixmap = self.pixmaps.get(chave)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(chave)
+        return pixmap
+
+    def _guardar(self, hash_conteudo, largura, altura, pixmap):
+        self.pixmaps[(hash_conteudo, largura, altura)] = pixmap
+        while len(self.pixmaps) > self.capacidade:
+            self.pixmaps.popitem(last=False)
+
+    def solicitar(self, caminho: str, tamanho, ao_carregar=None):
+        """
+        Retorna a miniatura se ela já estiver em memória; caso contrário agenda
+        a geração em segundo plano e entrega o QPixmap a ao_carregar.
+
+        Args:
+            caminho (str): Caminho da imagem original
+            tamanho (tuple): (largura, altura) máximas da miniatura
+            ao_carregar (callable, optional): Recebe o QPixmap na thread da interface
+
+        Returns:
+            QPixmap ou None: A miniatura, se disponível imediatamente
+        """
+        assinatura = assinatura_arquivo(caminho)
+        if assinatura is None:
+            return None
+        largura, altura = tamanho
+        pixmap = self._em_memoria(assinatura, largura, altura)
+        if pixmap is not None:
+            return pixmap
+
+        chave = (assinatura, largura, altura)
+        callbacks = self.pendentes.get(chave)
+        if callbacks is None:
+            self.pendentes[chave] = callbacks = []
+            tarefa = TarefaMiniatura(chave, self)
+            tarefa.sinais.concluida.connect(self._tarefa_concluida)
+            self.tarefas[chave] = tarefa
+            self.pool.start(tarefa)
+        if ao_carregar is not None:
+            callbacks.append(ao_carregar)
+        return None
+
+    def obter(self, caminho: str, tamanho):
+        """
+        Retorna a miniatura imediatamente, gerando-a na thread atual se preciso.
+
+        Usado onde o desenho não pode esperar, como na exportação de PDF.
+
+        Returns:
+            QPixmap ou None: A miniatura, ou None se a imagem não existe ou é inválida
+        """
+        assinatura = assinatura_arquivo(caminho)
+        if assinatura is None:
+            return None
+        largura, altura = tamanho
+        pixmap = self._em_memoria(assinatura, largura, altura)
+        if pixmap is None:
+            hash_conteudo, imagem, erro = self.gerar_imagem(assinatura, largura, altura)
+            if erro:
+                self.falhou.emit(caminho, erro)
+            if imagem is None:
+                return None
+            pixmap = QPixmap.fromImage(imagem)
+            self._guardar(hash_conteudo, largura, altura, pixmap)
+        return pixmap
+
+    def aguardar(self, tempo_limite_ms: int = 30000) -> bool:
+        """
+        Processa eventos até todas as miniaturas solicitadas serem entregues.
+
+        Returns:
+            bool: True se terminou dentro do tempo limite
+        """
+        cronometro = QElapsedTimer()
+        cronometro.start()
+        while self.pendentes and cronometro.elapsed() < tempo_limite_ms:
+            self.pool.waitForDone(10)
+            QApplication.processEvents()
+        return not self.pendentes
+
+    def limpar_memoria(self):
+        """Descarta os QPixmaps em memória (as miniaturas em disco são mantidas)."""
+        self.pixmaps.clear()
+
+    @pyqtSlot(object, str, object, str)
+    def _tarefa_concluida(self, chave, hash_conteudo, imagem, erro):
+        self.tarefas.pop(chave, None)
+        callbacks = self.pendentes.pop(chave, [])
+        if erro:
+            self.falhou.emit(chave[0][0], erro)
+        if imagem is None:
+            return
+        _, largura, altura = chave
+        pixmap = QPixmap.fromImage(imagem)
+        self._guardar(hash_conteudo, largura, altura, pixmap)
+        for ao_carregar in callbacks:
+            try:
+                ao_carregar(pixmap)
+            except RuntimeError:
+                # Widget destruído antes de a miniatura ficar pronta
+                pass
+
+
+_cache_miniaturas = None
+
+
+def cache_miniaturas() -> CacheMiniaturas:
+    """Retorna o cache de miniaturas compartilhado pela aplicação."""
+    global _cache_miniaturas
+    if _cache_miniaturas is None:
+        _cache_miniaturas = CacheMiniaturas()
+    return _cache_miniaturas
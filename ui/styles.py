@@ -205,7 +205,7 @@ QHeaderView::section {{
     font-size: 10px;
 }}
 
-QTableWidget::item {{
+QTableWidget::item, QTableView::item {{
     padding: 12px;
     border-bottom: 1px solid #F1F5F9;
 }}
@@ -215,6 +215,10 @@ QLabel#badge_success {{ background-color: #D5F4E6; color: #27AE60; border-radius
 QLabel#badge_warning {{ background-color: #FEF5E7; color: #F39C12; border-radius: 12px; padding: 4px 10px; font-weight: 700; font-size: 11px; }}
 QLabel#badge_info {{ background-color: #EBF5FB; color: #3498DB; border-radius: 12px; padding: 4px 10px; font-weight: 700; font-size: 11px; }}
 
+/* --- CARREGAMENTO --- */
+QProgressBar#indicador_carregamento {{ background-color: {COLOR_BORDER}; border: none; border-radius: 2px; }}
+QProgressBar#indicador_carregamento::chunk {{ background-color: {COLOR_PRIMARY}; border-radius: 2px; }}
+
 /* --- MARKETPLACE & PRODUTOS --- */
 QFrame#card_produto_moderno {{
     background-color: #FFFFFF;